@@ -0,0 +1,240 @@
+"""
+Cache persistente das respostas do Gemini, usado pelo assistente (nba_assistente.py).
+
+- A chave é a pergunta normalizada (sem acentos, sem palavras vazias, times/jogadores/
+  estatísticas trocados pela forma canônica) junto com o hash do contexto enviado:
+  "Quantos pontos o Luka faz?" e "luka, quantos pontos faz" caem na mesma entrada.
+- Perguntas quase iguais também acertam: mesmas entidades, mesmo contexto e similaridade
+  (Jaccard das palavras) acima do limite.
+- Cada entrada guarda a versão dos dados em que foi gerada; quando o main.py grava dados
+  novos, o assistente recarrega os dados e as entradas antigas deixam de valer (e são removidas).
+- Entradas expiram após o TTL; acima do limite de entradas, as menos usadas saem primeiro (LRU).
+
+Inspeção e limpeza pela linha de comando:
+    python answer_cache.py stats
+    python answer_cache.py list
+    python answer_cache.py clear
+"""
+import argparse
+import datetime
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from nba_context import STAT_REGEXES
+from nba_store import fold_name
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "answers.sqlite")
+DEFAULT_TTL = 7 * 24 * 3600 # 7 dias
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_THRESHOLD = 0.75
+
+# Palavras que não mudam o sentido da pergunta
+STOPWORDS = {
+    "o", "a", "os", "as", "um", "uma", "de", "do", "da", "dos", "das", "em", "no", "na", "nos", "nas", "e", "que",
+    "por", "para", "pra", "pro", "pelo", "pela", "com", "me", "nesta", "neste", "nessa", "nesse", "esse", "essa",
+    "este", "atual", "this", "current", "diga", "fala", "sobre", "qual", "quais", "quem", "como", "esta", "foi", "ser", "eh",
+    "the", "an", "of", "in", "on", "at", "to", "for", "and", "is", "are", "was", "what", "whats", "who", "which",
+    "how", "does", "did", "tell", "about", "please", "favor",
+}
+
+
+def question_tokens(question):
+    """
+    Palavras que identificam uma pergunta já interpretada (nba_context.Question).
+    Retorna (entidades, palavras): as entidades precisam ser iguais para haver acerto.
+    """
+    entities = {f"time:{team}" for team in question.teams}
+    entities |= {f"jogador:{row.get('Player')}" for row in question.players}
+    entities |= {f"data:{iso}" for iso in question.dates}
+    entities |= {f"mes:{month}" for month in question.months}
+    entities |= {f"temporada:{season}" for season in question.seasons}
+    entities |= {f"stat:{stat}" for stat in question.stats}
+    if question.conference:
+        entities.add(f"conf:{question.conference}")
+
+    text = fold_name(question.text)
+    for regex, _ in STAT_REGEXES:
+        text = regex.sub(" ", text)
+    # Partes dos nomes já reconhecidos não contam como palavras soltas
+    names = {word for row in question.players for word in re.findall(r"\w+", fold_name(row.get("Player", "")))}
+    words = {word for word in re.findall(r"\w+", text) if word not in STOPWORDS and word not in names}
+    return entities, words
+
+
+def similarity(a, b):
+    """Jaccard entre dois conjuntos de palavras."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class CachedAnswer:
+    def __init__(self, text, kind, score, question):
+        self.text = text
+        self.kind = kind # "exata" ou "semelhante"
+        self.score = score
+        self.question = question
+
+
+class AnswerCache:
+    """Índice SQLite com as respostas. Seguro entre threads (a interface consulta numa thread separada)."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES,
+                 threshold=DEFAULT_THRESHOLD):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS answers (
+                norm TEXT NOT NULL,
+                context_hash TEXT NOT NULL,
+                data_version TEXT NOT NULL,
+                question TEXT NOT NULL,
+                entities TEXT NOT NULL,
+                words TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (norm, context_hash)
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_answers_context ON answers (context_hash, data_version)")
+        self._db.commit()
+
+    @staticmethod
+    def _norm(entities, words):
+        return " ".join(sorted(entities) + sorted(words))
+
+    def get(self, question, context_hash, data_version):
+        """Resposta guardada para a pergunta (exata ou semelhante) ou None. Atualiza os contadores."""
+        entities, words = question_tokens(question)
+        norm = self._norm(entities, words)
+        oldest = time.time() - self.ttl
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT norm, question, entities, words, answer FROM answers "
+                "WHERE context_hash = ? AND data_version = ? AND created_at >= ?",
+                (context_hash, data_version, oldest),
+            ).fetchall()
+            best, best_score = None, 0.0
+            for row_norm, row_question, row_entities, row_words, answer in rows:
+                if row_norm == norm:
+                    best, best_score = (row_norm, row_question, answer), 1.0
+                    break
+                if set(json.loads(row_entities)) != entities:
+                    continue
+                score = similarity(words, set(json.loads(row_words)))
+                if score >= self.threshold and score > best_score:
+                    best, best_score = (row_norm, row_question, answer), score
+            if best is None:
+                self.misses += 1
+                return None
+            self._db.execute(
+                "UPDATE answers SET last_access = ?, hits = hits + 1 WHERE norm = ? AND context_hash = ?",
+                (time.time(), best[0], context_hash),
+            )
+            self._db.commit()
+        if best_score == 1.0:
+            self.hits += 1
+            return CachedAnswer(best[2], "exata", best_score, best[1])
+        self.near_hits += 1
+        return CachedAnswer(best[2], "semelhante", best_score, best[1])
+
+    def put(self, question, context_hash, data_version, answer):
+        entities, words = question_tokens(question)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO answers (norm, context_hash, data_version, question, entities, words, answer, "
+                "created_at, last_access, hits) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (self._norm(entities, words), context_hash, data_version, question.text,
+                 json.dumps(sorted(entities), ensure_ascii=False), json.dumps(sorted(words), ensure_ascii=False),
+                 answer, now, now),
+            )
+            self._db.commit()
+        self.prune()
+
+    def prune(self, data_version=None):
+        """
+        Remove as entradas vencidas (TTL), as de outra versão dos dados (se `data_version`
+        for informado) e, acima do limite, as menos usadas. Retorna quantas foram removidas.
+        """
+        with self._lock:
+            removed = self._db.execute("DELETE FROM answers WHERE created_at < ?", (time.time() - self.ttl,)).rowcount
+            if data_version is not None:
+                removed += self._db.execute("DELETE FROM answers WHERE data_version != ?", (data_version,)).rowcount
+            removed += self._db.execute(
+                "DELETE FROM answers WHERE rowid NOT IN (SELECT rowid FROM answers ORDER BY last_access DESC LIMIT ?)",
+                (self.max_entries,),
+            ).rowcount
+            self._db.commit()
+        return removed
+
+    @property
+    def lookups(self):
+        return self.hits + self.near_hits + self.misses
+
+    def hit_rate(self):
+        return (self.hits + self.near_hits) / self.lookups if self.lookups else 0.0
+
+    def stats_text(self):
+        """Resumo curto para a barra de status."""
+        found = self.hits + self.near_hits
+        return f"Cache: {found}/{self.lookups} ({self.hit_rate():.0%})"
+
+    def entries(self):
+        with self._lock:
+            return self._db.execute(
+                "SELECT question, data_version, hits, created_at, last_access FROM answers ORDER BY last_access DESC"
+            ).fetchall()
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM answers")
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspeciona ou limpa o cache de respostas do assistente.")
+    parser.add_argument("command", choices=["stats", "list", "prune", "clear"])
+    parser.add_argument("--path", default=DEFAULT_CACHE_PATH)
+    args = parser.parse_args(argv)
+
+    cache = AnswerCache(args.path)
+    try:
+        if args.command == "stats":
+            rows = cache.entries()
+            versions = {row[1] for row in rows}
+            print(f"{len(rows)} respostas, {sum(row[2] for row in rows)} acertos, {len(versions)} versão(ões) dos dados.")
+        elif args.command == "list":
+            for question, version, hits, created, last_access in cache.entries():
+                when = datetime.datetime.fromtimestamp(last_access).strftime("%Y-%m-%d %H:%M")
+                print(f"{hits:4d} acertos  {when}  [{version}]  {question}")
+        elif args.command == "prune":
+            print(f"{cache.prune()} entradas removidas.")
+        elif args.command == "clear":
+            cache.clear()
+            print("Cache de respostas limpo.")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
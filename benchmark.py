@@ -0,0 +1,295 @@
+"""
+Benchmark offline da coleta (main.py): mede o pipeline sem acessar nba.com, Basketball-Reference e ESPN.
+
+1. Gravar as páginas reais uma vez (precisa de rede):
+    python benchmark.py record fixtures/
+   Salva a resposta da API de stats, cada mês do calendário e cada temporada da ESPN em
+   fixtures/<host>/<caminho>, no mesmo formato servido por `python fetchers.py serve`.
+
+2. Medir, offline:
+    python benchmark.py run fixtures/ --repeat 5
+   Sobe um servidor local com as fixtures e passa as páginas pela mesma extração e limpeza de
+   scraper_nba_stats, scraper_basketball_reference_schedule e scraper_espn_standings, com o
+   tempo de cada etapa (fetch, parse, clean, serialize), o pico de memória e as linhas/s.
+
+3. Linha de base:
+    python benchmark.py run fixtures/ --save-baseline
+   grava fixtures/baseline.json; as execuções seguintes comparam com ele e terminam com erro
+   (código 1) se alguma etapa ficar mais lenta (ou usar mais memória) além da tolerância.
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from urllib.parse import urlsplit
+
+import main as pipeline # Funções dos scrapers (main.py)
+from collector import FrameCollector
+from fetchers import HttpFetcher, serve_fixtures
+from nba_stats_api import fetch_response, result_set_frame, to_site_frame
+from readiness import PageTiming
+from writers import COLUMNAR_FORMATS, columnar_available, write_frame
+
+STAGES = ("fetch", "parse", "clean", "serialize")
+BASELINE_FILE = "baseline.json" # Dentro do diretório de fixtures
+DEFAULT_TOLERANCE = 0.25 # 25% mais lento que a linha de base = regressão
+MIN_REGRESSION_S = 0.005 # Diferenças menores que 5 ms são ruído
+
+
+def fixture_path(directory, url):
+    """
+    Arquivo da fixture de uma URL. Caminhos sem extensão viram <caminho>/index.html, já que
+    uma página (ex: /nba/classificacao) pode ser também o prefixo de outras (/nba/classificacao/_/...).
+    """
+    path = urlsplit(url).path.strip("/")
+    parts = [urlsplit(url).netloc] + [part for part in path.split("/") if part]
+    if not path or not os.path.splitext(parts[-1])[1]:
+        parts.append("index.html")
+    return os.path.join(directory, *parts)
+
+
+class RecordingFetcher(HttpFetcher):
+    """HttpFetcher que salva o corpo de cada resposta como fixture."""
+
+    def __init__(self, directory, **kwargs):
+        super().__init__(**kwargs)
+        self.directory = directory
+        self.recorded = []
+
+    def get(self, url, headers=None, page=None):
+        response = super().get(url, headers=headers, page=page)
+        path = fixture_path(self.directory, url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(response.data)
+        self.recorded.append((path, len(response.data)))
+        return response
+
+
+class StageTimer:
+    """Soma o tempo gasto em cada etapa."""
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+
+
+# -----------------------------------------------------------------
+# Fontes: mesmas funções de extração e limpeza do main.py, separadas por etapa
+# -----------------------------------------------------------------
+def bench_nba_stats(http, timer, out_dir, formats=()):
+    with timer.stage("fetch"):
+        response = fetch_response(http, pipeline.NBA_STATS_SEASON, pipeline.NBA_STATS_SEASON_TYPE)
+    with timer.stage("parse"):
+        df = to_site_frame(result_set_frame(json.loads(response.text)))
+    with timer.stage("clean"):
+        players = FrameCollector("nba_stats", pipeline.NBA_STATS_COLUMNS)
+        players.add(df)
+        df = players.frame()
+    with timer.stage("serialize"):
+        write_frame(df, pipeline._open_outputs(os.path.join(out_dir, pipeline.NBA_STATS_JSON), formats,
+                                               pipeline.NBA_STATS_COLUMNAR))
+    return len(df)
+
+
+def bench_schedule(http, timer, out_dir, formats=()):
+    with timer.stage("fetch"):
+        urls = pipeline._http_discover_schedule_urls(http, pipeline.SCHEDULE_URL_TEMPLATE.format(month="october"))
+        responses = http.map(lambda fetcher, url: fetcher.get(url), urls)
+    page = PageTiming("benchmark")
+    with timer.stage("parse"):
+        frames = []
+        for url, response in zip(urls, responses):
+            if response is not None:
+                month = pipeline.get_month_from_url(url)
+                frames.append((month, pipeline._parse_schedule_month_page(response, month.capitalize(), page)))
+    with timer.stage("clean"):
+        with FrameCollector("schedule", pipeline.SCHEDULE_COLUMNS) as games:
+            for month, df_month in frames:
+                games.add(df_month, label=month)
+        df = games.frame()
+    with timer.stage("serialize"):
+        write_frame(df, pipeline._open_outputs(os.path.join(out_dir, pipeline.SCHEDULE_JSON), formats,
+                                               pipeline.SCHEDULE_COLUMNAR, partition_by='Month',
+                                               date_format=pipeline.SCHEDULE_DATE_FORMAT))
+    return len(df)
+
+
+def bench_espn(http, timer, out_dir, formats=()):
+    with timer.stage("fetch"):
+        seasons = pipeline._http_discover_espn_seasons(http)
+        responses = http.map(lambda fetcher, season: fetcher.get(season[0]), seasons)
+    page = PageTiming("benchmark")
+    with timer.stage("parse"):
+        frames = [(label, pipeline._parse_espn_season_page(response, label, page))
+                  for (_, label), response in zip(seasons, responses) if response is not None]
+    with timer.stage("clean"):
+        with FrameCollector("espn", pipeline.ESPN_COLUMNS) as standings:
+            for label, df_season in frames:
+                if df_season is not None and not df_season.empty:
+                    standings.add(pipeline._clean_season_frame(df_season), label=label)
+        df = standings.frame()
+    with timer.stage("serialize"):
+        write_frame(df, pipeline._open_outputs(os.path.join(out_dir, pipeline.ESPN_JSON), formats,
+                                               pipeline.ESPN_COLUMNAR, partition_by='Season'))
+    return len(df)
+
+
+SOURCES = {"nba_stats": bench_nba_stats, "schedule": bench_schedule, "espn": bench_espn}
+
+
+def _run_source(bench, http, formats):
+    """Executa uma fonte uma vez (saída do main.py silenciada). Retorna (tempos por etapa, linhas)."""
+    timer = StageTimer()
+    with tempfile.TemporaryDirectory() as out_dir, contextlib.redirect_stdout(io.StringIO()):
+        rows = bench(http, timer, out_dir, formats)
+    return timer.seconds, rows
+
+
+def run_benchmark(directory, repeat=3, workers=3, formats=(), sources=tuple(SOURCES)):
+    """
+    Serve as fixtures localmente e mede cada fonte `repeat` vezes (mediana por etapa);
+    uma passada extra com tracemalloc mede o pico de memória. Retorna {fonte: métricas}.
+    """
+    server = serve_fixtures(directory, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    http = HttpFetcher(max_workers=workers, fixture_server=f"http://127.0.0.1:{server.server_port}")
+    results = {}
+    try:
+        for name in sources:
+            runs = [_run_source(SOURCES[name], http, formats) for _ in range(repeat)]
+            rows = runs[-1][1]
+            metrics = {stage: statistics.median(seconds[stage] for seconds, _ in runs) for stage in STAGES}
+            metrics["total"] = sum(metrics[stage] for stage in STAGES)
+
+            tracemalloc.start()
+            try:
+                _run_source(SOURCES[name], http, formats)
+                metrics["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            finally:
+                tracemalloc.stop()
+
+            metrics["rows"] = rows
+            metrics["rows_per_s"] = rows / metrics["total"] if metrics["total"] else 0.0
+            results[name] = metrics
+    finally:
+        http.close()
+        server.shutdown()
+        server.server_close()
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Lista de regressões (texto) em relação à linha de base: tempo por etapa e pico de memória."""
+    regressions = []
+    for name, metrics in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        for key in STAGES + ("total",):
+            before, now = base.get(key), metrics[key]
+            if before is not None and now > before * (1 + tolerance) and now - before > MIN_REGRESSION_S:
+                regressions.append(f"{name}/{key}: {before * 1000:.1f} ms -> {now * 1000:.1f} ms (+{now / before - 1:.0%})")
+        before, now = base.get("peak_mb"), metrics["peak_mb"]
+        if before and now > before * (1 + tolerance):
+            regressions.append(f"{name}/memória: {before:.1f} MB -> {now:.1f} MB (+{now / before - 1:.0%})")
+        if base.get("rows") is not None and metrics["rows"] != base["rows"]:
+            regressions.append(f"{name}/linhas: {base['rows']} -> {metrics['rows']} (as fixtures ou o parse mudaram)")
+    return regressions
+
+
+def print_results(results, baseline=None):
+    print(f"{'Fonte':<10} {'fetch':>8} {'parse':>8} {'clean':>8} {'serialize':>9} {'total':>8} {'linhas':>7} {'linhas/s':>9} {'pico MB':>8}")
+    for name, m in results.items():
+        print(f"{name:<10} " + " ".join(f"{m[stage] * 1000:>7.1f}ms" if stage != "serialize" else f"{m[stage] * 1000:>8.1f}ms"
+                                        for stage in STAGES)
+              + f" {m['total'] * 1000:>6.1f}ms {m['rows']:>7d} {m['rows_per_s']:>9.0f} {m['peak_mb']:>8.1f}")
+        base = (baseline or {}).get("results", {}).get(name)
+        if base and base.get("total"):
+            print(f"{'':<10} linha de base: total {base['total'] * 1000:.1f}ms ({m['total'] / base['total'] - 1:+.0%})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark offline da coleta, com fixtures gravadas.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_record = sub.add_parser("record", help="Baixa as páginas reais e salva como fixtures (precisa de rede).")
+    p_record.add_argument("directory")
+    p_record.add_argument("--workers", type=int, default=3)
+    p_run = sub.add_parser("run", help="Mede o pipeline contra as fixtures, servidas localmente.")
+    p_run.add_argument("directory")
+    p_run.add_argument("--repeat", type=int, default=3, help="Execuções por fonte (vale a mediana).")
+    p_run.add_argument("--workers", type=int, default=3)
+    p_run.add_argument("--source", action="append", choices=list(SOURCES), help="Só estas fontes (padrão: todas).")
+    p_run.add_argument("--columnar", action="append", choices=COLUMNAR_FORMATS, default=[],
+                       help="Inclui a gravação Parquet/Arrow na etapa serialize.")
+    p_run.add_argument("--save-baseline", action="store_true", help=f"Grava o resultado em <diretório>/{BASELINE_FILE}.")
+    p_run.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                       help="Piora tolerada em relação à linha de base (padrão: 0.25 = 25%%).")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        http = RecordingFetcher(args.directory, max_workers=args.workers)
+        try:
+            for name, bench in SOURCES.items():
+                print(f"--> Gravando {name}...")
+                _, rows = _run_source(bench, http, ())
+                print(f"   -> {rows} linhas")
+        finally:
+            http.close()
+        total = sum(size for _, size in http.recorded)
+        print(f"{len(http.recorded)} páginas gravadas em {args.directory} ({total / 1024:.0f} KB).")
+        return
+
+    if args.columnar and not columnar_available():
+        parser.error("--columnar requer o pyarrow (pip install pyarrow).")
+    baseline_path = os.path.join(args.directory, BASELINE_FILE)
+    baseline = None
+    if os.path.exists(baseline_path):
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    sources = tuple(args.source or SOURCES)
+    print(f"--> Benchmark: {', '.join(sources)} ({args.repeat} execuções por fonte, fixtures em {args.directory})")
+    results = run_benchmark(args.directory, args.repeat, args.workers, tuple(args.columnar), sources)
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(), "machine": platform.machine(),
+                "repeat": args.repeat, "columnar": args.columnar, "results": results,
+            }, f, indent=2)
+        print(f"Linha de base gravada em {baseline_path}.")
+        return
+
+    if baseline is None:
+        print(f"Sem linha de base ({baseline_path}). Use --save-baseline para criar.")
+        return
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n!!! REGRESSÃO em relação à linha de base de {baseline.get('created')} (tolerância {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"   -> {line}")
+        sys.exit(1)
+    print(f"Sem regressões em relação à linha de base de {baseline.get('created')} (tolerância {args.tolerance:.0%}).")
+
+
+if __name__ == "__main__":
+    main()
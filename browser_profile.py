@@ -0,0 +1,225 @@
+"""
+Perfil do navegador usado pelo Selenium (main.py): modo headless, tamanho de janela fixo,
+estratégia de carregamento 'eager' (o driver.get volta no DOMContentLoaded) e bloqueio,
+via CDP (Network.setBlockedURLs), de imagens, fontes, anúncios e scripts de rastreamento.
+As páginas só precisam das tabelas: o resto custa tempo de carregamento e memória por sessão.
+
+Depois de cada navegação, o log de performance do Chrome informa quantas requisições foram
+bloqueadas (por tipo) e quantos bytes foram baixados; os bytes economizados são estimados
+pelo tamanho médio de cada tipo de recurso.
+
+Para ver as opções e os padrões bloqueados:
+    python browser_profile.py --headed --allow images
+"""
+import argparse
+import fnmatch
+import json
+
+from instrumentation import METRICS
+
+# Padrões de URL de anúncios e rastreamento (sintaxe do Network.setBlockedURLs: '*' = qualquer coisa)
+AD_PATTERNS = (
+    "*doubleclick.net*", "*googlesyndication.com*", "*googleadservices.com*", "*google-analytics.com*",
+    "*googletagmanager.com*", "*googletagservices.com*", "*adservice.google.*", "*amazon-adsystem.com*",
+    "*scorecardresearch.com*", "*facebook.net*", "*connect.facebook.*", "*taboola.com*", "*outbrain.com*",
+    "*chartbeat.*", "*omtrdc.net*", "*demdex.net*", "*adsafeprotected.com*", "*moatads.com*",
+    "*criteo.*", "*rubiconproject.com*", "*pubmatic.com*", "*casalemedia.com*", "*adnxs.com*",
+    "*bing.com/bat*", "*hotjar.com*", "*newrelic.com*", "*nr-data.net*", "*branch.io*",
+)
+# Tipos de recurso bloqueados pela extensão da URL (o setBlockedURLs não filtra pelo tipo)
+RESOURCE_PATTERNS = {
+    "images": ("*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.avif*"),
+    "fonts": ("*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"),
+    "media": ("*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*"),
+    "stylesheets": ("*.css*",),
+}
+# Por padrão as folhas de estilo continuam: sem CSS, as esperas de "clicável" podem falhar
+DEFAULT_BLOCKED_RESOURCES = ("images", "fonts", "media")
+# Tamanho médio aproximado de cada tipo de recurso (tipos do CDP), para estimar os bytes economizados
+AVERAGE_BYTES = {
+    "Image": 30_000, "Font": 40_000, "Media": 250_000, "Stylesheet": 30_000,
+    "Script": 50_000, "XHR": 5_000, "Fetch": 5_000, "Other": 5_000,
+}
+PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+
+
+class BrowserProfile:
+    """
+    Configuração das sessões do Chrome. chrome_options() monta as opções do webdriver e
+    apply() liga o bloqueio de URLs na sessão já criada.
+    """
+
+    def __init__(self, headless=True, window_size=(1366, 900), page_load_strategy="eager",
+                 blocked_resources=DEFAULT_BLOCKED_RESOURCES, block_ads=True, extra_patterns=(), log_stats=True):
+        if page_load_strategy not in PAGE_LOAD_STRATEGIES:
+            raise ValueError(f"Estratégia de carregamento inválida '{page_load_strategy}'. Opções: {', '.join(PAGE_LOAD_STRATEGIES)}.")
+        unknown = set(blocked_resources) - set(RESOURCE_PATTERNS)
+        if unknown:
+            raise ValueError(f"Tipo de recurso desconhecido: {', '.join(sorted(unknown))}. Opções: {', '.join(RESOURCE_PATTERNS)}.")
+        self.headless = headless
+        self.window_size = window_size
+        self.page_load_strategy = page_load_strategy
+        self.blocked_resources = tuple(blocked_resources)
+        self.block_ads = block_ads
+        self.extra_patterns = tuple(extra_patterns)
+        self.log_stats = log_stats
+
+    @property
+    def ad_patterns(self):
+        return (AD_PATTERNS if self.block_ads else ()) + self.extra_patterns
+
+    @property
+    def blocked_patterns(self):
+        patterns = [pattern for resource in self.blocked_resources for pattern in RESOURCE_PATTERNS[resource]]
+        return patterns + list(self.ad_patterns)
+
+    def arguments(self):
+        """Argumentos de linha de comando do Chrome."""
+        args = [f"--window-size={self.window_size[0]},{self.window_size[1]}", "--disable-extensions",
+                "--disable-notifications", "--mute-audio", "--no-first-run", "--disable-dev-shm-usage"]
+        if self.headless:
+            args.append("--headless=new")
+        if "images" in self.blocked_resources:
+            args.append("--blink-settings=imagesEnabled=false")
+        return args
+
+    def chrome_options(self, binary_location=None):
+        from selenium import webdriver # Só quem abre o navegador precisa do Selenium
+
+        options = webdriver.ChromeOptions()
+        if binary_location:
+            options.binary_location = binary_location
+        for arg in self.arguments():
+            options.add_argument(arg)
+        options.page_load_strategy = self.page_load_strategy
+        prefs = {}
+        if "images" in self.blocked_resources:
+            prefs["profile.managed_default_content_settings.images"] = 2
+        if prefs:
+            options.add_experimental_option("prefs", prefs)
+        if self.log_stats:
+            # Eventos de rede do CDP no log de performance (lidos por page_stats)
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        return options
+
+    def apply(self, driver):
+        """Liga o bloqueio de URLs na sessão. Navegadores sem CDP seguem sem bloqueio."""
+        patterns = self.blocked_patterns
+        if not patterns:
+            return False
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            return True
+        except Exception as e:
+            print(f"[perfil] Bloqueio de URLs via CDP indisponível: {e}")
+            return False
+
+    def is_ad(self, url):
+        return any(fnmatch.fnmatchcase(url, pattern) for pattern in self.ad_patterns)
+
+    def page_stats(self, driver):
+        """
+        Lê (e esvazia) o log de performance da sessão: requisições feitas, bloqueadas por
+        categoria, bytes baixados e estimativa dos bytes economizados. None sem o log.
+        """
+        if not self.log_stats:
+            return None
+        try:
+            entries = driver.get_log("performance")
+        except Exception:
+            return None
+        urls, blocked, loaded = {}, {}, 0
+        requests = 0
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            method, params = message.get("method"), message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                requests += 1
+                urls[params.get("requestId")] = params.get("request", {}).get("url", "")
+            elif method == "Network.loadingFinished":
+                loaded += params.get("encodedDataLength", 0) or 0
+            elif method == "Network.loadingFailed" and params.get("blockedReason") == "inspector":
+                # "inspector" = bloqueada pelo setBlockedURLs
+                resource_type = params.get("type", "Other")
+                category = "Ads" if self.is_ad(urls.get(params.get("requestId"), "")) else resource_type
+                entry_stats = blocked.setdefault(category, [0, 0])
+                entry_stats[0] += 1
+                entry_stats[1] += AVERAGE_BYTES.get(resource_type, AVERAGE_BYTES["Other"])
+        return {
+            "requests": requests,
+            "blocked": sum(n for n, _ in blocked.values()),
+            "blocked_by_type": {category: n for category, (n, _) in sorted(blocked.items())},
+            "bytes_loaded": loaded,
+            "bytes_saved_est": sum(saved for _, saved in blocked.values()),
+        }
+
+    def log_page(self, driver, page=None):
+        """Imprime as estatísticas de bloqueio da última navegação e soma nos contadores da execução."""
+        stats = self.page_stats(driver)
+        if not stats or not stats["requests"]:
+            return stats
+        METRICS.count("blocked_requests", stats["blocked"])
+        METRICS.count("blocked_bytes_est", stats["bytes_saved_est"])
+        by_type = ", ".join(f"{category} {n}" for category, n in stats["blocked_by_type"].items())
+        print(f"   -> [perfil] {page or 'página'}: {stats['blocked']} de {stats['requests']} requisições bloqueadas"
+              f"{f' ({by_type})' if by_type else ''}, ~{stats['bytes_saved_est'] / 1024:.0f}KB economizados, "
+              f"{stats['bytes_loaded'] / 1024:.0f}KB baixados.")
+        return stats
+
+
+def parse_window_size(value):
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Tamanho de janela inválido '{value}'. Use LARGURAxALTURA (ex: 1366x900).")
+    return width, height
+
+
+def add_arguments(parser):
+    """Opções do perfil do navegador (compartilhadas pelo main.py e pela CLI deste módulo)."""
+    group = parser.add_argument_group("perfil do navegador (Selenium)")
+    group.add_argument("--headed", action="store_true", help="Abre o navegador com janela (padrão: headless).")
+    group.add_argument("--window-size", type=parse_window_size, default=(1366, 900), metavar="LxA",
+                       help="Tamanho fixo da janela (padrão: 1366x900).")
+    group.add_argument("--page-load-strategy", choices=PAGE_LOAD_STRATEGIES, default="eager",
+                       help="Quando o driver.get retorna (padrão: eager, no DOMContentLoaded).")
+    group.add_argument("--allow", action="append", choices=sorted(RESOURCE_PATTERNS), default=[],
+                       help="Deixa de bloquear um tipo de recurso (images, fonts, media).")
+    group.add_argument("--block", action="append", choices=sorted(RESOURCE_PATTERNS), default=[],
+                       help="Bloqueia também um tipo de recurso (ex: stylesheets).")
+    group.add_argument("--block-url", action="append", default=[], metavar="PADRÃO",
+                       help="Padrão de URL extra a bloquear (ex: '*widgets.example.com*').")
+    group.add_argument("--no-block", action="store_true", help="Não bloqueia nenhum recurso nem anúncio.")
+    return group
+
+
+def profile_from_args(args):
+    if args.no_block:
+        return BrowserProfile(headless=not args.headed, window_size=args.window_size,
+                              page_load_strategy=args.page_load_strategy, blocked_resources=(), block_ads=False)
+    resources = [r for r in DEFAULT_BLOCKED_RESOURCES if r not in args.allow]
+    resources += [r for r in args.block if r not in resources]
+    return BrowserProfile(headless=not args.headed, window_size=args.window_size,
+                          page_load_strategy=args.page_load_strategy, blocked_resources=resources,
+                          extra_patterns=args.block_url)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mostra o perfil do navegador usado pelos scrapers.")
+    add_arguments(parser)
+    profile = profile_from_args(parser.parse_args(argv))
+    print(f"Estratégia de carregamento: {profile.page_load_strategy}")
+    print(f"Argumentos do Chrome: {' '.join(profile.arguments())}")
+    print(f"Recursos bloqueados: {', '.join(profile.blocked_resources) or 'nenhum'}"
+          f"{' + anúncios/rastreamento' if profile.block_ads else ''}")
+    print(f"Padrões de URL bloqueados ({len(profile.blocked_patterns)}):")
+    for pattern in profile.blocked_patterns:
+        print(f"  {pattern}")
+
+
+if __name__ == "__main__":
+    main()
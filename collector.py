@@ -0,0 +1,100 @@
+"""
+Coletor de páginas compartilhado pelos scrapers.
+
+Cada página (mês do calendário, temporada da ESPN, tabela de jogadores) entra como um lote:
+- o lote é conferido contra as colunas esperadas (faltando -> preenchidas com nulo; tipos
+  numéricos/texto convertidos, com aviso se algum valor não puder ser convertido);
+- sem sink, os lotes ficam numa lista e a tabela final é montada uma única vez (frame());
+- com sink (ver writers.py), cada lote é gravado direto nos arquivos de saída e descartado,
+  sem nunca montar a tabela completa na memória (opção --stream do main.py).
+"""
+import pandas as pd
+
+from instrumentation import METRICS
+
+
+class FrameCollector:
+    """
+    Junta os lotes de um scraper. `columns` é um dict nome -> tipo ('int', 'float' ou 'str'),
+    na ordem em que as colunas devem sair.
+    """
+
+    def __init__(self, name, columns, sink=None):
+        self.name = name
+        self.columns = dict(columns)
+        self.sink = sink
+        self.rows = 0
+        self._frames = []
+        self._warned_extra = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self.sink is not None:
+            self.sink.abort()
+        return False
+
+    @property
+    def streaming(self):
+        return self.sink is not None
+
+    def add(self, df, label=None):
+        """Confere e guarda (ou grava) um lote. Retorna o número de linhas aceitas."""
+        if df is None or df.empty:
+            return 0
+        df = self._check(df, label or f"lote {len(self._frames) + 1}")
+        if self.streaming:
+            self.sink.write(df)
+        else:
+            self._frames.append(df)
+        self.rows += len(df)
+        METRICS.count("rows", len(df), source=self.name)
+        return len(df)
+
+    def frame(self):
+        """Monta a tabela final com um único concat."""
+        if self.streaming:
+            raise RuntimeError(f"[{self.name}] Os lotes já foram gravados no sink; não há tabela em memória.")
+        if not self._frames:
+            return pd.DataFrame(columns=list(self.columns))
+        if len(self._frames) == 1:
+            return self._frames[0]
+        return pd.concat(self._frames, ignore_index=True)
+
+    def close(self):
+        if self.sink is not None:
+            self.sink.close()
+
+    def _check(self, df, label):
+        df = df.copy()
+        missing = [col for col in self.columns if col not in df.columns]
+        if missing:
+            print(f"   -> [{self.name}] Aviso: colunas ausentes em {label}: {missing}. Preenchidas com nulo.")
+            for col in missing:
+                df[col] = None
+
+        extra = [col for col in df.columns if col not in self.columns]
+        new_extra = set(extra) - self._warned_extra
+        if new_extra:
+            print(f"   -> [{self.name}] Aviso: colunas inesperadas em {label}: {sorted(new_extra)}. Mantidas no fim.")
+            self._warned_extra |= new_extra
+
+        for col, kind in self.columns.items():
+            series = df[col]
+            if kind in ("int", "float"):
+                if not pd.api.types.is_numeric_dtype(series):
+                    converted = pd.to_numeric(series, errors="coerce")
+                    lost = int((converted.isna() & series.notna()).sum())
+                    if lost:
+                        print(f"   -> [{self.name}] Aviso: {lost} valor(es) não numérico(s) em '{col}' ({label}) viraram nulo.")
+                    series = converted
+                if kind == "int" and pd.api.types.is_float_dtype(series) and series.notna().all() and (series % 1 == 0).all():
+                    series = series.astype("int64")
+            elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+                # Coluna de texto que veio numérica (ex: placar lido de outra fonte)
+                series = series.astype(object).where(series.notna(), None).map(lambda v: v if v is None else str(v))
+            df[col] = series
+        return df[list(self.columns) + extra]
@@ -0,0 +1,328 @@
+"""
+Modo daemon da coleta: mantém o processo (e as sessões do navegador, com os cookies já
+aceitos) vivo entre as execuções e roda cada fonte no seu próprio intervalo, em vez de
+pagar a inicialização do Chrome/Selenium Manager a cada execução do main.py.
+
+    python daemon.py --every nba_stats=15m --every schedule=1h --every espn=1d
+
+Cada execução de uma fonte grava metrics/run-<fonte>-<data>.jsonl e imprime seus relatórios;
+entre as execuções o processo guarda só os totais acumulados (para o --prometheus).
+
+As sessões são recicladas depois de --max-pages páginas ou quando o navegador passa de
+--max-memory MB (requer o psutil). Um endpoint local de controle aceita:
+
+    GET  /status              estado de cada fonte (última execução, próxima, erros) e do pool
+    POST /refresh[/FONTE]     roda a fonte (ou todas) agora
+    POST /stop                encerra o daemon
+
+Pela linha de comando: python daemon.py status | refresh [FONTE] | stop  (--port para outra porta).
+Aceita também as opções do main.py (--backend, --columnar, --store, --headed...); o calendário
+roda no modo --incremental por padrão.
+"""
+import argparse
+import http.server
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import main as pipeline
+from driver_pool import DriverPool
+from fetchers import HttpFetcher
+from http_cache import HttpCache
+from instrumentation import DEFAULT_METRICS_DIR, METRICS, default_metrics_path
+from nba_store import NbaStore
+from readiness import REPORT
+
+DEFAULT_INTERVALS = {"nba_stats": 15 * 60, "schedule": 60 * 60, "espn": 24 * 60 * 60}
+DEFAULT_PORT = 8770
+DEFAULT_MAX_PAGES = 200
+INTERVAL_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_interval(value):
+    """'90s', '15m', '1h', '1d' ou segundos -> segundos."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*", value.lower())
+    if not match or float(match.group(1)) <= 0:
+        raise argparse.ArgumentTypeError(f"Intervalo inválido '{value}'. Use ex: 90s, 15m, 1h, 1d.")
+    return float(match.group(1)) * INTERVAL_UNITS[match.group(2) or "s"]
+
+
+def _parse_every(value):
+    try:
+        source, interval = value.split("=", 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Formato inválido '{value}'. Use fonte=intervalo (ex: espn=1d).")
+    if source not in DEFAULT_INTERVALS:
+        raise argparse.ArgumentTypeError(f"Fonte desconhecida '{source}'. Opções: {', '.join(DEFAULT_INTERVALS)}.")
+    return source, parse_interval(interval)
+
+
+def _format_interval(seconds):
+    for unit, size in sorted(INTERVAL_UNITS.items(), key=lambda item: -item[1]):
+        if seconds >= size and seconds % size == 0:
+            return f"{seconds / size:g}{unit}"
+    return f"{seconds:g}s"
+
+
+class SourceJob:
+    """Uma fonte agendada: o scraper do main.py, suas opções e o histórico das execuções."""
+
+    def __init__(self, source, scraper, backend, options, interval):
+        self.source = source
+        self.scraper = scraper
+        self.backend = backend
+        self.options = options
+        self.interval = interval
+        self.next_run = time.time() # A primeira execução é imediata
+        self.running = False
+        self.runs = 0
+        self.last_start = None
+        self.last_seconds = None
+        self.last_error = None
+        self.failures = 0
+
+    def status(self):
+        return {
+            "interval": _format_interval(self.interval), "backend": self.backend, "running": self.running,
+            "runs": self.runs, "failures": self.failures, "last_error": self.last_error,
+            "last_start": _iso(self.last_start), "last_seconds": self.last_seconds,
+            "next_run": None if self.running else _iso(self.next_run),
+        }
+
+
+def _iso(timestamp):
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(timestamp)) if timestamp else None
+
+
+class ScrapeDaemon:
+    """
+    Agendador das fontes. Cada fonte roda numa thread própria quando vence o intervalo (ou
+    quando pedida pelo endpoint); uma fonte nunca roda duas vezes ao mesmo tempo. O pool de
+    navegadores, o cliente HTTP e o banco ficam abertos entre as execuções.
+    """
+
+    def __init__(self, jobs, pool, http, prometheus=None, metrics_dir=DEFAULT_METRICS_DIR):
+        self.jobs = {job.source: job for job in jobs}
+        self.pool = pool
+        self.http = http
+        self.prometheus = prometheus
+        self.metrics_dir = metrics_dir # None: não grava o JSONL de cada execução
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=len(self.jobs), thread_name_prefix="fonte")
+
+    def trigger(self, source=None):
+        """Antecipa a próxima execução da fonte (ou de todas). Retorna as fontes agendadas."""
+        if source is not None and source not in self.jobs:
+            raise KeyError(source)
+        with self._lock:
+            triggered = [job.source for job in self.jobs.values() if source in (None, job.source)]
+            for name in triggered:
+                self.jobs[name].next_run = time.time()
+        self._wake.set()
+        return triggered
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def status(self):
+        with self._lock:
+            sources = {name: job.status() for name, job in self.jobs.items()}
+        return {"uptime_s": round(time.time() - self.started, 1), "sources": sources, "pool": self.pool.stats()}
+
+    def run_forever(self):
+        try:
+            while not self._stop.is_set():
+                now = time.time()
+                with self._lock:
+                    due = [job for job in self.jobs.values() if not job.running and job.next_run <= now]
+                    for job in due:
+                        job.running = True
+                    waiting = [job.next_run for job in self.jobs.values() if not job.running]
+                for job in due:
+                    self._executor.submit(self._run, job)
+                # Dorme até a próxima fonte vencer, um refresh pedido ou o fim de uma execução
+                self._wake.wait(max(0.0, min(waiting, default=now + 60) - time.time()))
+                self._wake.clear()
+        finally:
+            print("\n[daemon] Encerrando: aguardando as execuções em andamento...")
+            self._executor.shutdown(wait=True)
+
+    def _run(self, job):
+        start = time.time()
+        error = None
+        print(f"\n[daemon] {_iso(start)} Iniciando {job.source} (execução {job.runs + 1}).")
+        try:
+            pipeline._run_scraper(job.scraper, job.source, self.pool, self.http, job.backend, **job.options)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        # Spans, páginas e contadores desta execução saem dos coletores globais (memória constante)
+        run = METRICS.take(job.source, started=start)
+        REPORT.take(job.source).print_summary()
+        run.print_summary()
+        if self.metrics_dir:
+            print(f"Métricas gravadas em: {run.write_jsonl(default_metrics_path(run.run_id, self.metrics_dir))}")
+        failures = run.counters.get(("failures", job.source), 0)
+        if error is None and failures:
+            error = f"{failures} falha(s) registradas pelo scraper"
+        seconds = round(time.time() - start, 2)
+        with self._lock:
+            job.running = False
+            job.runs += 1
+            job.last_start, job.last_seconds, job.last_error = start, seconds, error
+            job.failures += error is not None
+            # O intervalo conta a partir do início, para não acumular atraso. Um refresh pedido
+            # durante a execução (next_run posterior ao início) faz a fonte rodar de novo em seguida
+            if job.next_run <= start:
+                job.next_run = start + job.interval
+        print(f"[daemon] {job.source} terminou em {seconds:.1f}s{f' com erro: {error}' if error else ''}. "
+              f"Próxima execução: {_iso(job.next_run)}.")
+        if self.prometheus:
+            # Contadores acumulados desde o início do daemon (formato textfile do Prometheus)
+            METRICS.write_prometheus(self.prometheus)
+        self._wake.set()
+
+
+class ControlHandler(http.server.BaseHTTPRequestHandler):
+    daemon = None # ScrapeDaemon, definido por control_server()
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/") in ("", "/status"):
+            self._reply(200, self.daemon.status())
+        else:
+            self._reply(404, {"erro": f"Caminho desconhecido: {self.path}"})
+
+    def do_POST(self):
+        parts = [part for part in self.path.split("/") if part]
+        if parts[:1] == ["refresh"] and len(parts) <= 2:
+            try:
+                self._reply(202, {"agendadas": self.daemon.trigger(parts[1] if len(parts) == 2 else None)})
+            except KeyError:
+                self._reply(404, {"erro": f"Fonte desconhecida: {parts[1]}", "fontes": list(self.daemon.jobs)})
+        elif parts == ["stop"]:
+            self._reply(202, {"encerrando": True})
+            self.daemon.stop()
+        else:
+            self._reply(404, {"erro": f"Caminho desconhecido: {self.path}"})
+
+    def log_message(self, format, *args):
+        pass # Sem log por requisição no console da coleta
+
+
+def control_server(daemon, host="127.0.0.1", port=DEFAULT_PORT):
+    """Cria (sem iniciar) o servidor HTTP de controle do daemon (só escuta localmente por padrão)."""
+    handler = type("BoundControlHandler", (ControlHandler,), {"daemon": daemon})
+    return http.server.ThreadingHTTPServer((host, port), handler)
+
+
+def build_parser():
+    parser = pipeline.build_parser("Coleta contínua dos dados da NBA: cada fonte no seu intervalo, com sessões quentes.")
+    daemon_opts = parser.add_argument_group("daemon")
+    daemon_opts.add_argument("--every", type=_parse_every, action="append", default=[], metavar="FONTE=INTERVALO",
+                             help=f"Intervalo de uma fonte (padrão: {', '.join(f'{s}={_format_interval(i)}' for s, i in DEFAULT_INTERVALS.items())}).")
+    daemon_opts.add_argument("--only", action="append", choices=list(DEFAULT_INTERVALS), default=[],
+                             help="Agenda só as fontes indicadas (padrão: todas).")
+    daemon_opts.add_argument("--max-pages", type=int, default=DEFAULT_MAX_PAGES,
+                             help=f"Recicla uma sessão do navegador depois de N páginas (padrão: {DEFAULT_MAX_PAGES}; 0 desativa).")
+    daemon_opts.add_argument("--max-memory", type=int, metavar="MB",
+                             help="Recicla uma sessão quando o navegador passa de MB de memória (requer o psutil).")
+    daemon_opts.add_argument("--host", default="127.0.0.1", help="Endereço do endpoint de controle (padrão: 127.0.0.1).")
+    daemon_opts.add_argument("--port", type=int, default=DEFAULT_PORT,
+                             help=f"Porta do endpoint de controle (padrão: {DEFAULT_PORT}).")
+    # Numa execução periódica só o mês atual (e os meses sem placar) do calendário muda
+    parser.set_defaults(incremental=True)
+    return parser
+
+
+def run_daemon(argv=None):
+    parser = build_parser()
+    args = pipeline.check_args(parser, parser.parse_args(argv))
+    pipeline.PROFILE = pipeline.profile_from_args(args)
+    backends = {**pipeline.SOURCE_BACKENDS, **dict(args.backend)}
+    intervals = {**DEFAULT_INTERVALS, **dict(args.every)}
+
+    pool = DriverPool(pipeline.setup_driver, max_size=args.workers,
+                      max_pages=args.max_pages or None, max_memory_mb=args.max_memory)
+    cache = None if args.no_cache else HttpCache(args.cache_dir, max_bytes=args.cache_max_size)
+    http_fetcher = HttpFetcher(max_workers=args.workers, fixture_server=args.fixture_server, cache=cache)
+    store = None if args.no_store else NbaStore(args.store)
+    jobs = [SourceJob(source, scraper, backends[source], options, intervals[source])
+            for scraper, source, options in pipeline.scraper_jobs(args, store)
+            if not args.only or source in args.only]
+    # Um JSONL por execução; com --metrics-file, no diretório desse arquivo
+    metrics_dir = None if args.no_metrics else (
+        os.path.dirname(args.metrics_file) or "." if args.metrics_file else DEFAULT_METRICS_DIR)
+    daemon = ScrapeDaemon(jobs, pool, http_fetcher, prometheus=args.prometheus, metrics_dir=metrics_dir)
+    server = control_server(daemon, args.host, args.port)
+    threading.Thread(target=server.serve_forever, daemon=True, name="controle").start()
+    print(f"[daemon] Fontes: {', '.join(f'{job.source} a cada {_format_interval(job.interval)} ({job.backend})' for job in jobs)}")
+    print(f"[daemon] Controle em http://{args.host}:{server.server_port} (GET /status, POST /refresh[/FONTE], POST /stop)")
+
+    if any(job.backend == "selenium" for job in jobs):
+        # Abre o navegador antes da primeira página (Selenium Manager, perfil, etc.)
+        print("[daemon] Aquecendo uma sessão do navegador...")
+        try:
+            pool.warm(1)
+        except Exception as e:
+            print(f"[daemon] Não foi possível abrir o navegador agora: {e}")
+    try:
+        daemon.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
+        pool.close()
+        http_fetcher.close()
+        if store is not None:
+            store.close()
+        METRICS.finish()
+        METRICS.print_summary() # Totais desde o início do daemon
+        print("[daemon] Encerrado.")
+
+
+def control(argv):
+    """Cliente do endpoint de controle: status | refresh [FONTE] | stop."""
+    parser = argparse.ArgumentParser(description="Controla um daemon em execução.")
+    parser.add_argument("command", choices=("status", "refresh", "stop"))
+    parser.add_argument("source", nargs="?", choices=list(DEFAULT_INTERVALS))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    path = "/status" if args.command == "status" else f"/{args.command}" + (f"/{args.source}" if args.source else "")
+    request = urllib.request.Request(f"http://{args.host}:{args.port}{path}",
+                                     method="GET" if args.command == "status" else "POST")
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            print(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        print(e.read().decode("utf-8"))
+        sys.exit(1)
+    except urllib.error.URLError as e:
+        print(f"Daemon não encontrado em {args.host}:{args.port}: {e.reason}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] and sys.argv[1] in ("status", "refresh", "stop"):
+        control(sys.argv[1:])
+    else:
+        run_daemon()
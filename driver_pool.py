@@ -0,0 +1,169 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from instrumentation import METRICS
+
+try:
+    import psutil # Opcional: memória das sessões (reciclagem por max_memory_mb)
+except ImportError:
+    psutil = None
+
+
+class DriverPool:
+    """
+    Pool limitado de sessões do WebDriver.
+    As sessões são criadas sob demanda (até max_size) e reaproveitadas entre as páginas.
+    Com max_pages e/ou max_memory_mb (requer o psutil), uma sessão é fechada ao ser devolvida
+    depois de N páginas ou quando o navegador passa do limite de memória; a próxima página
+    abre uma sessão nova.
+    """
+
+    def __init__(self, factory, max_size=3, max_pages=None, max_memory_mb=None):
+        self.factory = factory
+        self.max_size = max(1, int(max_size))
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        if max_memory_mb and psutil is None:
+            print("[pool] psutil não instalado: reciclagem por memória desativada (pip install psutil).")
+        self._idle = queue.LifoQueue()  # LIFO: reaproveita a sessão mais "quente"
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._created = []
+        self._pages = {} # id(driver) -> páginas atendidas
+        self.recycled = 0
+
+    def _create(self):
+        driver = self.factory()
+        if driver is None:
+            raise RuntimeError("Não foi possível inicializar um novo WebDriver para o pool.")
+        with self._lock:
+            self._created.append(driver)
+            print(f"[pool] Nova sessão do navegador criada ({len(self._created)}/{self.max_size}).")
+        return driver
+
+    @contextmanager
+    def driver(self):
+        """Empresta um driver do pool, bloqueando enquanto todos estiverem ocupados."""
+        self._slots.acquire()
+        driver = None
+        try:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self._create()
+            yield driver
+        except Exception:
+            # Erro na página: se a sessão morreu (Chrome travou, InvalidSessionId...), ela não volta ao pool
+            if driver is not None and not self._alive(driver):
+                self._discard(driver, "sessão inválida após erro")
+                driver = None
+            raise
+        finally:
+            if driver is not None:
+                reason = self._recycle_reason(driver)
+                if reason:
+                    self._discard(driver, reason)
+                else:
+                    self._idle.put(driver)
+            self._slots.release()
+
+    @staticmethod
+    def _alive(driver):
+        """Consulta barata ao driver; falha se a sessão do navegador não existe mais."""
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def memory_mb(self, driver):
+        """Memória (RSS) do navegador da sessão: chromedriver e processos filhos. None sem o psutil."""
+        pid = getattr(getattr(getattr(driver, "service", None), "process", None), "pid", None)
+        if psutil is None or pid is None:
+            return None
+        try:
+            process = psutil.Process(pid)
+            return sum(p.memory_info().rss for p in [process, *process.children(recursive=True)]) / 2**20
+        except psutil.Error:
+            return None
+
+    def _recycle_reason(self, driver):
+        with self._lock:
+            pages = self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+        if self.max_pages and pages >= self.max_pages:
+            return f"{pages} páginas"
+        if self.max_memory_mb:
+            memory = self.memory_mb(driver)
+            if memory is not None and memory > self.max_memory_mb:
+                return f"{memory:.0f}MB de memória"
+        return None
+
+    def _discard(self, driver, reason):
+        with self._lock:
+            if driver in self._created:
+                self._created.remove(driver)
+            self._pages.pop(id(driver), None)
+            self.recycled += 1
+        print(f"[pool] Sessão do navegador reciclada ({reason}).")
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"[pool] Erro ao fechar sessão do navegador: {e}")
+
+    def warm(self, n=1):
+        """Abre até n sessões antecipadamente (ex: no início do daemon), deixando-as ociosas no pool."""
+        for _ in range(min(n, self.max_size) - self.sessions):
+            self._idle.put(self._create())
+
+    @property
+    def sessions(self):
+        with self._lock:
+            return len(self._created)
+
+    def stats(self):
+        with self._lock:
+            return {"sessions": len(self._created), "idle": self._idle.qsize(), "max_size": self.max_size,
+                    "recycled": self.recycled, "pages": sum(self._pages.values())}
+
+    def map(self, func, items):
+        """
+        Executa func(driver, item) para cada item, distribuindo entre os drivers do pool.
+        Retorna os resultados na mesma ordem dos itens (None para os que falharem).
+        """
+        return list(self.imap(func, items))
+
+    def imap(self, func, items):
+        """Como map(), mas entrega cada resultado (na ordem dos itens) assim que ele fica pronto."""
+        items = list(items)
+        if not items:
+            return
+        source = METRICS.current_source() # Os workers herdam a fonte de quem chamou
+
+        def run(item):
+            with METRICS.context(source=source):
+                try:
+                    with self.driver() as driver:
+                        return func(driver, item)
+                except Exception as e:
+                    print(f"[pool] Erro ao processar {item}: {e}")
+                    METRICS.count("failures")
+                    return None
+
+        with ThreadPoolExecutor(max_workers=min(self.max_size, len(items))) as executor:
+            yield from executor.map(run, items)
+
+    def close(self):
+        """Fecha todas as sessões criadas pelo pool."""
+        with self._lock:
+            drivers, self._created = self._created, []
+            self._pages.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"[pool] Erro ao fechar sessão do navegador: {e}")
+        # Esvazia a fila de ociosos (os drivers já foram fechados acima)
+        while not self._idle.empty():
+            self._idle.get_nowait()
@@ -0,0 +1,225 @@
+"""
+Backend HTTP para as páginas que não precisam de JavaScript (Basketball-Reference e ESPN).
+Usa um pool de conexões do urllib3 (keep-alive + compressão), sem abrir o navegador.
+
+Para testar offline, as URLs podem ser redirecionadas para um servidor local que
+serve HTML salvo em disco:
+
+    python fetchers.py serve fixtures/ --port 8000
+    python main.py --fixture-server http://127.0.0.1:8000
+
+A URL https://www.espn.com.br/nba/classificacao vira
+http://127.0.0.1:8000/www.espn.com.br/nba/classificacao, servida a partir de
+fixtures/www.espn.com.br/nba/classificacao (ou .../classificacao.html / index.html).
+"""
+import argparse
+import functools
+import hashlib
+import http.server
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import lxml.html
+import urllib3
+from urllib3.util import Retry
+
+from instrumentation import METRICS
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36"
+)
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
+    # gzip/deflate sempre; br/zstd apenas se os pacotes opcionais estiverem instalados
+    **urllib3.util.make_headers(accept_encoding=True),
+}
+
+
+class HttpResponse:
+    def __init__(self, url, status, headers, data, from_cache=False):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.data = data
+        self.from_cache = from_cache # True quando o servidor respondeu 304 e o corpo veio do cache
+        self._sha256 = None
+
+    @property
+    def sha256(self):
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self.data).hexdigest()
+        return self._sha256
+
+    @property
+    def encoding(self):
+        content_type = self.headers.get("Content-Type", "")
+        for part in content_type.split(";"):
+            part = part.strip()
+            if part.lower().startswith("charset="):
+                return part.split("=", 1)[1].strip('"')
+        return "utf-8"
+
+    @property
+    def text(self):
+        return self.data.decode(self.encoding, errors="replace")
+
+    def html(self):
+        """Documento lxml já com links absolutos (relativos à URL original)."""
+        doc = lxml.html.fromstring(self.data, base_url=self.url)
+        doc.make_links_absolute(self.url)
+        return doc
+
+
+class HttpFetcher:
+    """
+    Cliente HTTP compartilhado entre os workers.
+    O PoolManager mantém as conexões abertas (keep-alive) por host.
+    Com um HttpCache, as requisições são condicionais (ETag / Last-Modified).
+    """
+
+    def __init__(self, max_workers=3, timeout=20, fixture_server=None, cache=None):
+        self.max_workers = max(1, int(max_workers))
+        self.fixture_server = fixture_server.rstrip("/") if fixture_server else None
+        self.cache = cache
+        self.http = urllib3.PoolManager(
+            num_pools=10,
+            maxsize=self.max_workers,
+            block=True,
+            headers=DEFAULT_HEADERS,
+            timeout=urllib3.Timeout(connect=5, read=timeout),
+            retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+        )
+
+    def resolve(self, url):
+        """Redireciona a URL para o servidor de fixtures, se configurado."""
+        if not self.fixture_server:
+            return url
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        return f"{self.fixture_server}/{parts.netloc}{path}"
+
+    def get(self, url, headers=None, page=None):
+        """
+        Faz o GET e retorna um HttpResponse. Lança RuntimeError para status >= 400.
+        Se `page` for informado, o tempo da requisição é registrado no relatório de latência.
+        """
+        request_headers = dict(headers or {})
+        entry = self.cache.lookup(url) if self.cache else None
+        if entry:
+            request_headers.update(self.cache.validators(entry))
+
+        start = time.perf_counter()
+        try:
+            with METRICS.span("http", detail=urlsplit(url).netloc) as span:
+                resp = self.http.request("GET", self.resolve(url), headers=request_headers)
+                span.bytes = len(resp.data)
+        finally:
+            if page is not None:
+                page.add_wait(f"http: {urlsplit(url).netloc}", time.perf_counter() - start)
+        # Tentativas extras feitas pelo Retry do urllib3 (429/5xx, conexão)
+        METRICS.count("retries", len(resp.retries.history) if resp.retries else 0)
+
+        if resp.status == 304 and entry:
+            METRICS.count("http_304")
+            data = self.cache.load_body(entry)
+            if data is not None:
+                response = HttpResponse(url, 200, resp.headers, data, from_cache=True)
+                response._sha256 = entry["sha256"]
+                return response
+            # O corpo sumiu do disco: refaz a requisição sem validadores
+            return self.get(url, headers=headers, page=page)
+
+        if resp.status >= 400:
+            raise RuntimeError(f"HTTP {resp.status} ao acessar {url}")
+        response = HttpResponse(url, resp.status, resp.headers, resp.data)
+        if self.cache:
+            self.cache.store(url, resp.data, etag=resp.headers.get("ETag"),
+                             last_modified=resp.headers.get("Last-Modified"), sha256=response.sha256)
+        return response
+
+    def parse_once(self, response, parse, version=None):
+        """
+        Executa parse() só se o corpo mudou desde o último parse (ver HttpCache.parse_once).
+        `version` identifica o parser: mudar o parser invalida os resultados salvos.
+        """
+        if self.cache is None:
+            return parse()
+        return self.cache.parse_once(response.url, response.sha256, parse, version=version)
+
+    def map(self, func, items):
+        """
+        Executa func(fetcher, item) para cada item em paralelo (mesma interface do DriverPool).
+        Retorna os resultados na mesma ordem dos itens (None para os que falharem).
+        """
+        return list(self.imap(func, items))
+
+    def imap(self, func, items):
+        """Como map(), mas entrega cada resultado (na ordem dos itens) assim que ele fica pronto."""
+        items = list(items)
+        if not items:
+            return
+        source = METRICS.current_source() # Os workers herdam a fonte de quem chamou
+
+        def run(item):
+            with METRICS.context(source=source):
+                try:
+                    return func(self, item)
+                except Exception as e:
+                    print(f"[http] Erro ao processar {item}: {e}")
+                    METRICS.count("failures")
+                    return None
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            yield from executor.map(run, items)
+
+    def close(self):
+        self.http.clear()
+        if self.cache:
+            self.cache.close()
+
+
+# -----------------------------------------------------------------
+# Servidor local de fixtures (HTML salvo em disco)
+# -----------------------------------------------------------------
+class FixtureRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Serve /<host>/<caminho>, tentando também <caminho>.html e <caminho>/index.html."""
+
+    def translate_path(self, path):
+        base = super().translate_path(path.split("?", 1)[0])
+        for candidate in (base, base + ".html", os.path.join(base, "index.html")):
+            if os.path.isfile(candidate):
+                return candidate
+        return base
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures(directory, host="127.0.0.1", port=8000):
+    """Cria (sem iniciar) um servidor HTTP multithread que serve o diretório de fixtures."""
+    handler = functools.partial(FixtureRequestHandler, directory=directory)
+    return http.server.ThreadingHTTPServer((host, port), handler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Utilitários do backend HTTP.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="Serve um diretório de fixtures HTML localmente.")
+    serve.add_argument("directory")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    server = serve_fixtures(args.directory, args.host, args.port)
+    print(f"Servindo {args.directory} em http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
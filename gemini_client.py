@@ -0,0 +1,353 @@
+"""
+Cliente da API Gemini usado pelo assistente (nba_assistente.py).
+
+- Limite de requisições e de tokens por minuto (token bucket): as chamadas esperam a vez em
+  vez de estourar a cota da API e receber 429.
+- Erros 429 e 5xx são repetidos com espera exponencial e jitter; os demais sobem na hora.
+- Os tokens do prompt são estimados antes do envio e o contexto é cortado para caber no orçamento.
+- Cada chamada grava uma linha em .cache/gemini_calls.jsonl (latência, tokens, tentativas, status).
+
+Sem chave de API, o modelo falso (FakeModel) imita a cota da API:
+    python gemini_client.py simulate --calls 40 --rpm 30 --speed 20
+    python gemini_client.py stats
+"""
+import argparse
+import datetime
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_RPM = 15 # Cota do plano gratuito do gemini-2.0-flash
+DEFAULT_TPM = 1_000_000
+DEFAULT_PROMPT_BUDGET = 8000 # Tokens por prompt
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_LOG_PATH = os.path.join(".cache", "gemini_calls.jsonl")
+RETRY_STATUS = {429, 500, 502, 503, 504}
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    """Estimativa grosseira (~4 caracteres por token), suficiente para o orçamento e a cota."""
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN))
+
+
+def status_of(error):
+    """Código HTTP de um erro da API (google.api_core usa `code`; a mensagem começa com ele), ou None."""
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return int(code)
+    match = re.match(r"\s*(\d{3})\b", str(error))
+    return int(match.group(1)) if match else None
+
+
+class TokenBucket:
+    """
+    Libera `rate` unidades por período (60 s), acumulando no máximo `burst`; take() espera
+    até haver saldo.
+    """
+
+    def __init__(self, rate, period=60.0, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.capacity = rate if burst is None else max(1, burst)
+        self.per_second = rate / period
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def take(self, amount=1):
+        """Consome `amount` unidades. Retorna quantos segundos esperou."""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.per_second)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.per_second
+            self.sleep(delay)
+            waited += delay
+
+    def drain(self):
+        """Zera o saldo (a API recusou por cota: as próximas chamadas esperam a reposição)."""
+        with self._lock:
+            self.tokens = 0.0
+            self.updated = self.clock()
+
+
+def _chunk_text(chunk):
+    try:
+        return chunk.text
+    except ValueError: # Trecho sem texto (ex: só o motivo de término)
+        return ""
+
+
+class GeminiClient:
+    """
+    Envolve `model.generate_content`. Seguro entre threads: as cotas são compartilhadas
+    por todas as chamadas feitas pelo mesmo cliente.
+    """
+
+    def __init__(self, model, requests_per_minute=DEFAULT_RPM, tokens_per_minute=DEFAULT_TPM,
+                 prompt_budget=DEFAULT_PROMPT_BUDGET, max_retries=DEFAULT_MAX_RETRIES, base_delay=1.0,
+                 max_delay=30.0, log_path=DEFAULT_LOG_PATH, period=60.0, clock=time.monotonic, sleep=time.sleep):
+        self.model = model
+        # Rajada pequena: a cota da API é contada em janela deslizante, não com saldo acumulado
+        self.requests = TokenBucket(requests_per_minute, period, max(1, requests_per_minute // 5), clock, sleep)
+        self.tokens = TokenBucket(tokens_per_minute, period, clock=clock, sleep=sleep)
+        self.prompt_budget = prompt_budget
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.log_path = log_path
+        self.clock = clock
+        self.sleep = sleep
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        if log_path and os.path.dirname(log_path):
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+
+    def fit_context(self, context, build_prompt):
+        """
+        Corta linhas do contexto (nba_context.RetrievedContext), sempre da maior tabela, até o
+        prompt montado por `build_prompt(texto)` caber no orçamento. Retorna o contexto (o mesmo, se já couber).
+        """
+        while estimate_tokens(build_prompt(context.text)) > self.prompt_budget and context.rows:
+            context = context.without_last_row()
+        return context
+
+    def backoff(self, attempt):
+        """Espera antes da tentativa `attempt` (1, 2, ...): exponencial, com metade aleatória."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def stream(self, prompt):
+        """
+        Gera a resposta em trechos. Erros 429/5xx são repetidos enquanto nenhum trecho foi
+        entregue; depois disso (ou esgotadas as tentativas) o erro sobe para quem chamou.
+        """
+        metrics = {"tokens_in": estimate_tokens(prompt), "tokens_out": None, "retries": 0, "waited_s": 0.0,
+                   "first_chunk_s": None, "status": "ok", "error": None}
+        start = self.clock()
+        answer = []
+        try:
+            attempt = 0
+            while True:
+                metrics["waited_s"] += self.requests.take() + self.tokens.take(metrics["tokens_in"])
+                try:
+                    response = self.model.generate_content(prompt, stream=True)
+                    for chunk in response:
+                        text = _chunk_text(chunk)
+                        if text:
+                            if metrics["first_chunk_s"] is None:
+                                metrics["first_chunk_s"] = self.clock() - start
+                            answer.append(text)
+                            yield text
+                    usage = getattr(response, "usage_metadata", None)
+                    if usage is not None:
+                        metrics["tokens_in"] = getattr(usage, "prompt_token_count", None) or metrics["tokens_in"]
+                        metrics["tokens_out"] = getattr(usage, "candidates_token_count", None)
+                    break
+                except Exception as e:
+                    if answer or status_of(e) not in RETRY_STATUS or attempt >= self.max_retries:
+                        raise
+                    if status_of(e) == 429:
+                        self.requests.drain()
+                    attempt += 1
+                    metrics["retries"] = attempt
+                    delay = self.backoff(attempt)
+                    print(f"Gemini: erro {status_of(e)}, nova tentativa em {delay:.1f}s ({attempt}/{self.max_retries})")
+                    self.sleep(delay)
+                    metrics["waited_s"] += delay
+        except GeneratorExit: # Quem chamou parou de ler (pergunta cancelada)
+            metrics["status"] = "cancelada"
+            raise
+        except Exception as e:
+            metrics["status"] = "erro"
+            metrics["error"] = f"{type(e).__name__}: {e}"[:300]
+            raise
+        finally:
+            if metrics["tokens_out"] is None:
+                metrics["tokens_out"] = estimate_tokens("".join(answer)) if answer else 0
+            metrics["latency_s"] = self.clock() - start
+            self._record(metrics)
+
+    def generate(self, prompt):
+        """Resposta completa (mesmas regras de stream())."""
+        return "".join(self.stream(prompt))
+
+    def _record(self, metrics):
+        with self._lock:
+            self.calls += 1
+            self.retries += metrics["retries"]
+            self.failures += metrics["status"] == "erro"
+            if not self.log_path:
+                return
+            entry = {"time": datetime.datetime.now().isoformat(timespec="seconds")}
+            entry.update({key: round(value, 3) if isinstance(value, float) else value for key, value in metrics.items()})
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def stats_text(self):
+        return f"Gemini: {self.calls} chamadas, {self.retries} repetições, {self.failures} falhas"
+
+
+# -----------------------------------------------------------------
+# Modelo falso para testes locais
+# -----------------------------------------------------------------
+class FakeApiError(Exception):
+    """Imita google.api_core.exceptions (atributo `code` com o status HTTP)."""
+
+    def __init__(self, code, message):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class _FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeUsage:
+    def __init__(self, prompt_tokens, answer_tokens):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = answer_tokens
+
+
+class _FakeResponse:
+    def __init__(self, words, prompt_tokens, delay, sleep):
+        self.words = words
+        self.usage_metadata = None
+        self._prompt_tokens = prompt_tokens
+        self._delay = delay
+        self._sleep = sleep
+
+    def __iter__(self):
+        for word in self.words:
+            self._sleep(self._delay)
+            yield _FakeChunk(word)
+        self.usage_metadata = _FakeUsage(self._prompt_tokens, estimate_tokens("".join(self.words)))
+
+
+class FakeModel:
+    """
+    Substituto de genai.GenerativeModel: responde com um texto fixo, em trechos, e devolve
+    429 quando recebe mais de `requests_per_minute` chamadas numa janela de `period` segundos.
+    `error_rate` sorteia erros 503 avulsos.
+    """
+
+    def __init__(self, requests_per_minute=DEFAULT_RPM, period=60.0, error_rate=0.0, chunk_delay=0.01,
+                 answer="Resposta de teste do modelo falso.", clock=time.monotonic, sleep=time.sleep):
+        self.requests_per_minute = requests_per_minute
+        self.period = period
+        self.error_rate = error_rate
+        self.chunk_delay = chunk_delay
+        self.answer = answer
+        self.clock = clock
+        self.sleep = sleep
+        self.calls = []
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, stream=False):
+        with self._lock:
+            now = self.clock()
+            self.calls = [t for t in self.calls if now - t < self.period]
+            if len(self.calls) >= self.requests_per_minute:
+                self.rejected += 1
+                raise FakeApiError(429, "Resource has been exhausted (e.g. check quota).")
+            self.calls.append(now)
+            if random.random() < self.error_rate:
+                self.rejected += 1
+                raise FakeApiError(503, "The service is currently unavailable.")
+        words = re.findall(r"\S+\s*", self.answer)
+        response = _FakeResponse(words, estimate_tokens(prompt), self.chunk_delay, self.sleep)
+        if stream:
+            return response
+        list(response)
+        response.text = self.answer
+        return response
+
+
+def simulate(calls, rpm, speed, threads, error_rate, use_client, log_path):
+    """Dispara `calls` perguntas em `threads` threads contra o FakeModel. Retorna (ok, falhas, 429/503 recebidos, segundos)."""
+    period = 60.0 / speed
+    model = FakeModel(rpm, period=period, error_rate=error_rate, chunk_delay=0.001)
+    client = GeminiClient(model, requests_per_minute=rpm, base_delay=0.5 / speed, max_delay=period,
+                          log_path=log_path, period=period, max_retries=8)
+    prompt = "Pergunta de teste. " * 50
+
+    def one(_):
+        try:
+            if use_client:
+                client.generate(prompt)
+            else:
+                list(model.generate_content(prompt, stream=True))
+            return True
+        except Exception:
+            return False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(one, range(calls)))
+    return results.count(True), results.count(False), model.rejected, time.perf_counter() - start
+
+
+def read_log(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cliente Gemini: simulação com modelo falso e estatísticas do log.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_sim = sub.add_parser("simulate", help="Compara chamadas diretas e pelo cliente contra um modelo falso com cota.")
+    p_sim.add_argument("--calls", type=int, default=40)
+    p_sim.add_argument("--rpm", type=int, default=30, help="Cota do modelo falso (requisições por minuto)")
+    p_sim.add_argument("--speed", type=float, default=20.0, help="Acelera o relógio da cota (minuto = 60/speed s)")
+    p_sim.add_argument("--threads", type=int, default=4)
+    p_sim.add_argument("--error-rate", type=float, default=0.05, help="Fração de erros 503 avulsos")
+    p_stats = sub.add_parser("stats", help="Resumo das chamadas registradas no log.")
+    p_stats.add_argument("--log", default=DEFAULT_LOG_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "simulate":
+        minute = 60.0 / args.speed
+        print(f"--> Modelo falso: {args.rpm} req/min (minuto simulado = {minute:.1f}s), {args.calls} chamadas em {args.threads} threads")
+        for label, use_client in (("Chamadas diretas", False), ("Com GeminiClient", True)):
+            ok, failed, rejected, seconds = simulate(args.calls, args.rpm, args.speed, args.threads, args.error_rate,
+                                                     use_client, None)
+            print(f"   -> {label}: {ok} ok, {failed} falhas, {rejected} erros 429/503 da API, "
+                  f"{seconds:.1f}s ({ok / seconds * minute:.1f} respostas por minuto simulado)")
+    elif args.command == "stats":
+        entries = read_log(args.log)
+        if not entries:
+            print(f"Nenhuma chamada registrada em {args.log}.")
+            return
+        latencies = sorted(entry["latency_s"] for entry in entries)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        by_status = {}
+        for entry in entries:
+            by_status[entry["status"]] = by_status.get(entry["status"], 0) + 1
+        print(f"{len(entries)} chamadas ({', '.join(f'{n} {status}' for status, n in sorted(by_status.items()))})")
+        print(f"Latência: média {sum(latencies) / len(latencies):.2f}s, p95 {p95:.2f}s")
+        print(f"Tokens: {sum(entry['tokens_in'] for entry in entries)} de entrada, "
+              f"{sum(entry['tokens_out'] for entry in entries)} de saída")
+        print(f"Repetições: {sum(entry['retries'] for entry in entries)}, "
+              f"espera total {sum(entry['waited_s'] for entry in entries):.1f}s")
+
+
+if __name__ == "__main__":
+    main()
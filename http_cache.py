@@ -0,0 +1,263 @@
+"""
+Cache em disco das respostas HTTP, usado pelo HttpFetcher.
+
+- Guarda o corpo de cada URL junto com os validadores (ETag / Last-Modified) e o hash SHA-256.
+- Nas próximas execuções envia requisições condicionais (If-None-Match / If-Modified-Since);
+  um 304 reaproveita o corpo salvo sem baixar nada.
+- Guarda também o resultado do parse de cada página: se o hash do corpo não mudou desde o
+  último parse, o DataFrame salvo é reaproveitado e o parse é pulado.
+- Remove as entradas menos usadas (LRU) quando o tamanho total passa do limite.
+
+Inspeção e limpeza pela linha de comando:
+    python http_cache.py stats
+    python http_cache.py list
+    python http_cache.py prune --max-size 50MB
+    python http_cache.py clear
+"""
+import argparse
+import datetime
+import hashlib
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "http")
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+def parse_size(value):
+    """Converte '50MB', '200k', '1.5GB' ou '1024' em bytes."""
+    match = re.fullmatch(r"\s*([\d.]+)\s*([kmg]?)i?b?\s*", str(value).lower())
+    if not match:
+        raise ValueError(f"Tamanho inválido: {value!r} (use, por exemplo, 50MB)")
+    number, unit = match.groups()
+    return int(float(number) * {"": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}[unit])
+
+
+def format_size(num_bytes):
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024 or unit == "GB":
+            return f"{num_bytes:.0f}{unit}" if unit == "B" else f"{num_bytes:.1f}{unit}"
+        num_bytes /= 1024
+
+
+class HttpCache:
+    """Índice SQLite + arquivos com os corpos e os resultados de parse. Seguro entre threads."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(directory, "bodies"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "parsed"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, "index.sqlite"), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                key TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                sha256 TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                parsed_sha256 TEXT,
+                parsed_size INTEGER NOT NULL DEFAULT 0,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self._db.commit()
+
+    # --- caminhos ---
+    @staticmethod
+    def _key(url):
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def _body_path(self, key):
+        return os.path.join(self.directory, "bodies", key)
+
+    def _parsed_path(self, key):
+        return os.path.join(self.directory, "parsed", f"{key}.pkl")
+
+    # --- respostas ---
+    def lookup(self, url):
+        """Entrada do índice para a URL (dict) ou None."""
+        with self._lock:
+            cursor = self._db.execute(
+                "SELECT url, key, etag, last_modified, sha256, size, parsed_sha256 FROM entries WHERE url = ?", (url,)
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        columns = ("url", "key", "etag", "last_modified", "sha256", "size", "parsed_sha256")
+        return dict(zip(columns, row))
+
+    @staticmethod
+    def validators(entry):
+        """Cabeçalhos da requisição condicional a partir de uma entrada do índice."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def load_body(self, entry):
+        """Lê o corpo salvo e marca o acesso (LRU). Retorna None se o arquivo sumiu."""
+        try:
+            with open(self._body_path(entry["key"]), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            self.delete(entry["url"])
+            return None
+        with self._lock:
+            self._db.execute(
+                "UPDATE entries SET last_access = ?, hits = hits + 1 WHERE url = ?", (time.time(), entry["url"])
+            )
+            self._db.commit()
+        return data
+
+    def store(self, url, data, etag=None, last_modified=None, sha256=None):
+        """Salva (ou substitui) o corpo da URL com seus validadores."""
+        key = self._key(url)
+        sha256 = sha256 or hashlib.sha256(data).hexdigest()
+        tmp_path = self._body_path(key) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._body_path(key))
+
+        now = time.time()
+        with self._lock:
+            self._db.execute("""
+                INSERT INTO entries (url, key, etag, last_modified, sha256, size, stored_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    etag = excluded.etag, last_modified = excluded.last_modified,
+                    sha256 = excluded.sha256, size = excluded.size,
+                    stored_at = excluded.stored_at, last_access = excluded.last_access
+            """, (url, key, etag, last_modified, sha256, len(data), now, now))
+            self._db.commit()
+        self.evict()
+
+    # --- resultados de parse ---
+    def parse_once(self, url, sha256, parse, version=None):
+        """
+        Retorna o resultado salvo se o corpo (sha256) e a versão do parser não mudaram desde
+        o último parse; senão chama parse(), salva o resultado e o retorna.
+        """
+        token = f"{sha256}:{version}" if version else sha256
+        entry = self.lookup(url)
+        if entry and entry["parsed_sha256"] == token:
+            try:
+                with open(self._parsed_path(entry["key"]), "rb") as f:
+                    result = pickle.load(f)
+                print(f"[cache] Conteúdo inalterado, parse reaproveitado: {url}")
+                return result
+            except (FileNotFoundError, pickle.UnpicklingError, EOFError):
+                pass
+
+        result = parse()
+        if result is not None and entry is not None:
+            key = entry["key"]
+            with open(self._parsed_path(key), "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._lock:
+                self._db.execute(
+                    "UPDATE entries SET parsed_sha256 = ?, parsed_size = ? WHERE url = ?",
+                    (token, os.path.getsize(self._parsed_path(key)), url),
+                )
+                self._db.commit()
+        return result
+
+    # --- manutenção ---
+    def delete(self, url):
+        key = self._key(url)
+        for path in (self._body_path(key), self._parsed_path(key)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._db.commit()
+
+    def total_size(self):
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size + parsed_size), 0) FROM entries").fetchone()[0]
+
+    def evict(self, max_bytes=None):
+        """Remove as entradas acessadas há mais tempo até o total caber no limite. Retorna quantas saíram."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        total = self.total_size()
+        if total <= max_bytes:
+            return 0
+        with self._lock:
+            rows = self._db.execute("SELECT url, size + parsed_size FROM entries ORDER BY last_access ASC").fetchall()
+        removed = 0
+        for url, size in rows:
+            if total <= max_bytes:
+                break
+            self.delete(url)
+            total -= size
+            removed += 1
+        return removed
+
+    def entries(self):
+        with self._lock:
+            return self._db.execute("""
+                SELECT url, size, parsed_size, etag IS NOT NULL, last_modified IS NOT NULL,
+                       substr(parsed_sha256, 1, length(sha256)) = sha256, hits, last_access
+                FROM entries ORDER BY last_access DESC
+            """).fetchall()
+
+    def clear(self):
+        with self._lock:
+            urls = [row[0] for row in self._db.execute("SELECT url FROM entries")]
+        for url in urls:
+            self.delete(url)
+        return len(urls)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspeciona e limpa o cache HTTP dos scrapers.")
+    parser.add_argument("--dir", default=DEFAULT_CACHE_DIR, help=f"Diretório do cache (padrão: {DEFAULT_CACHE_DIR}).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Resumo do cache (entradas, tamanho, validadores).")
+    sub.add_parser("list", help="Lista as entradas, da mais recente para a mais antiga.")
+    prune = sub.add_parser("prune", help="Remove as entradas menos usadas até caber no limite.")
+    prune.add_argument("--max-size", type=parse_size, default=DEFAULT_MAX_BYTES, help="Ex: 50MB (padrão: 200MB).")
+    sub.add_parser("clear", help="Apaga todas as entradas.")
+    args = parser.parse_args(argv)
+
+    cache = HttpCache(args.dir)
+    try:
+        if args.command == "stats":
+            rows = cache.entries()
+            print(f"Diretório: {args.dir}")
+            print(f"Entradas: {len(rows)}")
+            print(f"Tamanho total: {format_size(cache.total_size())} (limite: {format_size(cache.max_bytes)})")
+            print(f"Com ETag: {sum(1 for r in rows if r[3])} | Com Last-Modified: {sum(1 for r in rows if r[4])}")
+            print(f"Com parse em cache: {sum(1 for r in rows if r[5])} | Acertos totais: {sum(r[6] for r in rows)}")
+        elif args.command == "list":
+            print(f"{'Último acesso':<20} {'Corpo':>9} {'Parse':>9} {'Acertos':>7}  URL")
+            for url, size, parsed_size, _, _, _, hits, last_access in cache.entries():
+                when = datetime.datetime.fromtimestamp(last_access).strftime("%Y-%m-%d %H:%M:%S")
+                print(f"{when:<20} {format_size(size):>9} {format_size(parsed_size):>9} {hits:>7}  {url}")
+        elif args.command == "prune":
+            removed = cache.evict(args.max_size)
+            print(f"{removed} entrada(s) removida(s). Tamanho atual: {format_size(cache.total_size())}")
+        elif args.command == "clear":
+            print(f"{cache.clear()} entrada(s) removida(s).")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
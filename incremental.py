@@ -0,0 +1,163 @@
+"""
+Atualização incremental dos arquivos JSON: reaproveita o que já foi coletado e só
+baixa de novo as páginas que ainda podem mudar.
+"""
+import datetime
+import json
+import os
+import re
+
+import pandas as pd
+
+# Ordem dos meses da temporada da NBA (usada também como MONTH_ORDER no main.py)
+SEASON_MONTHS = ['october', 'november', 'december', 'january', 'february', 'march', 'april', 'may', 'june']
+CALENDAR_MONTHS = ['january', 'february', 'march', 'april', 'may', 'june',
+                   'july', 'august', 'september', 'october', 'november', 'december']
+
+GAME_KEY = ['Date', 'Visitor/Neutral', 'Home/Neutral']
+SCORE_COLUMNS = ['Visitor PTS', 'Home PTS']
+
+
+def load_records(filename):
+    """Lê um JSON de registros já exportado. Retorna None se não existir ou estiver inválido."""
+    if not os.path.exists(filename):
+        return None
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            # json.load mantém os tipos exatamente como foram gravados (pd.read_json converteria "124" em 124)
+            return pd.DataFrame(json.load(f))
+    except Exception as e:
+        print(f"Não foi possível ler {filename} para atualização incremental: {e}")
+        return None
+
+
+def current_season_month(today=None):
+    """Mês atual em inglês e minúsculo (ex: 'november'), no formato das URLs do Basketball-Reference."""
+    today = today or datetime.date.today()
+    return CALENDAR_MONTHS[today.month - 1]
+
+
+def _season_index(month):
+    return SEASON_MONTHS.index(month) if month in SEASON_MONTHS else None
+
+
+def schedule_months_to_refresh(existing_df, today=None):
+    """
+    Decide quais meses precisam ser baixados de novo a partir do JSON existente.
+    Retorna (meses_para_baixar, meses_mantidos), ambos em minúsculo e na ordem da temporada.
+
+    Baixa de novo: o mês atual, os meses passados com algum jogo sem placar (adiado, por exemplo)
+    e os meses passados ausentes do JSON (ex: a página falhou numa coleta anterior).
+    Mantém: meses em que todos os jogos têm placar. Meses futuros ausentes são ignorados.
+    """
+    current = current_season_month(today)
+    current_index = _season_index(current)
+
+    to_refresh, kept = [], []
+    months_in_data = {str(m).lower() for m in existing_df['Month'].dropna().unique()}
+    for month in SEASON_MONTHS:
+        if month == current:
+            to_refresh.append(month)
+            continue
+        # Fora da temporada (julho a setembro) todos os meses já são passados
+        is_past = current_index is None or _season_index(month) < current_index
+        if month not in months_in_data:
+            if is_past:
+                to_refresh.append(month)
+            continue
+
+        games = existing_df[existing_df['Month'].str.lower() == month]
+        has_unplayed = games[SCORE_COLUMNS].isna().any(axis=1).any()
+        if has_unplayed and is_past:
+            to_refresh.append(month)
+        else:
+            kept.append(month)
+    return to_refresh, kept
+
+
+def merge_games(existing_df, fresh_df, refreshed_months):
+    """
+    Junta os jogos novos com os antigos pela chave Date + Visitor + Home.
+    Os meses re-baixados são substituídos pelos dados novos; os demais são mantidos.
+    """
+    refreshed = {m.lower() for m in refreshed_months}
+    kept_df = existing_df[~existing_df['Month'].str.lower().isin(refreshed)]
+    merged = pd.concat([kept_df, fresh_df], ignore_index=True)
+    merged = merged.drop_duplicates(subset=GAME_KEY, keep='last')
+
+    # Mantém a ordem da temporada (meses) e, dentro do mês, a ordem original da tabela
+    month_rank = merged['Month'].str.lower().map({m: i for i, m in enumerate(SEASON_MONTHS)})
+    merged = merged.assign(_month_rank=month_rank.fillna(len(SEASON_MONTHS)))
+    merged = merged.sort_values('_month_rank', kind='stable').drop(columns='_month_rank')
+    return merged.reset_index(drop=True)
+
+
+# -----------------------------------------------------------------
+# Cache de temporadas da ESPN
+# -----------------------------------------------------------------
+SEASON_CACHE_FILE = os.path.join(".cache", "espn_seasons.json")
+
+
+def current_season_end_year(current_season_label=None, today=None):
+    """Ano final da temporada atual (ex: '2025-26' -> 2026)."""
+    if current_season_label and current_season_label[:4].isdigit():
+        return int(current_season_label[:4]) + 1
+    today = today or datetime.date.today()
+    # A temporada começa em outubro: de outubro a dezembro o ano final é o seguinte
+    return today.year + 1 if today.month >= 10 else today.year
+
+
+def season_end_year_from_url(url):
+    """Ano de /temporada/YYYY na URL, ou None para a URL da temporada atual."""
+    match = re.search(r'/temporada/(\d{4})', url)
+    return int(match.group(1)) if match else None
+
+
+class SeasonCache:
+    """
+    Marca quais temporadas já foram coletadas e quais são finais (não mudam mais).
+    A chave é a URL /temporada/YYYY; os dados continuam no JSON exportado.
+    """
+
+    def __init__(self, path=SEASON_CACHE_FILE):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                print(f"Cache de temporadas inválido ({path}): {e}. Ignorando.")
+
+    def is_final(self, url):
+        return bool(self.entries.get(url, {}).get('final'))
+
+    def mark(self, url, season, rows, final):
+        self.entries[url] = {
+            'season': season,
+            'rows': int(rows),
+            'final': bool(final),
+            'scraped_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        }
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def espn_seasons_to_refresh(seasons, existing_df, cache):
+    """
+    Separa as temporadas (url, rótulo) entre as que precisam ser raspadas e as que
+    podem ser reaproveitadas do JSON existente (finais no cache e presentes no arquivo).
+    """
+    seasons_in_data = set(existing_df['Season'].dropna().unique()) if existing_df is not None else set()
+    to_scrape, reused = [], []
+    for url, label in seasons:
+        if cache.is_final(url) and label in seasons_in_data:
+            reused.append((url, label))
+        else:
+            to_scrape.append((url, label))
+    return to_scrape, reused
@@ -0,0 +1,300 @@
+"""
+Instrumentação da coleta (main.py): spans por etapa e contadores de cada execução.
+
+Fases medidas (cada medição vira um span com fonte, página, duração, bytes e linhas):
+- navigate: driver.get                      - wait: esperas do readiness (WebDriverWait)
+- http: GET do backend HTTP / API de stats  - extract: outerHTML / scripts de extração (execute_script)
+- parse: HTML/JSON -> DataFrame             - serialize: gravação do JSON/Parquet/Arrow/banco
+Spans que terminam com exceção contam como erro da fase. Contadores por fonte: linhas
+produzidas, retries, respostas 304 do cache, falhas (scraper ou página que desistiu) e
+requisições bloqueadas pelo perfil do navegador (browser_profile.py).
+
+No fim da execução o main.py grava metrics/run-<data>.jsonl (uma linha por span, uma por
+contador e uma de resumo), imprime a tabela por fonte e fase e, com --prometheus ARQUIVO,
+grava as mesmas métricas no formato texto do Prometheus (ex: para o textfile collector).
+
+Resumo de um arquivo já gravado:
+    python instrumentation.py metrics/run-20251101-120000.jsonl
+"""
+import argparse
+import datetime
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+PHASES = ("navigate", "wait", "http", "extract", "parse", "serialize")
+DEFAULT_METRICS_DIR = "metrics"
+# Prefixo do nome da página no relatório de latência -> fonte
+PAGE_SOURCES = {"NBA Stats": "nba_stats", "Schedule": "schedule", "ESPN": "espn"}
+
+
+def source_of_page(page_name):
+    return PAGE_SOURCES.get(page_name.split(":", 1)[0].strip())
+
+
+class Span:
+    def __init__(self, phase, source=None, page=None, detail=None):
+        self.phase = phase
+        self.source = source
+        self.page = page
+        self.detail = detail
+        self.start = time.time()
+        self.seconds = 0.0
+        self.bytes = 0
+        self.rows = 0
+        self.error = None
+
+    def to_dict(self):
+        return {
+            "type": "span", "phase": self.phase, "source": self.source, "page": self.page, "detail": self.detail,
+            "start": round(self.start, 3), "seconds": round(self.seconds, 6), "bytes": self.bytes, "rows": self.rows,
+            "error": self.error,
+        }
+
+
+class RunMetrics:
+    """
+    Coletor thread-safe dos spans e contadores de uma execução. A fonte e a página de cada
+    span vêm do contexto da thread (context()), já que as páginas rodam em paralelo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.started = time.time()
+        self.finished = None # Preenchido por finish()
+        self.run_id = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.spans = []
+        self.counters = {} # (nome, fonte) -> valor
+        self.totals = {} # (fonte, fase) -> agregado dos spans já retirados por take()
+        self._taken_counters = {} # Valor dos contadores no último take(), para o delta de cada execução
+
+    @contextmanager
+    def context(self, source=None, page=None):
+        """Define a fonte/página dos spans feitos nesta thread dentro do bloco."""
+        previous = getattr(self._local, "context", (None, None))
+        self._local.context = (source or previous[0], page or previous[1])
+        try:
+            yield
+        finally:
+            self._local.context = previous
+
+    def _current(self):
+        return getattr(self._local, "context", (None, None))
+
+    def current_source(self):
+        """Fonte da thread atual (para repassar às threads dos workers)."""
+        return self._current()[0]
+
+    @contextmanager
+    def span(self, phase, detail=None, source=None):
+        """Mede o bloco. O span pode receber bytes/rows dentro dele; uma exceção fica registrada como erro."""
+        current_source, current_page = self._current()
+        span = Span(phase, source or current_source, current_page, detail)
+        start = time.perf_counter()
+        try:
+            yield span
+        except Exception as e:
+            span.error = f"{type(e).__name__}: {e}"[:200]
+            raise
+        finally:
+            span.seconds = time.perf_counter() - start
+            self._add(span)
+
+    def record(self, phase, seconds, detail=None, source=None, bytes=0, rows=0, error=None):
+        """Registra um span já medido (ex: as esperas do readiness, que medem o próprio tempo)."""
+        current_source, current_page = self._current()
+        span = Span(phase, source or current_source, current_page, detail)
+        span.start -= seconds
+        span.seconds, span.bytes, span.rows, span.error = seconds, bytes, rows, error
+        self._add(span)
+
+    def _add(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def count(self, name, n=1, source=None):
+        """Soma n ao contador `name` (rows, retries, http_304, failures, blocked_*) da fonte atual."""
+        if not n:
+            return
+        key = (name, source or self._current()[0])
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def finish(self):
+        self.finished = time.time()
+
+    @property
+    def duration(self):
+        return (self.finished or time.time()) - self.started
+
+    def summary(self):
+        """{(fonte, fase): {n, seconds, max, bytes, rows, errors}}, incluindo os spans já retirados por take()."""
+        with self._lock:
+            spans = list(self.spans)
+            table = {key: dict(entry) for key, entry in self.totals.items()}
+        _aggregate(table, spans)
+        return table
+
+    def take(self, source, started=None):
+        """
+        Retira os spans da fonte (e os sem fonte) e devolve um RunMetrics só com eles e com o
+        quanto os contadores da fonte andaram desde o último take(). Os spans retirados ficam
+        apenas agregados em totals (usados pelo Prometheus): um processo longo (daemon.py) não
+        acumula spans entre as execuções.
+        """
+        run = RunMetrics()
+        run.run_id = f"{source}-{run.run_id}"
+        run.started = started or run.started
+        with self._lock:
+            run.spans = [span for span in self.spans if span.source in (source, None)]
+            self.spans = [span for span in self.spans if span.source not in (source, None)]
+            _aggregate(self.totals, run.spans)
+            for key, value in self.counters.items():
+                if key[1] == source and value != self._taken_counters.get(key, 0):
+                    run.counters[key] = value - self._taken_counters.get(key, 0)
+                    self._taken_counters[key] = value
+        run.finish()
+        return run
+
+    def print_summary(self):
+        table = self.summary()
+        if not table:
+            return
+        order = {phase: i for i, phase in enumerate(PHASES)}
+        print("\n" + "=" * 50)
+        print("MÉTRICAS POR FONTE E FASE")
+        print(f"{'Fonte':<10} {'Fase':<10} {'N':>5} {'Total':>9} {'Média':>9} {'Máx':>9} {'KB':>9} {'Linhas':>7} {'Erros':>5}")
+        for (source, phase), e in sorted(table.items(), key=lambda item: (item[0][0], order.get(item[0][1], 99))):
+            print(f"{source:<10} {phase:<10} {e['n']:>5d} {e['seconds']:>8.2f}s {e['seconds'] / e['n'] * 1000:>7.1f}ms "
+                  f"{e['max'] * 1000:>7.1f}ms {e['bytes'] / 1024:>9.1f} {e['rows']:>7d} {e['errors']:>5d}")
+        with self._lock:
+            counters = dict(self.counters)
+        if counters:
+            print("Contadores: " + ", ".join(f"{name}[{source or '-'}]={value}"
+                                             for (name, source), value in sorted(counters.items(), key=lambda i: (i[0][0], i[0][1] or ""))))
+
+    def write_jsonl(self, path):
+        """Uma linha por span, uma por contador e uma linha final de resumo da execução."""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+        with open(path, "w", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps({"run_id": self.run_id, **span.to_dict()}, ensure_ascii=False) + "\n")
+            for (name, source), value in sorted(counters.items(), key=lambda i: (i[0][0], i[0][1] or "")):
+                f.write(json.dumps({"run_id": self.run_id, "type": "counter", "name": name, "source": source,
+                                    "value": value}) + "\n")
+            f.write(json.dumps({"run_id": self.run_id, "type": "run", "started": round(self.started, 3),
+                                "seconds": round(self.duration, 3), "spans": len(spans)}) + "\n")
+        return path
+
+    def prometheus_text(self):
+        """Métricas no formato texto de exposição do Prometheus."""
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        table = self.summary()
+        metric("nba_scrape_phase_seconds_total", "counter", "Tempo gasto em cada fase da coleta.",
+               [({"source": s, "phase": p}, round(e["seconds"], 6)) for (s, p), e in sorted(table.items())])
+        metric("nba_scrape_phase_spans_total", "counter", "Número de medições de cada fase.",
+               [({"source": s, "phase": p}, e["n"]) for (s, p), e in sorted(table.items())])
+        metric("nba_scrape_phase_bytes_total", "counter", "Bytes baixados ou gravados em cada fase.",
+               [({"source": s, "phase": p}, e["bytes"]) for (s, p), e in sorted(table.items()) if e["bytes"]])
+        metric("nba_scrape_phase_errors_total", "counter", "Medições de cada fase que terminaram com erro.",
+               [({"source": s, "phase": p}, e["errors"]) for (s, p), e in sorted(table.items()) if e["errors"]])
+        with self._lock:
+            counters = dict(self.counters)
+        for name, help_text in (("rows", "Linhas produzidas."), ("retries", "Novas tentativas."),
+                                ("http_304", "Respostas 304 (corpo reaproveitado do cache)."),
+                                ("failures", "Falhas de scrapers e páginas."),
+                                ("blocked_requests", "Requisições bloqueadas pelo perfil do navegador."),
+                                ("blocked_bytes_est", "Bytes economizados pelo bloqueio (estimativa).")):
+            samples = [({"source": source or "-"}, value) for (counter, source), value in sorted(
+                counters.items(), key=lambda i: i[0][1] or "") if counter == name]
+            metric(f"nba_scrape_{name}_total", "counter", help_text, samples)
+        metric("nba_scrape_run_duration_seconds", "gauge", "Duração da última execução.",
+               [({}, round(self.duration, 3))])
+        metric("nba_scrape_last_run_timestamp_seconds", "gauge", "Início da última execução (epoch).",
+               [({}, round(self.started, 3))])
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Grava num temporário e renomeia (o coletor nunca lê um arquivo pela metade)."""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+        return path
+
+
+def _aggregate(table, spans):
+    for span in spans:
+        entry = table.setdefault((span.source or "-", span.phase),
+                                 {"n": 0, "seconds": 0.0, "max": 0.0, "bytes": 0, "rows": 0, "errors": 0})
+        entry["n"] += 1
+        entry["seconds"] += span.seconds
+        entry["max"] = max(entry["max"], span.seconds)
+        entry["bytes"] += span.bytes
+        entry["rows"] += span.rows
+        entry["errors"] += span.error is not None
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def default_metrics_path(run_id, directory=DEFAULT_METRICS_DIR):
+    return os.path.join(directory, f"run-{run_id}.jsonl")
+
+
+def load_jsonl(path):
+    """Reconstrói um RunMetrics a partir de um arquivo gravado por write_jsonl."""
+    metrics = RunMetrics()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry["type"] == "span":
+                span = Span(entry["phase"], entry["source"], entry["page"], entry["detail"])
+                span.start, span.seconds, span.bytes, span.rows, span.error = (
+                    entry["start"], entry["seconds"], entry["bytes"], entry["rows"], entry["error"])
+                metrics.spans.append(span)
+            elif entry["type"] == "counter":
+                metrics.counters[(entry["name"], entry["source"])] = entry["value"]
+            elif entry["type"] == "run":
+                metrics.run_id, metrics.started = entry["run_id"], entry["started"]
+                metrics.finished = entry["started"] + entry["seconds"]
+    return metrics
+
+
+METRICS = RunMetrics()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resumo de um arquivo de métricas da coleta (metrics/run-*.jsonl).")
+    parser.add_argument("path")
+    parser.add_argument("--prometheus", action="store_true", help="Mostra no formato texto do Prometheus.")
+    args = parser.parse_args(argv)
+
+    metrics = load_jsonl(args.path)
+    if args.prometheus:
+        print(metrics.prometheus_text(), end="")
+    else:
+        print(f"Execução {metrics.run_id}: {len(metrics.spans)} spans")
+        metrics.print_summary()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,128 @@
+import argparse
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait, Select
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import Select
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
 import re # Importado para usar regex na extração da temporada
+from urllib.parse import urlsplit
+from browser_profile import BrowserProfile, add_arguments as add_browser_arguments, profile_from_args
+from collector import FrameCollector
+from driver_pool import DriverPool
+from fetchers import HttpFetcher
+from instrumentation import METRICS, default_metrics_path
+from http_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, HttpCache, parse_size
+from nba_stats_api import fetch_player_stats
+from nba_store import DEFAULT_STORE_PATH, NbaStore, StoreWriter
+from table_parser import ESPN_STANDINGS_SCHEMA, PLAYER_STATS_SCHEMA, SCHEDULE_SCHEMA, parse_table
+from writers import COLUMNAR_FORMATS, ColumnarWriter, JsonRecordsSink, MultiWriter, columnar_available, columnar_path, write_frame
+import incremental
+import readiness
+from readiness import REPORT, try_wait_for, wait_for
 
 # --- CONFIGURAÇÕES GLOBAIS ---
 # Usamos o Service() vazio para que o Selenium Manager (nativo) cuide do driver
 SERVICE = Service() 
-OPTIONS = webdriver.ChromeOptions()
+BINARY_LOCATION = None
+# Perfil das sessões do navegador (headless, bloqueio de imagens/fontes/anúncios); ver browser_profile.py
+PROFILE = BrowserProfile()
 # Verifica se estamos no Linux Mint para definir o caminho do Chromium
 # (Pode ser necessário ajustar se o caminho for diferente em outras distros)
 try:
     with open('/etc/os-release') as f:
         if 'ID=linuxmint' in f.read():
-             OPTIONS.binary_location = "/usr/bin/chromium" # AJUSTADO - Caminho para Chromium no Mint
+             BINARY_LOCATION = "/usr/bin/chromium" # AJUSTADO - Caminho para Chromium no Mint
 except FileNotFoundError:
      # Se não for Mint ou o arquivo não existir, Selenium tentará encontrar o Chrome/Chromium padrão
      print("Não foi possível detectar o Mint ou encontrar /etc/os-release. Usando navegador padrão.")
      pass
 
+# Backend usado por cada fonte: "selenium" (navegador), "http" (HTML do servidor, sem JavaScript)
+# ou "api" (endpoint JSON do stats.nba.com). Pode ser sobrescrito com --backend fonte=backend
+SOURCE_BACKENDS = {
+    "nba_stats": "api", # Se a API falhar, cai para o Selenium
+    "schedule": "http",
+    "espn": "http",
+}
+SUPPORTED_BACKENDS = {
+    "nba_stats": ("api", "selenium"),
+    "schedule": ("http", "selenium"),
+    "espn": ("http", "selenium"),
+}
+
+NBA_STATS_SEASON = "2025-26"
+NBA_STATS_SEASON_TYPE = "Regular Season"
+NBA_STATS_JSON = "nba_stats_2025_26_players_filtrado.json"
+NBA_STATS_COLUMNS = PLAYER_STATS_SCHEMA.dtypes() # Mesmas colunas na API e na tabela do site
+# Tipos da saída colunar (Parquet/Arrow): além dos numéricos, o time vira categoria
+NBA_STATS_COLUMNAR = {**NBA_STATS_COLUMNS, 'Team': 'category'}
+
+
+def _open_outputs(json_filename, formats=(), types=None, partition_by=None, date_format=None,
+                  store=None, table=None, season=None):
+    """
+    Destinos de um scraper: sempre o JSON; se pedido (--columnar), Parquet e/ou Arrow IPC;
+    e a tabela correspondente do banco local (nba_store), se houver um.
+    """
+    writers = [JsonRecordsSink(json_filename)]
+    for fmt in formats:
+        writers.append(ColumnarWriter(columnar_path(json_filename, fmt), fmt, types=types,
+                                      partition_by=partition_by, date_format=date_format))
+    if store is not None:
+        writers.append(StoreWriter(store, table, season=season))
+    return MultiWriter(writers)
+
+
+def _has_class(class_name):
+    """Predicado XPath equivalente ao seletor CSS .class_name (usado no backend HTTP)."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+def _navigate(driver, url):
+    """driver.get medido como span 'navigate' (ver instrumentation.py), com as estatísticas de bloqueio do perfil."""
+    with METRICS.span("navigate", detail=urlsplit(url).netloc):
+        driver.get(url)
+    PROFILE.log_page(driver, urlsplit(url).path)
+
+
+def _outer_html(element):
+    """HTML do elemento, medido como span 'extract'."""
+    with METRICS.span("extract") as span:
+        html = element.get_attribute('outerHTML')
+        span.bytes = len(html or "")
+    return html
+
+
+def _run_extraction(driver, script, *args):
+    """
+    Executa um script de extração no navegador e retorna o resultado (listas/dicts JSON).
+    Uma única ida e volta ao WebDriver, em vez de uma por elemento; medido como span 'extract'.
+    """
+    with METRICS.span("extract") as span:
+        payload = driver.execute_script(script, *args)
+        span.bytes = len(json.dumps(payload, ensure_ascii=False)) if payload is not None else 0
+    return payload
+
+
 def setup_driver():
-    """Inicializa e retorna o WebDriver."""
+    """Inicializa e retorna o WebDriver, com o perfil (PROFILE) aplicado."""
     # Tratamento de erro caso o binário não seja encontrado no caminho especificado
     try:
-        driver = webdriver.Chrome(service=SERVICE, options=OPTIONS)
+        driver = webdriver.Chrome(service=SERVICE, options=PROFILE.chrome_options(BINARY_LOCATION))
+        PROFILE.apply(driver)
         return driver
     except Exception as e:
         print(f"Erro ao inicializar o WebDriver: {e}")
-        print("Verifique se o Chrome/Chromium está instalado e se o caminho em OPTIONS.binary_location está correto.")
+        print("Verifique se o Chrome/Chromium está instalado e se o caminho em BINARY_LOCATION está correto.")
         # Tenta sem o binary_location como fallback
         print("Tentando inicializar sem especificar o caminho do binário...")
         try:
-            options_fallback = webdriver.ChromeOptions()
-            driver = webdriver.Chrome(service=Service(), options=options_fallback)
+            driver = webdriver.Chrome(service=Service(), options=PROFILE.chrome_options())
+            PROFILE.apply(driver)
             print("WebDriver inicializado com sucesso (sem caminho específico).")
             return driver
         except Exception as fallback_e:
@@ -46,59 +131,128 @@ def setup_driver():
             exit() # Sai do script se não conseguir iniciar o driver
 
 
-def scraper_nba_stats(driver):
+COOKIE_BUTTON_ID = "onetrust-accept-btn-handler"
+COOKIE_BANNER_ID = "onetrust-banner-sdk"
+# Gravado pelo OneTrust quando o banner é fechado: numa sessão reaproveitada o banner não volta
+COOKIE_CONSENT_NAME = "OptanonAlertBoxClosed"
+
+
+def accept_cookies(driver, page=None):
+    """Aceita o banner de cookies (OneTrust) e espera ele sumir, em vez de um sleep fixo."""
+    try:
+        if driver.get_cookie(COOKIE_CONSENT_NAME) is not None:
+            # Sessão quente (daemon.py): cookies já aceitos, não espera pelo botão
+            return True
+    except Exception:
+        pass
+    cookie_button = try_wait_for(driver, readiness.clickable(COOKIE_BUTTON_ID, timeout=10), page)
+    if cookie_button is None:
+        print("Botão de cookies não encontrado ou já aceito. Continuando...")
+        return False
+    try:
+        cookie_button.click()
+        print("Cookies aceitos com sucesso.")
+        try_wait_for(driver, readiness.gone(COOKIE_BANNER_ID, timeout=5), page)
+        return True
+    except Exception as e_cookie:
+        print(f"Erro inesperado ao tratar cookies: {e_cookie}. Continuando...")
+        return False
+
+
+def _export_player_stats(df_final, JSON_FILENAME=NBA_STATS_JSON, formats=(), store=None):
+    players = FrameCollector("nba_stats", NBA_STATS_COLUMNS)
+    players.add(df_final)
+    df_final = players.frame()
+    outputs = _open_outputs(JSON_FILENAME, formats, NBA_STATS_COLUMNAR, store=store, table="players", season=NBA_STATS_SEASON)
+    write_frame(df_final, outputs)
+
+    print(f"\n--- SUCESSO SCRAPER 1 ---")
+    print(f"Dados exportados para: {', '.join(outputs.paths)}")
+    print(f"Total de registros exportados: {len(df_final)}")
+
+
+def scraper_nba_stats(pool, http, backend=None, replay_dir=None, record_dir=None, formats=(), store=None):
     """
     Método 1: Scraper NBA Stats
     Endpoint: https://www.nba.com/stats/players/traditional?Season=2025-26&SeasonType=Regular%20Season
+    Backend "api": lê o JSON do stats.nba.com direto (replay_dir/record_dir para testes offline).
+    Backend "selenium": renderiza a tabela no navegador (também usado se a API falhar).
     """
-    URL = "https://www.nba.com/stats/players/traditional?Season=2025-26&SeasonType=Regular%20Season"
-    JSON_FILENAME = "nba_stats_2025_26_players_filtrado.json"
-    all_records_df = pd.DataFrame()
+    backend = backend or SOURCE_BACKENDS["nba_stats"]
+    if backend == "api":
+        with REPORT.page("NBA Stats: API") as page:
+            if _scraper_nba_stats_api(http, page, replay_dir, record_dir, formats, store) or replay_dir:
+                return
+        print("Falha na API de stats. Usando o navegador (Selenium) como alternativa...")
+
+    with pool.driver() as driver, REPORT.page("NBA Stats: jogadores") as page:
+        _scraper_nba_stats(driver, page, formats, store)
+
+
+def _scraper_nba_stats_api(http, page, replay_dir=None, record_dir=None, formats=(), store=None):
+    """Busca a tabela pelo endpoint JSON. Retorna True se exportou os dados."""
+    print("=" * 50)
+    print("INICIANDO SCRAPER 1: NBA PLAYER STATS (API)")
+    print(f"Temporada: {NBA_STATS_SEASON} ({NBA_STATS_SEASON_TYPE})")
+
+    try:
+        df_final = fetch_player_stats(http, NBA_STATS_SEASON, NBA_STATS_SEASON_TYPE,
+                                      replay_dir=replay_dir, record_dir=record_dir, page=page)
+        if df_final.empty:
+            print("A API não retornou nenhum jogador.")
+            return False
+        _export_player_stats(df_final, formats=formats, store=store)
+        return True
+    except Exception as e:
+        METRICS.count("failures")
+        print(f"\n--- ERRO SCRAPER 1 (API) ---")
+        print(f"Ocorreu um erro ao consultar a API: {e}")
+        return False
+
+
+def _scraper_nba_stats(driver, page, formats=(), store=None):
+    URL = f"https://www.nba.com/stats/players/traditional?Season={NBA_STATS_SEASON}&SeasonType={NBA_STATS_SEASON_TYPE.replace(' ', '%20')}"
 
     print("=" * 50)
     print("INICIANDO SCRAPER 1: NBA PLAYER STATS")
     print(f"Acessando o endpoint: {URL}")
 
     try:
-        driver.get(URL)
+        _navigate(driver, URL)
 
         # 2. Tratamento de Cookies (ID: onetrust-accept-btn-handler)
-        cookie_button_id = "onetrust-accept-btn-handler"
-        try:
-            cookie_button = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.ID, cookie_button_id))
-            )
-            cookie_button.click()
-            print("Cookies aceitos com sucesso.")
-            time.sleep(2) # Aumentar ligeiramente a espera após aceitar cookies
-        except TimeoutException:
-            print("Botão de cookies não encontrado ou já aceito. Continuando...")
-        except Exception as e_cookie:
-            print(f"Erro inesperado ao tratar cookies: {e_cookie}. Continuando...")
+        accept_cookies(driver, page)
 
         # 3. Esperar e selecionar 'All' para a paginação
         pagination_dropdown_selector = "div.Pagination_content__f2at7 select"
+        table_css_selector = "table.Crom_table__p1iZz"
+        row_selector = f"{table_css_selector} tbody tr"
 
         try:
-            WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, pagination_dropdown_selector))
-            )
+            wait_for(driver, readiness.present(pagination_dropdown_selector, timeout=20), page)
             print("Dropdown de paginação encontrado. Tentando selecionar 'All'...")
-            
+
             retries = 3
             selected = False
             while retries > 0 and not selected:
                 try:
+                    rows_before = len(driver.find_elements(By.CSS_SELECTOR, row_selector))
                     select_element = driver.find_element(By.CSS_SELECTOR, pagination_dropdown_selector)
                     select = Select(select_element)
-                    select.select_by_value("-1") 
+                    select.select_by_value("-1")
                     print("Opção 'All' selecionada. Aguardando o carregamento de todos os registros...")
-                    time.sleep(7) 
+                    # Espera a contagem de linhas mudar e estabilizar (antes: sleep fixo de 7s)
+                    rows = try_wait_for(driver, readiness.rows_stable(row_selector, different_from=rows_before, timeout=20), page)
+                    if rows is None:
+                        print("A contagem de linhas não estabilizou a tempo. Prosseguindo com os dados visíveis.")
+                    else:
+                        print(f"Tabela estabilizada com {rows} linhas.")
                     selected = True
                 except (NoSuchElementException, StaleElementReferenceException) as e_select:
                     print(f"Tentativa {4-retries}: Erro ao encontrar/selecionar o dropdown ({e_select}). Tentando novamente...")
                     retries -= 1
-                    time.sleep(3)
+                    METRICS.count("retries")
+                    try_wait_for(driver, readiness.present(pagination_dropdown_selector, timeout=3), page)
                 except Exception as e_general_select:
                      print(f"Erro inesperado ao selecionar 'All': {e_general_select}. Prosseguindo...")
                      break # Sai do loop se for um erro diferente
@@ -111,65 +265,27 @@ def scraper_nba_stats(driver):
 
 
         # 4. Extrair a Tabela com Pandas
-        table_css_selector = "table.Crom_table__p1iZz"
-
         try:
-            table_element = WebDriverWait(driver, 15).until( # Aumentar espera pela tabela
-                EC.presence_of_element_located((By.CSS_SELECTOR, table_css_selector))
-            )
+            table_element = wait_for(driver, readiness.present(table_css_selector, timeout=15), page)
 
             # Usar JavaScript para garantir que a tabela esteja visível
             driver.execute_script("arguments[0].scrollIntoView(true);", table_element)
-            time.sleep(1)
-
-            html_content = table_element.get_attribute('outerHTML')
-            tables = pd.read_html(html_content)
-
-            if tables:
-                df = tables[0]
-                if not df.empty:
-                    all_records_df = pd.concat([all_records_df, df], ignore_index=True)
-                    print(f"Dados brutos extraídos. Total de linhas: {len(all_records_df)}")
-
-                    # 5. Limpeza e Exportação
-
-                    # 5.1. Renomear e limpar a coluna de Rank (se existir)
-                    if 'Unnamed: 0' in all_records_df.columns:
-                        all_records_df = all_records_df.rename(columns={'Unnamed: 0': 'RANK'})
-
-                    # 5.2. FILTRAGEM CRUCIAL: Remove colunas que terminam com ' RANK' (com espaço antes)
-                    cols_to_keep = [col for col in all_records_df.columns
-                                    if not (isinstance(col, str) and col.strip().endswith(' RANK'))]
-
-                    # Verifica se cols_to_keep não está vazio
-                    if not cols_to_keep:
-                         print("Erro: Nenhuma coluna mantida após a filtragem. Verifique os nomes das colunas.")
-                         df_final = all_records_df # Mantém o DF original se a filtragem falhar
-                    elif set(cols_to_keep) == set(all_records_df.columns):
-                         print("Nenhuma coluna 'RANK' encontrada para remover.")
-                         df_final = all_records_df
-                    else:
-                        print(f"Colunas removidas: {set(all_records_df.columns) - set(cols_to_keep)}")
-                        df_final = all_records_df[cols_to_keep]
-
 
-                    # 5.3. Remover linhas completamente nulas
-                    df_final = df_final.dropna(how='all')
+            html_content = _outer_html(table_element)
+            # O esquema já renomeia a coluna sem nome para RANK, remove as colunas ' RANK'
+            # e converte os tipos durante o parse (antes: pd.read_html + correções)
+            with page.parsing():
+                df = parse_table(html_content, PLAYER_STATS_SCHEMA)
 
-                    # 5.4. Converte e salva no JSON
-                    data_json = df_final.to_json(orient='records', indent=4, force_ascii=False) # Adicionado force_ascii=False
+            if not df.empty:
+                print(f"Dados extraídos. Total de linhas: {len(df)}")
 
-                    with open(JSON_FILENAME, 'w', encoding='utf-8') as f:
-                        f.write(data_json)
+                # 5. Remover linhas completamente nulas e exportar
+                df_final = df.dropna(how='all')
+                _export_player_stats(df_final, formats=formats, store=store)
 
-                    print(f"\n--- SUCESSO SCRAPER 1 ---")
-                    print(f"Dados exportados para o arquivo: {JSON_FILENAME}")
-                    print(f"Total de registros exportados: {len(df_final)}")
-
-                else:
-                    print("DataFrame extraído da tabela está vazio.")
             else:
-                print("Nenhuma tabela de stats de jogadores encontrada com o seletor.")
+                print("DataFrame extraído da tabela está vazio.")
 
         except TimeoutException:
             print("Tabela de jogadores não encontrada após 15 segundos.")
@@ -177,451 +293,815 @@ def scraper_nba_stats(driver):
             print(f"Erro ao extrair ou processar a tabela: {e_table}")
 
     except Exception as e:
+        METRICS.count("failures")
         print(f"\n--- ERRO CRÍTICO SCRAPER 1 ---")
         print(f"Ocorreu um erro geral: {e}")
 
 
-def scraper_basketball_reference_schedule(driver):
+# Define a ordem correta dos meses da temporada da NBA
+MONTH_ORDER = incremental.SEASON_MONTHS
+SCHEDULE_URL_TEMPLATE = "https://www.basketball-reference.com/leagues/NBA_2026_games-{month}.html"
+SCHEDULE_JSON = "nba_2026_schedule_completo.json"
+SCHEDULE_SEASON = "2025-26" # Temporada das páginas NBA_2026_games-*.html
+SCHEDULE_COLUMNS = {**SCHEDULE_SCHEMA.dtypes(), 'Month': 'str'}
+# Saída colunar: placar e público numéricos, data de verdade, times/arenas como categoria; particionada por mês
+SCHEDULE_COLUMNAR = {
+    **SCHEDULE_COLUMNS,
+    'Date': 'date', 'Visitor/Neutral': 'category', 'Visitor PTS': 'int', 'Home/Neutral': 'category',
+    'Home PTS': 'int', 'Overtime': 'category', 'Attend.': 'int', 'Arena': 'category', 'Month': 'category',
+}
+SCHEDULE_DATE_FORMAT = "%a, %b %d, %Y" # Ex: "Tue, Oct 21, 2025"
+
+
+def get_month_from_url(url):
+    try:
+        return url.split('-')[-1].split('.')[0].lower()
+    except:
+        return None
+
+
+def _schedule_frame_from_html(table, month_name, page):
+    """
+    Converte a tabela de jogos (HTML ou elemento lxml) no DataFrame do mês (comum aos dois backends).
+    As linhas 'Date' repetidas e a coluna 'Box Score' já são descartadas pelo esquema.
+    """
+    with page.parsing():
+        df_month = parse_table(table, SCHEDULE_SCHEMA)
+    if df_month.empty:
+        return None
+
+    df_month['Month'] = month_name
+    return df_month
+
+
+def _read_schedule_table(driver, table_css_selector, month_name, page):
+    """Lê a tabela de jogos já carregada no driver e retorna o DataFrame do mês."""
+    table_element = driver.find_element(By.CSS_SELECTOR, table_css_selector)
+    html_content = _outer_html(table_element)
+    return _schedule_frame_from_html(html_content, month_name, page)
+
+
+def _scrape_schedule_month(driver, url):
+    """Coleta a tabela de um único mês. Executado em paralelo pelos workers do pool."""
+    month_name = get_month_from_url(url).capitalize() if get_month_from_url(url) else "Desconhecido"
+    with REPORT.page(f"Schedule: {month_name}") as page:
+        return _scrape_schedule_month_page(driver, url, month_name, page)
+
+
+def _scrape_schedule_month_page(driver, url, month_name, page):
+    print(f"\n--> Coletando dados para o mês: {month_name}")
+    table_css_selector = "table#schedule" # Usando o ID da tabela
+
+    # Guarda a tabela atual (se houver) para detectar quando ela for substituída pela do novo mês
+    old_tables = driver.find_elements(By.CSS_SELECTOR, table_css_selector) if url != driver.current_url else []
+    if url != driver.current_url:
+        try:
+            _navigate(driver, url)
+        except Exception as e_nav:
+             print(f"   -> Erro ao navegar para {url}: {e_nav}")
+             return None # Pula para o próximo mês se a navegação falhar
+
+    # Esperar que a tabela seja recarregada
+    try:
+        wait_for(driver, readiness.element_replaced(old_tables[0] if old_tables else None, table_css_selector, timeout=15), page)
+
+        # Garante que o elemento está pronto antes de tentar o read_html
+        df_month = _read_schedule_table(driver, table_css_selector, month_name, page)
+        if df_month is not None:
+            print(f"   -> {len(df_month)} jogos coletados para {month_name}.")
+        return df_month
+
+    except (TimeoutException, StaleElementReferenceException) as e_table:
+        print(f"   -> Erro ao carregar ou processar a tabela para {month_name}: {e_table}")
+        if isinstance(e_table, StaleElementReferenceException):
+            print("   -> Tentando novamente após StaleElementReferenceException...")
+            try:
+               wait_for(driver, readiness.present(table_css_selector, timeout=5), page)
+               df_month = _read_schedule_table(driver, table_css_selector, month_name, page)
+               if df_month is not None:
+                    print(f"   -> RE-TENTATIVA SUCESSO: {len(df_month)} jogos coletados para {month_name}.")
+               return df_month
+            except Exception as e_retry:
+                print(f"   -> RE-TENTATIVA FALHOU para {month_name}: {e_retry}")
+        return None # Continua para o próximo mês se der erro
+    except Exception as e_general_table:
+         print(f"   -> Erro inesperado ao processar {month_name}: {e_general_table}")
+         return None
+
+
+# Links dos meses no filtro do calendário, numa única chamada ao navegador
+SCHEDULE_LINKS_SCRIPT = """
+const filter = document.querySelector(arguments[0]);
+if (!filter) return null;
+return {
+    url: location.href,
+    current_is_span: filter.querySelector('div > span') !== null,
+    links: Array.from(filter.querySelectorAll('a'), a => a.href),
+};
+"""
+
+
+def _discover_schedule_urls(driver, start_url):
+    """Abre a página inicial e retorna as URLs de todos os meses, em ordem."""
+    _navigate(driver, start_url)
+
+    # 1. Esperar pelo carregamento dos filtros de mês
+    filter_div_selector = "div.filter"
+    try:
+        wait_for(driver, readiness.present(filter_div_selector, timeout=15))
+    except TimeoutException:
+        print("Filtros de mês não encontrados. Verifique a URL ou a estrutura da página.")
+        return [] # Sai da função se não encontrar os filtros
+
+    # Procurar todos os links de meses (antes: um round trip por link)
+    filters = _run_extraction(driver, SCHEDULE_LINKS_SCRIPT, filter_div_selector)
+    if not filters:
+        print("Filtros de mês não encontrados. Verifique a URL ou a estrutura da página.")
+        return []
+
+    # Criar uma lista de URLs a visitar, incluindo o mês atual (se for um link válido)
+    urls_to_scrape = []
+    if not filters["current_is_span"]: # Mês atual pode ser um span
+         print("Span do mês atual não encontrado, usando URL atual se aplicável.")
+    current_path = filters["url"].split('/')[-1]
+    if "games-" in current_path:
+        urls_to_scrape.append(filters["url"])
+
+    for href in filters["links"]:
+        # Garante que só peguemos links válidos de meses
+        if href and "games-" in href and href not in urls_to_scrape:
+            urls_to_scrape.append(href)
+
+    return _sort_month_urls(urls_to_scrape)
+
+
+def _sort_month_urls(urls):
+    return sorted(
+        list(set(urls)),
+        key=lambda url: MONTH_ORDER.index(get_month_from_url(url)) if get_month_from_url(url) in MONTH_ORDER else float('inf')
+    )
+
+
+def _http_discover_schedule_urls(http, start_url):
+    """Versão HTTP de _discover_schedule_urls: lê os links de meses direto do HTML."""
+    doc = http.get(start_url).html()
+    filter_divs = doc.xpath(f"//div[{_has_class('filter')}]")
+    if not filter_divs:
+        print("Filtros de mês não encontrados. Verifique a URL ou a estrutura da página.")
+        return []
+
+    # A página inicial é o mês atual (aparece como span, não como link)
+    urls_to_scrape = [start_url]
+    for href in filter_divs[0].xpath(".//a/@href"):
+        # Garante que só peguemos links válidos de meses
+        if "games-" in href and href not in urls_to_scrape:
+            urls_to_scrape.append(href)
+    return _sort_month_urls(urls_to_scrape)
+
+
+def _http_scrape_schedule_month(http, url):
+    """Versão HTTP de _scrape_schedule_month: baixa a página e lê a tabela do HTML."""
+    month_name = get_month_from_url(url).capitalize() if get_month_from_url(url) else "Desconhecido"
+    with REPORT.page(f"Schedule: {month_name}") as page:
+        print(f"\n--> Coletando dados para o mês: {month_name}")
+        response = http.get(url, page=page)
+        # Se a página não mudou desde o último parse, o DataFrame vem do cache
+        df_month = http.parse_once(response, lambda: _parse_schedule_month_page(response, month_name, page),
+                                   version=SCHEDULE_SCHEMA.fingerprint())
+        if df_month is not None:
+            print(f"   -> {len(df_month)} jogos coletados para {month_name}.")
+        return df_month
+
+
+def _parse_schedule_month_page(response, month_name, page):
+    tables = response.html().xpath("//table[@id='schedule']")
+    if not tables:
+        print(f"   -> Tabela de jogos não encontrada para {month_name}.")
+        return None
+    return _schedule_frame_from_html(tables[0], month_name, page)
+
+
+def scraper_basketball_reference_schedule(pool, http, backend=None, incremental_mode=False, stream=False, formats=(), store=None):
     """
     Método 2: Scraper Basketball-Reference Schedule
     Endpoint: https://www.basketball-reference.com/leagues/NBA_2026_games-october.html
+    Os meses são distribuídos entre os workers (drivers do pool ou conexões HTTP).
+    No modo incremental, só re-baixa o mês atual e os meses passados com jogos sem placar.
+    Com stream=True, cada mês é gravado no JSON assim que fica pronto (exceto no modo incremental,
+    que precisa da tabela completa para mesclar com o arquivo existente).
     """
-    BASE_URL = "https://www.basketball-reference.com"
-    START_URL = f"{BASE_URL}/leagues/NBA_2026_games-october.html"
-    JSON_FILENAME = "nba_2026_schedule_completo.json"
-    all_games_df = pd.DataFrame()
+    backend = backend or SOURCE_BACKENDS["schedule"]
+    START_URL = SCHEDULE_URL_TEMPLATE.format(month="october")
+    JSON_FILENAME = SCHEDULE_JSON
 
     print("\n\n" + "=" * 50)
     print("INICIANDO SCRAPER 2: BASKETBALL-REFERENCE SCHEDULE")
-    print(f"Acessando o endpoint inicial: {START_URL}")
+    print(f"Acessando o endpoint inicial: {START_URL} (backend: {backend})")
 
     try:
-        driver.get(START_URL)
-
-        # 1. Esperar pelo carregamento dos filtros de mês
-        filter_div_selector = "div.filter"
-        try:
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, filter_div_selector))
-            )
-        except TimeoutException:
-            print("Filtros de mês não encontrados. Verifique a URL ou a estrutura da página.")
-            return # Sai da função se não encontrar os filtros
-
-        # Procurar todos os links de meses
-        month_links = driver.find_elements(By.CSS_SELECTOR, f"{filter_div_selector} a")
-
-        # Criar uma lista de URLs a visitar, incluindo o mês atual (se for um link válido)
-        urls_to_scrape = []
-        try: # Adiciona tratamento de erro caso o span não exista
-            current_month_link = driver.find_element(By.CSS_SELECTOR, f"{filter_div_selector} div > span") # Mês atual pode ser um span
-            if current_month_link:
-                 current_path = driver.current_url.split('/')[-1]
-                 if "games-" in current_path:
-                     urls_to_scrape.append(driver.current_url)
-        except NoSuchElementException:
-             print("Span do mês atual não encontrado, usando URL atual se aplicável.")
-             current_path = driver.current_url.split('/')[-1]
-             if "games-" in current_path and driver.current_url not in urls_to_scrape:
-                 urls_to_scrape.append(driver.current_url)
-
-        for link in month_links:
-            href = link.get_attribute("href")
-            # Garante que só peguemos links válidos de meses
-            if href and "games-" in href and href not in urls_to_scrape:
-                urls_to_scrape.append(href)
-
-        # Define a ordem correta dos meses da temporada da NBA
-        month_order = ['october', 'november', 'december', 'january', 'february', 'march', 'april', 'may', 'june']
-
-        def get_month_from_url(url):
-            try:
-                return url.split('-')[-1].split('.')[0].lower()
-            except:
-                return None 
+        existing_df = incremental.load_records(JSON_FILENAME) if incremental_mode else None
+        refreshed_months = []
+        if existing_df is not None and not existing_df.empty:
+            # As URLs dos meses seguem um padrão fixo, então não é preciso abrir a página inicial
+            refreshed_months, kept_months = incremental.schedule_months_to_refresh(existing_df)
+            print(f"Modo incremental: mantendo {kept_months}; atualizando {refreshed_months}.")
+            urls_to_scrape = [SCHEDULE_URL_TEMPLATE.format(month=month) for month in refreshed_months]
+            if not urls_to_scrape:
+                print("Nenhum mês precisa ser atualizado.")
+                return
+        else:
+            if incremental_mode:
+                print(f"Modo incremental: {JSON_FILENAME} não encontrado. Fazendo a coleta completa.")
+            if backend == "http":
+                urls_to_scrape = _http_discover_schedule_urls(http, START_URL)
+            else:
+                with pool.driver() as driver:
+                    urls_to_scrape = _discover_schedule_urls(driver, START_URL)
 
-        urls_to_scrape = sorted(
-            list(set(urls_to_scrape)),
-            key=lambda url: month_order.index(get_month_from_url(url)) if get_month_from_url(url) in month_order else float('inf')
-        )
+        if not urls_to_scrape:
+            return
 
         print(f"URLs de meses encontradas e ordenadas: {urls_to_scrape}")
 
+        if stream and refreshed_months:
+            print("Modo incremental: a mesclagem precisa da tabela completa; gravação em streaming desativada.")
+        outputs = _open_outputs(JSON_FILENAME, formats, SCHEDULE_COLUMNAR, partition_by='Month', date_format=SCHEDULE_DATE_FORMAT,
+                                store=store, table="games", season=SCHEDULE_SEASON)
+        sink = outputs if stream and not refreshed_months else None
 
-        # 2. Iterar sobre cada URL de mês para extrair a tabela
-        for url in urls_to_scrape:
-            month_name = get_month_from_url(url).capitalize() if get_month_from_url(url) else "Desconhecido"
-            print(f"\n--> Coletando dados para o mês: {month_name}")
+        # 2. Coletar cada mês em paralelo (a ordem dos meses é preservada)
+        fetch_map = http.imap if backend == "http" else pool.imap
+        scrape_month = _http_scrape_schedule_month if backend == "http" else _scrape_schedule_month
+        with FrameCollector("schedule", SCHEDULE_COLUMNS, sink=sink) as games:
+            for url, df_month in zip(urls_to_scrape, fetch_map(scrape_month, urls_to_scrape)):
+                games.add(df_month, label=get_month_from_url(url))
+        print(f"\nTotal de jogos coletados: {games.rows}")
 
-            if url != driver.current_url:
-                try:
-                    driver.get(url)
-                    time.sleep(2) 
-                except Exception as e_nav:
-                     print(f"   -> Erro ao navegar para {url}: {e_nav}")
-                     continue # Pula para o próximo mês se a navegação falhar
-
-            # Esperar que a tabela seja recarregada
-            table_css_selector = "table#schedule" # Usando o ID da tabela
-            try:
-                WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, table_css_selector))
-                )
-
-                # Garante que o elemento está pronto antes de tentar o read_html
-                table_element = driver.find_element(By.CSS_SELECTOR, table_css_selector)
-                html_content = table_element.get_attribute('outerHTML')
-
-
-                tables = pd.read_html(html_content)
-
-                if tables:
-                    df_month = tables[0]
-                    df_month['Month'] = month_name
-
-                    if 'Date' in df_month.columns:
-                       df_month = df_month[df_month['Date'] != 'Date']
-
-                    all_games_df = pd.concat([all_games_df, df_month], ignore_index=True)
-                    print(f"   -> {len(df_month)} jogos adicionados. Total: {len(all_games_df)}")
-
-            except (TimeoutException, StaleElementReferenceException) as e_table:
-                print(f"   -> Erro ao carregar ou processar a tabela para {month_name}: {e_table}")
-                if isinstance(e_table, StaleElementReferenceException):
-                    print("   -> Tentando novamente após StaleElementReferenceException...")
-                    time.sleep(3)
-                    try:
-                       table_element = driver.find_element(By.CSS_SELECTOR, table_css_selector)
-                       html_content = table_element.get_attribute('outerHTML')
-                       tables = pd.read_html(html_content)
-                       if tables:
-                            df_month = tables[0]
-                            df_month['Month'] = month_name
-                            if 'Date' in df_month.columns:
-                                df_month = df_month[df_month['Date'] != 'Date']
-                            all_games_df = pd.concat([all_games_df, df_month], ignore_index=True)
-                            print(f"   -> RE-TENTATIVA SUCESSO: {len(df_month)} jogos adicionados. Total: {len(all_games_df)}")
-                    except Exception as e_retry:
-                        print(f"   -> RE-TENTATIVA FALHOU para {month_name}: {e_retry}")
-                continue # Continua para o próximo mês se der erro
-            except Exception as e_general_table:
-                 print(f"   -> Erro inesperado ao processar {month_name}: {e_general_table}")
-                 continue
-
-
-        # 3. Limpeza e Exportação Final
-        if not all_games_df.empty:
-            df_final = all_games_df.copy()
-
-            df_final = df_final.drop(columns=['Unnamed: 6'])
-
-            pts_cols = [col for col in df_final.columns if 'PTS' in col]
-            if len(pts_cols) >= 2:
-                 # Assume que a primeira coluna PTS é do visitante e a segunda do mandante
-                 new_names = {'PTS': 'Visitor PTS', 'PTS.1': 'Home PTS', 'Unnamed: 7': 'Overtime'}
-                 if 'Unnamed: 3' in df_final.columns and 'PTS' in df_final.columns and 'PTS.1' not in df_final.columns:
-                      new_names = {'Unnamed: 3': 'Visitor PTS', 'PTS': 'Home PTS'}
-                 df_final.rename(columns=new_names, inplace=True)
-                 print(f"Colunas PTS renomeadas para: {new_names}")
-            else:
-                 print("Não foi possível identificar e renomear as colunas PTS corretamente.")
 
-            data_json = df_final.to_json(orient='records', indent=4, force_ascii=False)
+        # 3. Exportação Final (as colunas já vêm renomeadas pelo esquema: Visitor PTS, Home PTS, Overtime)
+        if games.rows and games.streaming:
+            print(f"\n--- SUCESSO SCRAPER 2 ---")
+            print(f"Dados gravados em streaming em: {', '.join(outputs.paths)}")
+            print(f"Total de jogos exportados: {games.rows}")
+
+        elif games.rows:
+            df_final = games.frame()
 
-            with open(JSON_FILENAME, 'w', encoding='utf-8') as f:
-                f.write(data_json)
+            if refreshed_months:
+                # Junta com os meses mantidos do arquivo existente (chave: Date + Visitor + Home)
+                df_final = incremental.merge_games(existing_df, df_final, refreshed_months)
+                print(f"Jogos mesclados com o arquivo existente. Total: {len(df_final)}")
+
+            write_frame(df_final, outputs)
 
             print(f"\n--- SUCESSO SCRAPER 2 ---")
-            print(f"Dados exportados para o arquivo: {JSON_FILENAME}")
+            print(f"Dados exportados para: {', '.join(outputs.paths)}")
             print(f"Total de jogos exportados: {len(df_final)}")
 
         else:
             print("Nenhum dado de agendamento foi coletado.")
 
     except Exception as e:
+        METRICS.count("failures")
         print(f"\n--- ERRO CRÍTICO SCRAPER 2 ---")
         print(f"Ocorreu um erro geral: {e}")
 
 
-def scraper_espn_standings(driver):
+ESPN_START_URL = "https://www.espn.com.br/nba/classificacao"
+ESPN_BASE_URL = "https://www.espn.com.br"
+ESPN_JSON = "nba_espn_standings_all_seasons.json"
+# Season e Conference primeiro, depois o nome do time e as colunas da tabela de dados
+ESPN_COLUMNS = {'Season': 'str', 'Conference': 'str', 'Equipe': 'str', **ESPN_STANDINGS_SCHEMA.dtypes()}
+# Saída colunar particionada por temporada
+ESPN_COLUMNAR = {**ESPN_COLUMNS, 'Season': 'category', 'Conference': 'category', 'Equipe': 'category'}
+ESPN_DATA_TABLE_SELECTOR = "div.Table__Scroller > table.Table"
+ESPN_NAME_TABLE_SELECTOR = "table.Table--fixed-left"
+
+
+def _season_label_from_url(url, current_season_label="Atual"):
+    """Extrai o ano/formato da temporada da URL (ex: /temporada/2025 -> 2024-25)."""
+    season_match = re.search(r'/temporada/(\d{4})', url)
+    if season_match:
+        year = int(season_match.group(1))
+        return f"{year-1}-{str(year)[-2:]}" # Formato 2024-25
+    if url == ESPN_START_URL: # Se for a URL base, usa o texto do dropdown
+        return current_season_label
+    return "Atual"
+
+
+def _season_label_from_option_text(selected_option_text):
+    """Texto da opção selecionada no dropdown -> nome da temporada atual."""
+    if re.match(r'\d{4}-\d{2}', selected_option_text):
+         return selected_option_text
+    if re.match(r'\d{4}', selected_option_text): # Se for só o ano final 2026
+         year_end = int(selected_option_text[:4])
+         return f"{year_end-1}-{str(year_end)[-2:]}"
+    return "Atual"
+
+
+def _season_urls_from_options(option_urls):
+    """Monta a lista de URLs de temporadas a partir dos atributos data-url do dropdown."""
+    # Adiciona a URL base (temporada atual, geralmente a selecionada por padrão)
+    season_urls = [ESPN_START_URL]
+    for data_url in option_urls:
+        if data_url and data_url.startswith('/'): # Verifica se é um caminho relativo
+             full_url = ESPN_BASE_URL + data_url
+             if full_url not in season_urls:
+                season_urls.append(full_url)
+        elif data_url and data_url.startswith('http'): # Se for URL completa
+             if data_url not in season_urls:
+                  season_urls.append(data_url)
+    return season_urls
+
+
+# Opções (texto, data-url, selecionada) de cada dropdown de temporadas, numa única chamada
+ESPN_DROPDOWN_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0]), select => Array.from(select.options, option => ({
+    text: option.textContent.trim(),
+    url: option.getAttribute('data-url'),
+    selected: option.selected,
+})));
+"""
+# Nomes das equipes (seletor principal e fallback) e HTML da tabela de dados das duas conferências
+ESPN_SEASON_SCRIPT = """
+const dataTables = document.querySelectorAll(arguments[0]);
+const nameTables = document.querySelectorAll(arguments[1]);
+const names = (table, selector) => Array.from(table.querySelectorAll(selector), a => a.textContent.trim()).filter(name => name);
+const conferences = [];
+for (let i = 0; i < Math.min(2, dataTables.length, nameTables.length); i++) {
+    conferences.push({
+        names: names(nameTables[i], 'span.hide-mobile > a.AnchorLink'),
+        fallback: names(nameTables[i], 'a.AnchorLink[data-clubhouse-uid]'),
+        html: dataTables[i].outerHTML,
+    });
+}
+return {data_tables: dataTables.length, name_tables: nameTables.length, conferences: conferences};
+"""
+
+
+def _discover_espn_seasons(driver):
     """
-    Método 3: Scraper ESPN Standings (Classificação) - Coleta todas as temporadas.
-    Endpoint: https://www.espn.com.br/nba/classificacao
+    Abre a classificação atual, aceita os cookies e lê o dropdown de temporadas.
+    Retorna a lista de (url, temporada) a serem raspadas.
     """
-    START_URL = "https://www.espn.com.br/nba/classificacao" 
-    JSON_FILENAME = "nba_espn_standings_all_seasons.json" 
-    all_standings_df = pd.DataFrame()
-    base_espn_url = "https://www.espn.com.br" 
+    _navigate(driver, ESPN_START_URL)
 
-    print("\n\n" + "=" * 50)
-    print("INICIANDO SCRAPER 3: ESPN NBA STANDINGS (TODAS AS TEMPORADAS)")
-    print(f"Acessando o endpoint inicial: {START_URL}")
+    # 1. Tratamento de Cookies (se necessário)
+    accept_cookies(driver)
 
+    # 2. Encontrar o dropdown de temporadas e extrair URLs
+    season_urls = []
+    current_season_label = "Atual"
+    season_dropdown_selector = "div.dropdown select[name*='::']"
     try:
-        driver.get(START_URL)
-        time.sleep(3)
+        wait_for(driver, readiness.all_present(season_dropdown_selector, timeout=15))
+        # Todas as opções de todos os dropdowns numa única chamada (antes: um round trip por opção)
+        dropdowns = _run_extraction(driver, ESPN_DROPDOWN_SCRIPT, season_dropdown_selector) or []
+        # Tenta encontrar o dropdown correto (geralmente o primeiro que contém anos)
+        options = next((opts for opts in dropdowns if any(re.search(r'\d{4}', opt['text']) for opt in opts)), None)
+
+        if not options:
+             print("Dropdown de temporada com anos não encontrado.")
+             raise NoSuchElementException("Dropdown de temporada não encontrado com o seletor esperado.")
+
+        # Texto da opção selecionada define o nome da temporada atual
+        selected = [opt for opt in options if opt['selected']] or options[:1]
+        current_season_label = _season_label_from_option_text(selected[0]['text'])
+
+        season_urls = _season_urls_from_options([opt['url'] for opt in options])
+        print(f"Encontradas {len(season_urls)} URLs de temporadas para raspar.")
+
+    except (TimeoutException, NoSuchElementException) as e_dropdown:
+        print(f"Dropdown de temporadas não encontrado ou erro ao processar: {e_dropdown}.")
+        print("Tentando raspar apenas a temporada atual.")
+        if not season_urls: # Se a lista ainda estiver vazia, adiciona a URL atual
+             season_urls.append(driver.current_url)
+    except Exception as e_general_dropdown:
+         print(f"Erro inesperado ao buscar URLs de temporada: {e_general_dropdown}")
+         if not season_urls:
+              season_urls.append(driver.current_url)
+
+    return [(url, _season_label_from_url(url, current_season_label)) for url in season_urls]
+
+
+def _http_discover_espn_seasons(http):
+    """Versão HTTP de _discover_espn_seasons: lê o dropdown de temporadas direto do HTML."""
+    current_season_label = "Atual"
+    try:
+        doc = http.get(ESPN_START_URL).html()
+        # Tenta encontrar o dropdown correto (geralmente o primeiro que contém anos)
+        select_element = None
+        for dropdown in doc.xpath(f"//div[{_has_class('dropdown')}]//select[contains(@name, '::')]"):
+            if any(re.search(r'\d{4}', opt.text_content()) for opt in dropdown.xpath(".//option")):
+                select_element = dropdown
+                break
+
+        if select_element is None:
+            print("Dropdown de temporada com anos não encontrado. Tentando raspar apenas a temporada atual.")
+            return [(ESPN_START_URL, current_season_label)]
+
+        options = select_element.xpath(".//option")
+        selected = [opt for opt in options if opt.get('selected') is not None] or options[:1]
+        if selected:
+            current_season_label = _season_label_from_option_text(selected[0].text_content().strip())
+
+        season_urls = _season_urls_from_options([opt.get('data-url') for opt in options])
+        print(f"Encontradas {len(season_urls)} URLs de temporadas para raspar.")
+
+    except Exception as e_general_dropdown:
+         print(f"Erro inesperado ao buscar URLs de temporada: {e_general_dropdown}")
+         season_urls = [ESPN_START_URL]
+
+    return [(url, _season_label_from_url(url, current_season_label)) for url in season_urls]
+
+
+def _clean_team_names(team_names, fallback_names, i, season_year_str):
+    """
+    Aplica o fallback de nomes quando o seletor principal não retorna nada.
+    `fallback_names` é chamado só se necessário (no Selenium, cada chamada custa round trips).
+    """
+    if team_names:
+        return team_names
+
+    print(f"   -> Aviso: Nenhum nome de equipe encontrado com o seletor 'span.hide-mobile > a.AnchorLink' para Conf. {i+1}, {season_year_str}.")
+    # Fallback: Tentar um seletor mais genérico se o primeiro falhar, baseado no seu HTML
+    team_names = fallback_names()
+    # Remove duplicatas se o seletor genérico pegar a abreviação e o nome
+    unique_names = []
+    for name in team_names:
+        if name not in unique_names:
+            unique_names.append(name)
+    # Filtra as abreviações (ex: "NY") e mantém apenas nomes longos
+    team_names = [name for name in unique_names if len(name) > 3]
+    print(f"   -> Fallback: Encontrados {len(team_names)} nomes com 'a.AnchorLink[data-clubhouse-uid]'")
+    return team_names
+
+
+def _conference_frame(team_names, data_table, i, season_year_str, page):
+    """Combina nomes (tabela fixa da esquerda) e dados (tabela rolável) de uma conferência."""
+    conference_names = ['Eastern', 'Western']
+
+    if not team_names:
+         print(f"   -> ERRO: Não foi possível extrair nomes de equipes para Conf. {i+1}, {season_year_str}. Pulando.")
+         return None
+
+    df_names = pd.DataFrame(team_names, columns=['Equipe'])
+
+    # Remove linhas de cabeçalho residuais que possam ter apenas o nome da conferência
+    df_names = df_names[~df_names['Equipe'].astype(str).str.contains('CONFERÊNCIA|EASTERN|WESTERN', na=False, case=False, regex=True)]
+
+    # O parser usa a última linha do cabeçalho (sem MultiIndex) e pula a linha de cabeçalho duplicada (V, D, % Vit.)
+    with page.parsing():
+        df_data = parse_table(data_table, ESPN_STANDINGS_SCHEMA)
+
+
+    # Verifica se o número de linhas corresponde (após limpeza inicial)
+    if len(df_names) != len(df_data):
+        print(f"   -> Aviso: Discrepância no número de linhas entre nomes ({len(df_names)}) e dados ({len(df_data)}) para Conf. {i+1}, {season_year_str}. Tentando alinhar...")
+        df_names_cleaned = df_names.dropna(how='all').reset_index(drop=True)
+        df_data_cleaned = df_data.dropna(how='all').reset_index(drop=True)
+        if len(df_names_cleaned) == len(df_data_cleaned):
+             print("    -> Alinhamento bem-sucedido após remover linhas vazias.")
+             df_names = df_names_cleaned
+             df_data = df_data_cleaned
+        else:
+             print(f"   -> ERRO: Não foi possível alinhar tabelas para Conf. {i+1}, {season_year_str}. Pulando esta conferência.")
+             print(f"Nomes ({len(df_names_cleaned)}):", df_names_cleaned['Equipe'].tolist()) # Para depuração
+             print(f"Dados ({len(df_data_cleaned)}):", df_data_cleaned.head().to_string()) # Para depuração
+             return None # Pula para a próxima conferência/temporada
+
+    # Adiciona reset_index(drop=True) para garantir alinhamento correto
+    df_combined = pd.concat([df_names.reset_index(drop=True), df_data.reset_index(drop=True)], axis=1)
+
+    # Adicionar colunas de Conferência e Temporada
+    df_combined['Conference'] = conference_names[i]
+    df_combined['Season'] = season_year_str
+    return df_combined
+
+
+def _season_frame(df_list_combined, season_year_str):
+    # Concatena os DFs da temporada (Leste e Oeste combinados)
+    if df_list_combined:
+         df_season = pd.concat(df_list_combined, ignore_index=True)
+         print(f"   -> {len(df_season)} times coletados para {season_year_str}.")
+         return df_season
+    return None
+
+
+def _scrape_espn_season(driver, season):
+    """Coleta Leste e Oeste de uma temporada. Executado em paralelo pelos workers do pool."""
+    with REPORT.page(f"ESPN: {season[1]}") as page:
+        return _scrape_espn_season_page(driver, season, page)
+
+
+def _scrape_espn_season_page(driver, season, page):
+    url, season_year_str = season
+    try:
+        print(f"\n--> Coletando dados para a temporada: {season_year_str} (URL: {url})")
+
+        if url != driver.current_url:
+            print(f"    Navegando para: {url}")
+            old_tables = driver.find_elements(By.CSS_SELECTOR, ESPN_DATA_TABLE_SELECTOR)
+            _navigate(driver, url)
+            # Espera a tabela da temporada anterior ser substituída (antes: sleep fixo de 4s)
+            try_wait_for(driver, readiness.element_replaced(old_tables[0] if old_tables else None, ESPN_DATA_TABLE_SELECTOR, timeout=20), page)
 
-        # 1. Tratamento de Cookies (se necessário)
-        cookie_button_id = "onetrust-accept-btn-handler"
+        # 4. Esperar as tabelas da temporada atual
         try:
-            cookie_button = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.ID, cookie_button_id))
-            )
-            cookie_button.click()
-            print("Cookies aceitos com sucesso.")
-            time.sleep(2)
+            # Espera pelas tabelas de dados (direita)
+            wait_for(driver, readiness.all_present(ESPN_DATA_TABLE_SELECTOR, timeout=20), page)
+            # Espera pelas tabelas de nomes (esquerda)
+            wait_for(driver, readiness.all_present(ESPN_NAME_TABLE_SELECTOR, timeout=10), page)
         except TimeoutException:
-            print("Botão de cookies não encontrado ou já aceito. Continuando...")
-        except Exception as e_cookie:
-             print(f"Erro ao tratar cookies: {e_cookie}. Continuando...")
+            print(f"   -> Tabelas não encontradas para a temporada {season_year_str} com os seletores. Pulando...")
+            return None # Pula para a próxima temporada
+
+        # Nomes das equipes (seletor principal e fallback) e HTML das tabelas de dados das duas conferências
+        # numa única chamada ao navegador (antes: um round trip por time, por seletor e por tabela)
+        extracted = _run_extraction(driver, ESPN_SEASON_SCRIPT, ESPN_DATA_TABLE_SELECTOR, ESPN_NAME_TABLE_SELECTOR)
+        # Apenas as tabelas de conferência (as duas primeiras de cada tipo)
+        if extracted["data_tables"] < 2 or extracted["name_tables"] < 2:
+            print(f"   -> Número inesperado de tabelas encontrado para {season_year_str}. Pulando.")
+            return None
+
+        print(f"   -> Encontradas {extracted['data_tables']} tabelas de dados e {extracted['name_tables']} de nomes. Processando...")
+
+        # 5. Ler tabelas com o parser, limpar e combinar
+        df_list_combined = []
+        for i, conference in enumerate(extracted["conferences"]): # Leste e Oeste
+            try:
+                # O seletor "span.hide-mobile > a.AnchorLink" pega o nome completo da equipe, com base no HTML
+                team_names = _clean_team_names(conference["names"], lambda: conference["fallback"], i, season_year_str)
+                df_combined = _conference_frame(team_names, conference["html"], i, season_year_str, page)
+                if df_combined is not None:
+                    df_list_combined.append(df_combined)
+
+            except Exception as e_proc_table:
+                 print(f"   -> Erro ao processar tabela {i+1} para {season_year_str}: {e_proc_table}")
+
+        return _season_frame(df_list_combined, season_year_str)
+
+    except Exception as e_season_loop:
+         print(f"Erro no loop da temporada {season_year_str} (URL: {url}): {e_season_loop}")
+         return None # Continua para a próxima temporada em caso de erro
+
+
+def _clean_season_frame(df_season):
+    """Remove as linhas sem nome de equipe de uma temporada."""
+    df_season = df_season.dropna(subset=['Equipe'], how='all')
+    return df_season[df_season['Equipe'] != '']
+
+
+def _http_scrape_espn_season(http, season):
+    """Versão HTTP de _scrape_espn_season: as tabelas já vêm renderizadas no HTML do servidor."""
+    url, season_year_str = season
+    with REPORT.page(f"ESPN: {season_year_str}") as page:
+        print(f"\n--> Coletando dados para a temporada: {season_year_str} (URL: {url})")
+        response = http.get(url, page=page)
+        # Se a página não mudou desde o último parse, o DataFrame vem do cache
+        return http.parse_once(response, lambda: _parse_espn_season_page(response, season_year_str, page),
+                               version=ESPN_STANDINGS_SCHEMA.fingerprint())
 
-        # 2. Encontrar o dropdown de temporadas e extrair URLs
-        season_urls = []
-        season_dropdown_selector = "div.dropdown select[name*='::']"
+
+def _parse_espn_season_page(response, season_year_str, page):
+    doc = response.html()
+
+    # Mesmos seletores da versão Selenium, em XPath
+    data_tables = doc.xpath(f"//div[{_has_class('Table__Scroller')}]/table[{_has_class('Table')}]")
+    name_tables = doc.xpath(f"//table[{_has_class('Table--fixed-left')}]")
+    if len(data_tables) < 2 or len(name_tables) < 2:
+        print(f"   -> Número inesperado de tabelas encontrado para {season_year_str}. Pulando.")
+        return None
+
+    df_list_combined = []
+    for i in range(2): # Leste e Oeste
         try:
-            season_dropdown_elements = WebDriverWait(driver, 15).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, season_dropdown_selector))
+            name_table = name_tables[i]
+            team_names = [a.text_content().strip() for a in name_table.xpath(f".//span[{_has_class('hide-mobile')}]/a[{_has_class('AnchorLink')}]")]
+            team_names = _clean_team_names(
+                [name for name in team_names if name],
+                lambda: [name for name in (a.text_content().strip() for a in name_table.xpath(f".//a[{_has_class('AnchorLink')} and @data-clubhouse-uid]")) if name],
+                i, season_year_str,
             )
-            # Tenta encontrar o dropdown correto (geralmente o primeiro que contém anos)
-            select_element = None
-            for dropdown in season_dropdown_elements:
-                 options_text = [opt.text for opt in Select(dropdown).options]
-                 if any(re.search(r'\d{4}', text) for text in options_text): # Verifica se há anos nas opções
-                      select_element = dropdown
-                      break
-
-            if not select_element:
-                 print("Dropdown de temporada com anos não encontrado.")
-                 raise NoSuchElementException("Dropdown de temporada não encontrado com o seletor esperado.")
-
-
-            select = Select(select_element)
-            options = select.options
-
-            # Pega a URL da temporada atual (geralmente a selecionada por padrão)
-            current_url = driver.current_url.split('?')[0].split('#')[0] 
-             # Garante que a URL base não termine com '/' para evitar '//'
-            if current_url.endswith('/'):
-                current_url = current_url[:-1]
-            # Adiciona a URL base se ainda não estiver na lista (para a temporada atual)
-            if START_URL not in season_urls:
-                 season_urls.append(START_URL)
-
-
-            for option in options:
-                data_url = option.get_attribute('data-url')
-                if data_url and data_url.startswith('/'): # Verifica se é um caminho relativo
-                     full_url = base_espn_url + data_url
-                     if full_url not in season_urls:
-                        season_urls.append(full_url)
-                elif data_url and data_url.startswith('http'): # Se for URL completa
-                     if data_url not in season_urls:
-                          season_urls.append(data_url)
-
-
-            print(f"Encontradas {len(season_urls)} URLs de temporadas para raspar.")
-
-        except (TimeoutException, NoSuchElementException) as e_dropdown:
-            print(f"Dropdown de temporadas não encontrado ou erro ao processar: {e_dropdown}.")
-            print("Tentando raspar apenas a temporada atual.")
-            if not season_urls: # Se a lista ainda estiver vazia, adiciona a URL atual
-                 season_urls.append(driver.current_url)
-        except Exception as e_general_dropdown:
-             print(f"Erro inesperado ao buscar URLs de temporada: {e_general_dropdown}")
-             if not season_urls:
-                  season_urls.append(driver.current_url)
-
-
-        # 3. Iterar sobre cada URL de temporada
-        for url in season_urls:
-            try:
-                # Extrai o ano/formato da temporada da URL ou do texto do dropdown
-                season_year_str = "Atual"
-                season_match = re.search(r'/temporada/(\d{4})', url)
-                if season_match:
-                    year = int(season_match.group(1))
-                    season_year_str = f"{year-1}-{str(year)[-2:]}" # Formato 2024-25
-                elif url == START_URL: # Se for a URL base, tenta pegar do dropdown
-                     try:
-                          # Garante que 'select' foi definido
-                          if 'select' in locals() or 'select' in globals():
-                              selected_option_text = select.first_selected_option.text
-                              if re.match(r'\d{4}-\d{2}', selected_option_text): 
-                                   season_year_str = selected_option_text
-                              elif re.match(r'\d{4}', selected_option_text): # Se for só o ano final 2026
-                                   year_end = int(selected_option_text)
-                                   season_year_str = f"{year_end-1}-{str(year_end)[-2:]}"
-                          else:
-                              print("Dropdown 'select' não definido, usando 'Atual' para a temporada.")
-                     except Exception as e_year_extract:
-                          print(f"Erro ao extrair ano do texto do dropdown: {e_year_extract}, usando 'Atual'.")
-
-
-                print(f"\n--> Coletando dados para a temporada: {season_year_str} (URL: {url})")
-
-                if url != driver.current_url:
-                    print(f"    Navegando para: {url}")
-                    driver.get(url)
-                    time.sleep(4) 
-
-                # 4. Esperar e extrair as tabelas da temporada atual
-                data_table_selector = "div.Table__Scroller > table.Table" 
-                fixed_left_table_selector = "table.Table--fixed-left" 
+            df_combined = _conference_frame(team_names, data_tables[i], i, season_year_str, page)
+            if df_combined is not None:
+                df_list_combined.append(df_combined)
+        except Exception as e_proc_table:
+             print(f"   -> Erro ao processar tabela {i+1} para {season_year_str}: {e_proc_table}")
 
-                try:
-                    # Espera pelas tabelas de dados (direita)
-                    data_table_elements = WebDriverWait(driver, 20).until(
-                        EC.presence_of_all_elements_located((By.CSS_SELECTOR, data_table_selector))
-                    )
-                    # Espera pelas tabelas de nomes (esquerda)
-                    name_table_elements = WebDriverWait(driver, 10).until(
-                        EC.presence_of_all_elements_located((By.CSS_SELECTOR, fixed_left_table_selector))
-                    )
-
-                    # Filtra para pegar apenas as tabelas de conferência (geralmente as duas primeiras de cada tipo)
-                    if len(data_table_elements) >= 2 and len(name_table_elements) >= 2:
-                        # As tabelas de dados (data) são as que estão dentro do Scroller
-                        data_tables_to_process = data_table_elements[:2]
-                        # As tabelas de nome (name) são as 'fixed-left'
-                        name_tables_to_process = name_table_elements[:2]
-                    else:
-                         print(f"   -> Número inesperado de tabelas encontrado para {season_year_str}. Pulando.")
-                         continue
-
-                except TimeoutException:
-                    print(f"   -> Tabelas não encontradas para a temporada {season_year_str} com os seletores. Pulando...")
-                    continue # Pula para a próxima temporada
-
-
-                print(f"   -> Encontradas {len(data_tables_to_process)} tabelas de dados e {len(name_tables_to_process)} de nomes. Processando...")
-
-                # 5. Ler tabelas com Pandas, limpar e combinar
-                df_list_combined = []
-                conference_names = ['Eastern', 'Western']
-
-                for i in range(len(data_tables_to_process)): # Itera sobre 0 e 1 (Leste e Oeste)
-                    try:
-                        # --- MODIFICAÇÃO INICIADA ---
-                        # Pega a tabela de nomes (esquerda)
-                        name_table_element = name_tables_to_process[i]
-
-                        # Extrai os nomes das equipes usando Selenium
-                        # O seletor "span.hide-mobile > a.AnchorLink" pega o nome completo da equipe, com base no HTML
-                        team_name_elements = name_table_element.find_elements(By.CSS_SELECTOR, "span.hide-mobile > a.AnchorLink")
-                        
-                        team_names = [elem.text for elem in team_name_elements if elem.text]
-
-                        if not team_names:
-                             print(f"   -> Aviso: Nenhum nome de equipe encontrado com o seletor 'span.hide-mobile > a.AnchorLink' para Conf. {i+1}, {season_year_str}.")
-                             # Fallback: Tentar um seletor mais genérico se o primeiro falhar, baseado no seu HTML
-                             team_name_elements = name_table_element.find_elements(By.CSS_SELECTOR, "a.AnchorLink[data-clubhouse-uid]")
-                             team_names = [elem.text for elem in team_name_elements if elem.text]
-                             # Remove duplicatas se o seletor genérico pegar a abreviação e o nome
-                             unique_names = []
-                             for name in team_names:
-                                 if name not in unique_names:
-                                     unique_names.append(name)
-                             # Filtra as abreviações (ex: "NY") e mantém apenas nomes longos
-                             team_names = [name for name in unique_names if len(name) > 3] 
-                             print(f"   -> Fallback: Encontrados {len(team_names)} nomes com 'a.AnchorLink[data-clubhouse-uid]'")
-
-
-                        if not team_names:
-                             print(f"   -> ERRO: Não foi possível extrair nomes de equipes para Conf. {i+1}, {season_year_str}. Pulando.")
-                             continue
-
-                        df_names = pd.DataFrame(team_names, columns=['Equipe'])
-                        
-                        # Remove linhas de cabeçalho residuais que possam ter apenas o nome da conferência
-                        df_names = df_names[~df_names['Equipe'].astype(str).str.contains('CONFERÊNCIA|EASTERN|WESTERN', na=False, case=False, regex=True)]
-                
-                        data_html = data_tables_to_process[i].get_attribute('outerHTML')
-                        df_data = pd.read_html(data_html)[0] # REMOVIDO StringIO
-
-                        # Limpar MultiIndex se houver na tabela de dados
-                        if isinstance(df_data.columns, pd.MultiIndex):
-                            df_data.columns = df_data.columns.map(''.join).str.strip()
-
-                         # Remove a linha de cabeçalho duplicada (ex: V, D, % Vit.) que o read_html pode incluir
-                        df_data = df_data[~df_data[df_data.columns[0]].astype(str).str.fullmatch(df_data.columns[0], case=False, na=False)]
-
-
-                        # Verifica se o número de linhas corresponde (após limpeza inicial)
-                        if len(df_names) != len(df_data):
-                            print(f"   -> Aviso: Discrepância no número de linhas entre nomes ({len(df_names)}) e dados ({len(df_data)}) para Conf. {i+1}, {season_year_str}. Tentando alinhar...")
-                            df_names_cleaned = df_names.dropna(how='all').reset_index(drop=True)
-                            df_data_cleaned = df_data.dropna(how='all').reset_index(drop=True)
-                            if len(df_names_cleaned) == len(df_data_cleaned):
-                                 print("    -> Alinhamento bem-sucedido após remover linhas vazias.")
-                                 df_names = df_names_cleaned
-                                 df_data = df_data_cleaned
-                            else:
-                                 print(f"   -> ERRO: Não foi possível alinhar tabelas para Conf. {i+1}, {season_year_str}. Pulando esta conferência.")
-                                 print(f"Nomes ({len(df_names_cleaned)}):", df_names_cleaned['Equipe'].tolist()) # Para depuração
-                                 print(f"Dados ({len(df_data_cleaned)}):", df_data_cleaned.head().to_string()) # Para depuração
-                                 continue # Pula para a próxima conferência/temporada
-
-                        # Adiciona reset_index(drop=True) para garantir alinhamento correto
-                        df_combined = pd.concat([df_names.reset_index(drop=True), df_data.reset_index(drop=True)], axis=1)
-
-                        # Adicionar colunas de Conferência e Temporada
-                        df_combined['Conference'] = conference_names[i]
-                        df_combined['Season'] = season_year_str 
-                        df_list_combined.append(df_combined)
-
-                    except Exception as e_proc_table:
-                         print(f"   -> Erro ao processar tabela {i+1} para {season_year_str}: {e_proc_table}")
-
-
-                # Concatena os DFs da temporada atual (Leste e Oeste combinados)
-                if df_list_combined:
-                     df_season = pd.concat(df_list_combined, ignore_index=True)
-                     all_standings_df = pd.concat([all_standings_df, df_season], ignore_index=True)
-                     print(f"   -> {len(df_season)} times adicionados para {season_year_str}. Total geral: {len(all_standings_df)}")
-
-            except Exception as e_season_loop:
-                 print(f"Erro no loop da temporada {season_year_str} (URL: {url}): {e_season_loop}")
-                 continue # Continua para a próxima temporada em caso de erro
-
-        # 6. Limpeza e Exportação Final (após coletar todas as temporadas)
-        if not all_standings_df.empty:
-            df_final = all_standings_df.dropna(subset=['Equipe'], how='all')
-            df_final = df_final[df_final['Equipe'] != ''] 
-
-            # Reordena colunas para ter Season e Conference primeiro
-            cols_order = ['Season', 'Conference', 'Equipe']
-            remaining_cols = [col for col in df_final.columns if col not in cols_order]
-            df_final = df_final[cols_order + remaining_cols]
-
-            data_json = df_final.to_json(orient='records', indent=4, force_ascii=False) # Adicionado force_ascii=False
-
-            with open(JSON_FILENAME, 'w', encoding='utf-8') as f:
-                f.write(data_json)
-
-            print(f"\n--- SUCESSO SCRAPER 3 ---")
-            print(f"Dados exportados para o arquivo: {JSON_FILENAME}")
-            print(f"Total de registros (times * temporadas) exportados: {len(df_final)}")
+    return _season_frame(df_list_combined, season_year_str)
+
+
+def scraper_espn_standings(pool, http, backend=None, full=False, stream=False, formats=(), store=None):
+    """
+    Método 3: Scraper ESPN Standings (Classificação) - Coleta todas as temporadas.
+    Endpoint: https://www.espn.com.br/nba/classificacao
+    As temporadas são distribuídas entre os workers (drivers do pool ou conexões HTTP).
+    Temporadas encerradas marcadas como finais no cache são reaproveitadas do JSON
+    existente; full=True ignora o cache e refaz todas.
+    Com stream=True, cada temporada é gravada no JSON assim que fica pronta.
+    """
+    backend = backend or SOURCE_BACKENDS["espn"]
+    JSON_FILENAME = ESPN_JSON
+
+    print("\n\n" + "=" * 50)
+    print("INICIANDO SCRAPER 3: ESPN NBA STANDINGS (TODAS AS TEMPORADAS)")
+    print(f"Acessando o endpoint inicial: {ESPN_START_URL} (backend: {backend})")
+
+    try:
+        if backend == "http":
+            seasons = _http_discover_espn_seasons(http)
+        else:
+            with pool.driver() as driver:
+                seasons = _discover_espn_seasons(driver)
+
+        # Temporadas finais já coletadas não mudam mais: reaproveita as linhas do JSON existente
+        season_cache = incremental.SeasonCache()
+        existing_df = None if full else incremental.load_records(JSON_FILENAME)
+        if existing_df is not None and not existing_df.empty:
+            seasons_to_scrape, reused_seasons = incremental.espn_seasons_to_refresh(seasons, existing_df, season_cache)
+            print(f"Cache de temporadas: reaproveitando {[label for _, label in reused_seasons]}; "
+                  f"raspando {[label for _, label in seasons_to_scrape]}.")
+        else:
+            if full:
+                print("Opção --full: ignorando o cache e raspando todas as temporadas.")
+            seasons_to_scrape, reused_seasons = seasons, []
+
+        # 3. Coletar cada temporada em paralelo. Os resultados chegam na ordem do dropdown e são
+        # intercalados com as temporadas reaproveitadas (seasons_to_scrape segue a mesma ordem)
+        fetch_map = http.imap if backend == "http" else pool.imap
+        scrape_season = _http_scrape_espn_season if backend == "http" else _scrape_espn_season
+        scraped_frames = fetch_map(scrape_season, seasons_to_scrape)
+        to_scrape = set(seasons_to_scrape)
+        scraped_rows = {}
+
+        outputs = _open_outputs(JSON_FILENAME, formats, ESPN_COLUMNAR, partition_by='Season', store=store, table="standings")
+        sink = outputs if stream else None
+        with FrameCollector("espn", ESPN_COLUMNS, sink=sink) as standings:
+            for season in seasons:
+                if season in to_scrape:
+                    df_season = next(scraped_frames)
+                else:
+                    df_season = existing_df[existing_df['Season'] == season[1]]
+                if df_season is None or df_season.empty:
+                    continue
+                # 6. Limpeza (por temporada): remove linhas sem nome de equipe
+                df_season = _clean_season_frame(df_season)
+                if season in to_scrape:
+                    scraped_rows[season] = len(df_season)
+                standings.add(df_season, label=season[1])
+        print(f"\nTotal geral de times coletados: {standings.rows}")
+
+        # Exportação Final (Season e Conference primeiro, pela ordem de ESPN_COLUMNS)
+        if standings.rows:
+            if standings.streaming:
+                print(f"\n--- SUCESSO SCRAPER 3 ---")
+                print(f"Dados gravados em streaming em: {', '.join(outputs.paths)}")
+            else:
+                write_frame(standings.frame(), outputs)
+                print(f"\n--- SUCESSO SCRAPER 3 ---")
+                print(f"Dados exportados para: {', '.join(outputs.paths)}")
+            print(f"Total de registros (times * temporadas) exportados: {standings.rows}")
+
+            # Atualiza o cache: temporadas anteriores à atual passam a ser finais
+            current_end_year = incremental.current_season_end_year(seasons[0][1] if seasons else None)
+            for (url, label), rows in scraped_rows.items():
+                if not rows:
+                    continue
+                end_year = incremental.season_end_year_from_url(url)
+                season_cache.mark(url, label, rows, final=end_year is not None and end_year < current_end_year)
+            season_cache.save()
 
         else:
             print("Nenhuma tabela de classificação encontrada em nenhuma temporada.")
 
     except Exception as e:
+        METRICS.count("failures")
         print(f"\n--- ERRO CRÍTICO SCRAPER 3 ---")
         print(f"Ocorreu um erro geral: {e}")
 
 
 # --- EXECUÇÃO PRINCIPAL ---
 
-# Inicializa o driver
-driver = setup_driver()
-
-if driver:
-    scraper_nba_stats(driver) 
-    scraper_basketball_reference_schedule(driver) 
-    scraper_espn_standings(driver)
-    print("\nFechando o navegador...")
-    driver.quit()
-    print("Navegador fechado.")
-else:
-    print("Não foi possível inicializar o WebDriver. O script será encerrado.")
-
+def _parse_backend(value):
+    try:
+        source, backend = value.split("=", 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Formato inválido '{value}'. Use fonte=backend (ex: espn=selenium).")
+    if source not in SUPPORTED_BACKENDS:
+        raise argparse.ArgumentTypeError(f"Fonte desconhecida '{source}'. Opções: {', '.join(SUPPORTED_BACKENDS)}.")
+    if backend not in SUPPORTED_BACKENDS[source]:
+        raise argparse.ArgumentTypeError(f"Backend '{backend}' inválido para {source}. Opções: {', '.join(SUPPORTED_BACKENDS[source])}.")
+    return source, backend
+
+
+def build_parser(description="Coleta os dados da NBA (stats, calendário e classificação)."):
+    """Opções da coleta (também usadas pelo daemon.py)."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--workers", type=int, default=3,
+                        help="Número máximo de sessões do navegador (e conexões HTTP) em paralelo (padrão: 3).")
+    parser.add_argument("--backend", type=_parse_backend, action="append", default=[], metavar="FONTE=BACKEND",
+                        help=f"Sobrescreve o backend de uma fonte: {SUPPORTED_BACKENDS}.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reaproveita os JSON existentes e só baixa as páginas que ainda podem mudar.")
+    parser.add_argument("--full", action="store_true",
+                        help="Ignora o cache de temporadas da ESPN e refaz a coleta de todas as temporadas.")
+    parser.add_argument("--stream", action="store_true",
+                        help="Grava cada página (mês/temporada) direto no JSON, sem montar a tabela completa na memória.")
+    parser.add_argument("--columnar", action="append", choices=COLUMNAR_FORMATS, default=[],
+                        help="Grava também em formato colunar (Parquet e/ou Arrow IPC) ao lado do JSON. Requer o pyarrow.")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, metavar="ARQUIVO",
+                        help=f"Banco SQLite atualizado junto com os JSON, usado pelo assistente (padrão: {DEFAULT_STORE_PATH}).")
+    parser.add_argument("--no-store", action="store_true", help="Não atualiza o banco local.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Desativa o cache HTTP em disco (requisições condicionais e reaproveitamento do parse).")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Diretório do cache HTTP (padrão: {DEFAULT_CACHE_DIR}). Inspecione com 'python http_cache.py stats'.")
+    parser.add_argument("--cache-max-size", type=parse_size, default=DEFAULT_MAX_BYTES, metavar="TAMANHO",
+                        help="Tamanho máximo do cache HTTP antes de remover as entradas menos usadas (padrão: 200MB).")
+    parser.add_argument("--metrics-file", metavar="ARQUIVO",
+                        help="Arquivo JSON-lines com os spans e contadores da execução (padrão: metrics/run-<data>.jsonl).")
+    parser.add_argument("--no-metrics", action="store_true", help="Não grava o arquivo de métricas.")
+    parser.add_argument("--prometheus", metavar="ARQUIVO",
+                        help="Grava também as métricas no formato texto do Prometheus (ex: para o textfile collector).")
+    parser.add_argument("--fixture-server", metavar="URL",
+                        help="Redireciona as requisições HTTP para um servidor local de fixtures (ver fetchers.py).")
+    api_mode = parser.add_mutually_exclusive_group()
+    api_mode.add_argument("--record-api", metavar="DIR",
+                          help="Grava as respostas da API de stats em DIR (para replay offline).")
+    api_mode.add_argument("--replay-api", metavar="DIR",
+                          help="Lê as respostas gravadas da API de stats em vez de acessar a rede.")
+    add_browser_arguments(parser)
+    return parser
+
+
+def check_args(parser, args):
+    if args.columnar and not columnar_available():
+        parser.error("--columnar requer o pyarrow (pip install pyarrow).")
+    return args
+
+
+def parse_args(argv=None):
+    parser = build_parser()
+    return check_args(parser, parser.parse_args(argv))
+
+
+def scraper_jobs(args, store):
+    """(scraper, fonte, opções) de cada fonte, a partir das opções da linha de comando."""
+    return [
+        (scraper_nba_stats, "nba_stats",
+         {"replay_dir": args.replay_api, "record_dir": args.record_api, "formats": args.columnar, "store": store}),
+        (scraper_basketball_reference_schedule, "schedule",
+         {"incremental_mode": args.incremental, "stream": args.stream, "formats": args.columnar, "store": store}),
+        (scraper_espn_standings, "espn", {"full": args.full, "stream": args.stream, "formats": args.columnar, "store": store}),
+    ]
+
+
+def _run_scraper(scraper, source, pool, http, backend, **options):
+    # Spans feitos nesta thread (descoberta, gravação) são atribuídos à fonte
+    with METRICS.context(source=source):
+        return scraper(pool, http, backend, **options)
+
+
+def main(argv=None):
+    global PROFILE
+    args = parse_args(argv)
+    PROFILE = profile_from_args(args)
+    backends = {**SOURCE_BACKENDS, **dict(args.backend)}
+    pool = DriverPool(setup_driver, max_size=args.workers)
+    cache = None if args.no_cache else HttpCache(args.cache_dir, max_bytes=args.cache_max_size)
+    http = HttpFetcher(max_workers=args.workers, fixture_server=args.fixture_server, cache=cache)
+    store = None if args.no_store else NbaStore(args.store)
+    print(f"Executando os scrapers em paralelo com até {pool.max_size} worker(s). Backends: {backends}")
+    inicio = time.perf_counter()
+
+    scrapers = scraper_jobs(args, store)
+    try:
+        # As três fontes rodam ao mesmo tempo; as páginas de cada uma disputam os workers
+        with ThreadPoolExecutor(max_workers=len(scrapers)) as executor:
+            futures = [executor.submit(_run_scraper, scraper, source, pool, http, backends[source], **options)
+                       for scraper, source, options in scrapers]
+            for future in futures:
+                future.result()
+    finally:
+        # O pool só abre o navegador se alguma fonte usar o Selenium
+        print("\nFechando o(s) navegador(es)...")
+        pool.close()
+        http.close()
+        if store is not None:
+            store.close()
+        print("Navegador(es) fechado(s).")
+
+    REPORT.print_summary()
+    METRICS.finish()
+    METRICS.print_summary()
+    if not args.no_metrics:
+        print(f"Métricas gravadas em: {METRICS.write_jsonl(args.metrics_file or default_metrics_path(METRICS.run_id))}")
+    if args.prometheus:
+        print(f"Métricas (Prometheus) gravadas em: {METRICS.write_prometheus(args.prometheus)}")
+
+    print(f"Tempo total da coleta: {time.perf_counter() - inicio:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Respostas locais para perguntas diretas, sem chamar o Gemini.
+
+Perguntas como "quantos pontos o Luka faz por jogo?", "qual o recorde do Detroit Pistons?"
+ou "placar de Rockets x Thunder em 21/10" são só consultas aos dados. Os modelos abaixo
+reconhecem essas perguntas (em português ou inglês) usando as entidades extraídas por
+nba_context.ContextIndex e respondem direto dos índices. O resto (perguntas abertas,
+comparações, opiniões) continua indo para o Gemini.
+
+Modelos reconhecidos:
+- estatística de jogador:  "quantos pontos o Luka faz por jogo?", "Jalen Brunson assists"
+- líder de estatística:    "quem é o cestinha da liga?", "who leads the Celtics in rebounds?"
+- campanha de time:        "qual o recorde do Detroit Pistons?", "Knicks record"
+- líder de conferência:    "quem lidera a conferência leste?", "who leads the west?"
+- placar/resultado:        "placar de Rockets x Thunder em 21/10", "Lakers score on 11/02"
+- próximo/último jogo:     "quando é o próximo jogo dos Lakers?", "Celtics last game"
+
+Teste sem abrir a interface:
+    python nba_answers.py "qual o recorde do Detroit Pistons?"
+"""
+import argparse
+import re
+import time
+
+from nba_context import ContextIndex, LazyData
+from nba_store import fold_name
+
+# Perguntas abertas ficam com o Gemini, mesmo que citem um time ou jogador
+OPEN_ENDED_RE = re.compile(
+    r"\b(?:por ?que|porque|why|expli\w+|analis\w+|analy\w+|compar\w+|acha|think|opini\w+|deveria|should|"
+    r"previs\w+|predict\w*|chances?|melhor que|better than|vai ganhar|will win|quem vai|who will|historia|history)\b"
+)
+NEXT_GAME_RE = re.compile(r"\b(?:proxim[oa]s? (?:jogo|partida)s?|next (?:game|match)|quando (?:joga|e o jogo)|when (?:do|does|is)\b.*\bplay)")
+LAST_GAME_RE = re.compile(r"\b(?:ultim[oa]s? (?:jogo|partida|resultado)s?|last (?:game|match|result)|jogou ontem|played last)")
+LEADER_RE = re.compile(r"\b(?:quem|who|lider\w*|leads?|leaders?|leading|mais|most|maior|top|cestinha|melhor|best|primeiro|first)\b")
+RECORD_RE = re.compile(r"\b(?:recorde|record|campanha|vitorias|derrotas|wins|losses|posicao|position|standing|classificacao|"
+                       r"aproveitamento|sequencia|streak)\b")
+
+EN_WORDS = re.compile(r"\b(?:who|what|whats|how|which|when|where|the|does|did|is|are|has|his|score|record|leads?|next|last|"
+                      r"game|games|points|assists|rebounds|many|much|per|in|of)\b")
+PT_WORDS = re.compile(r"\b(?:quem|qual|quais|quantos|quantas|quando|onde|como|o|os|as|do|da|dos|das|de|em|tem|faz|e|"
+                      r"jogo|jogos|pontos|placar|recorde|lidera|proximo|ultimo)\b")
+
+# Nome da estatística (pt, en) e se é média por jogo
+STAT_NAMES = {
+    "PTS": ("pontos", "points", True), "AST": ("assistências", "assists", True), "REB": ("rebotes", "rebounds", True),
+    "STL": ("roubos de bola", "steals", True), "BLK": ("tocos", "blocks", True), "TOV": ("erros", "turnovers", True),
+    "Min": ("minutos", "minutes", True), "3PM": ("bolas de 3 convertidas", "three-pointers made", True),
+    "FG%": ("aproveitamento nos arremessos", "field goal percentage", False),
+    "FT%": ("aproveitamento nos lances livres", "free throw percentage", False),
+    "+/-": ("saldo de pontos (+/-)", "plus/minus", True),
+    "DD2": ("duplos-duplos", "double-doubles", False), "TD3": ("triplos-duplos", "triple-doubles", False),
+}
+CONFERENCE_NAMES = {"Eastern": ("Conferência Leste", "Eastern Conference"), "Western": ("Conferência Oeste", "Western Conference")}
+MAX_PLAYERS = 3
+MAX_GAMES = 5
+
+
+class LocalAnswer:
+    """Resposta montada localmente: texto, modelo usado e tempo gasto."""
+
+    def __init__(self, text, template, elapsed=0.0):
+        self.text = text
+        self.template = template
+        self.elapsed = elapsed
+
+
+def _number(value):
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def _count(value, singular, plural):
+    return f"{value} {singular if value == 1 else plural}"
+
+
+def _ordinal(position, en):
+    if not en:
+        return f"{position}º"
+    suffix = "th" if 10 <= position % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(position % 10, "th")
+    return f"{position}{suffix}"
+
+
+class LocalEngine:
+    """Responde perguntas diretas a partir dos índices de um ContextIndex."""
+
+    def __init__(self, index):
+        self.index = index
+        # (nome, função) na ordem em que são testados; cada função retorna o texto ou None
+        self.templates = [
+            ("placar", self._game_score),
+            ("próximo jogo", self._next_game),
+            ("último jogo", self._last_game),
+            ("estatística de jogador", self._player_stat),
+            ("campanha de time", self._team_record),
+            ("líder de conferência", self._conference_leader),
+            ("líder de estatística", self._stat_leader),
+        ]
+
+    def answer(self, question):
+        """LocalAnswer se a pergunta se encaixar num modelo; None para mandar ao Gemini."""
+        start = time.perf_counter()
+        folded = fold_name(question)
+        if OPEN_ENDED_RE.search(folded):
+            return None
+        q = self.index.parse(question)
+        en = len(EN_WORDS.findall(folded)) > len(PT_WORDS.findall(folded))
+        for name, template in self.templates:
+            text = template(q, folded, en)
+            if text:
+                return LocalAnswer(text, name, time.perf_counter() - start)
+        return None
+
+    # -----------------------------------------------------------------
+    # Jogos
+    # -----------------------------------------------------------------
+    def _describe_game(self, row):
+        visitor, home = row.get("Visitor/Neutral"), row.get("Home/Neutral")
+        if not self.index.played(row):
+            at = f"{row.get('Start (ET)')} ET" if row.get("Start (ET)") else ""
+            return f"{row.get('Date')}: {visitor} @ {home} {at}".rstrip() + (f" ({row.get('Arena')})" if row.get("Arena") else "")
+        overtime = f" ({row['Overtime']})" if row.get("Overtime") else ""
+        return f"{row.get('Date')}: {visitor} {row.get('Visitor PTS')} x {row.get('Home PTS')} {home}{overtime}"
+
+    def _team_games(self, team):
+        return sorted(self.index.games_by_team.get(team, []), key=lambda row: self.index.game_dates.get(id(row)) or "")
+
+    def _game_score(self, q, folded, en):
+        if not q.teams or not q.about_games or q.players or NEXT_GAME_RE.search(folded) or LAST_GAME_RE.search(folded):
+            return None
+        teams = set(q.teams)
+        if q.dates:
+            rows = [row for iso in q.dates for row in self.index.games_by_date.get(iso, [])
+                    if self.index.teams_of(row) & teams]
+        elif len(teams) > 1:
+            rows = [row for row in self._team_games(q.teams[0]) if teams <= self.index.teams_of(row)]
+        else:
+            return None # "jogos dos Lakers" sem data: lista aberta, fica com o Gemini
+        if len(teams) > 1:
+            rows = [row for row in rows if teams <= self.index.teams_of(row)]
+        if q.months:
+            rows = [row for row in rows if row.get("Month") in q.months]
+        names = " x ".join(q.teams)
+        if not rows:
+            when = f" em {', '.join(q.dates)}" if q.dates and not en else (f" on {', '.join(q.dates)}" if q.dates else "")
+            return f"No {names} game found{when}." if en else f"Nenhum jogo de {names} encontrado{when}."
+        return "\n".join(self._describe_game(row) for row in rows[:MAX_GAMES])
+
+    def _next_game(self, q, folded, en):
+        if len(q.teams) != 1 or not NEXT_GAME_RE.search(folded):
+            return None
+        upcoming = [row for row in self._team_games(q.teams[0]) if not self.index.played(row)]
+        if not upcoming:
+            return f"No upcoming games for {q.teams[0]}." if en else f"Não há próximos jogos de {q.teams[0]} no calendário."
+        prefix = f"Next {q.teams[0]} game" if en else f"Próximo jogo de {q.teams[0]}"
+        return f"{prefix}: {self._describe_game(upcoming[0])}"
+
+    def _last_game(self, q, folded, en):
+        if len(q.teams) != 1 or not LAST_GAME_RE.search(folded):
+            return None
+        played = [row for row in self._team_games(q.teams[0]) if self.index.played(row)]
+        if not played:
+            return f"{q.teams[0]} has not played yet." if en else f"{q.teams[0]} ainda não jogou."
+        prefix = f"Last {q.teams[0]} game" if en else f"Último jogo de {q.teams[0]}"
+        return f"{prefix}: {self._describe_game(played[-1])}"
+
+    # -----------------------------------------------------------------
+    # Jogadores
+    # -----------------------------------------------------------------
+    def _stat_text(self, row, stat, en):
+        pt_name, en_name, per_game = STAT_NAMES.get(stat, (stat, stat, True))
+        value = row.get(stat)
+        if value is None:
+            return None
+        if stat.endswith("%"):
+            return f"{_number(value)}% {en_name}" if en else f"{_number(value)}% de {pt_name}"
+        if per_game:
+            return f"{_number(value)} {en_name} per game" if en else f"{_number(value)} {pt_name} por jogo"
+        return f"{_number(value)} {en_name}" if en else f"{_number(value)} {pt_name}"
+
+    def _player_line(self, row, stats, en):
+        parts = [text for text in (self._stat_text(row, stat, en) for stat in stats) if text]
+        games = f"{row.get('GP')} games" if en else f"{row.get('GP')} jogos"
+        return f"{row.get('Player')} ({row.get('Team')}): {', '.join(parts)} ({games})."
+
+    def _player_stat(self, q, folded, en):
+        if not q.players or len(q.players) > MAX_PLAYERS or q.teams or q.dates or q.about_standings:
+            return None
+        stats = q.stats or ["PTS", "REB", "AST"]
+        return "\n".join(self._player_line(row, stats, en) for row in q.players)
+
+    def _stat_leader(self, q, folded, en):
+        if not q.stats or q.players or len(q.teams) > 1 or q.dates or not LEADER_RE.search(folded):
+            return None
+        stat = q.stats[0]
+        rows = self.index.players_by_team.get(q.teams[0], []) if q.teams else self.index.players
+        leaders = self.index.leaders(rows, stat, 3)
+        if not leaders:
+            return None
+        pt_name, en_name, _ = STAT_NAMES.get(stat, (stat, stat, True))
+        scope = (f"on {q.teams[0]}" if en else f"do {q.teams[0]}") if q.teams else ("in the league" if en else "da liga")
+        head = f"{en_name.capitalize()} leader {scope}" if en else f"Líder {scope} em {pt_name}"
+        lines = [f"{head}: {self._player_line(leaders[0], [stat], en)}"]
+        if len(leaders) > 1:
+            rest = "; ".join(f"{row['Player']} ({row['Team']}) {_number(row[stat])}" for row in leaders[1:])
+            lines.append(f"{'Next' if en else 'Em seguida'}: {rest}.")
+        return "\n".join(lines)
+
+    # -----------------------------------------------------------------
+    # Classificação
+    # -----------------------------------------------------------------
+    def _conference_table(self, season, conference):
+        rows = [row for row in self.index.standings_by_season.get(season, []) if row.get("Conference") == conference]
+        return sorted(rows, key=lambda row: -(row.get("% Vit.") or 0))
+
+    def _record_line(self, row, en):
+        conference = CONFERENCE_NAMES.get(row.get("Conference"), (row.get("Conference"), row.get("Conference")))
+        table = self._conference_table(row.get("Season"), row.get("Conference"))
+        position = table.index(row) + 1 if row in table else None
+        pct = row.get("% Vit.")
+        pct = f"{pct * 100:.1f}%" if isinstance(pct, (int, float)) else "-"
+        if en:
+            text = f"{row.get('Equipe')}: {row.get('V')}-{row.get('D')} ({pct}) in {row.get('Season')}"
+            return text + (f", {_ordinal(position, True)} in the {conference[1]}." if position else ".")
+        text = f"{row.get('Equipe')}: {_count(row.get('V'), 'vitória', 'vitórias')} e {_count(row.get('D'), 'derrota', 'derrotas')} ({pct}) em {row.get('Season')}"
+        return text + (f", {_ordinal(position, False)} na {conference[0]}." if position else ".")
+
+    def _team_record(self, q, folded, en):
+        if not q.teams or q.players or q.stats or q.about_games or not RECORD_RE.search(folded):
+            return None
+        seasons = q.seasons or self.index.seasons[:1]
+        rows = [row for team in q.teams for row in self.index.standings_by_team.get(team, []) if row.get("Season") in seasons]
+        if not rows:
+            return None
+        return "\n".join(self._record_line(row, en) for row in rows)
+
+    def _conference_leader(self, q, folded, en):
+        if q.teams or q.players or q.stats or not LEADER_RE.search(folded) or not q.about_standings:
+            return None
+        season = (q.seasons or self.index.seasons[:1] or [None])[0]
+        conferences = [q.conference] if q.conference else list(CONFERENCE_NAMES)
+        lines = []
+        for conference in conferences:
+            table = self._conference_table(season, conference)
+            if table:
+                name = CONFERENCE_NAMES[conference][1 if en else 0]
+                leader = table[0]
+                lines.append(f"{name} ({season}): {leader['Equipe']} {leader['V']}-{leader['D']}" if en else
+                             f"{name} ({season}): {leader['Equipe']}, com {_count(leader['V'], 'vitória', 'vitórias')} e {_count(leader['D'], 'derrota', 'derrotas')}")
+        return "\n".join(lines) or None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Testa as respostas locais do assistente.")
+    parser.add_argument("question", nargs="+")
+    parser.add_argument("--dir", default=".", help="Diretório com o banco/JSON (padrão: diretório atual).")
+    args = parser.parse_args(argv)
+
+    engine = LocalEngine(ContextIndex(LazyData(args.dir)))
+    result = engine.answer(" ".join(args.question))
+    if result is None:
+        print("Sem modelo local para essa pergunta: iria para o Gemini.")
+    else:
+        print(f"[{result.template}, {result.elapsed * 1000:.2f} ms]\n{result.text}")
+
+
+if __name__ == "__main__":
+    main()
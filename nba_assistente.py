@@ -1,10 +1,40 @@
+import time
+_T0 = time.perf_counter() # Antes dos imports, para medir o tempo deles
+
 import tkinter as tk
-from tkinter import scrolledtext, messagebox
-import google.generativeai as genai
-import pyttsx3
+from tkinter import scrolledtext, messagebox, ttk
+import hashlib
+import itertools
+import queue
+import re
 import threading
-import json
-import os
+from concurrent.futures import ThreadPoolExecutor
+
+from answer_cache import AnswerCache
+from gemini_client import GeminiClient
+from nba_answers import LocalEngine
+from nba_context import GAMES_FILE, PLAYERS_FILE, STANDINGS_FILE, ContextIndex, LazyData, data_signature
+
+
+class StartupTimer:
+    """Tempo de cada fase da inicialização (impresso no console)."""
+
+    def __init__(self, start=None):
+        self.start = self.last = time.perf_counter() if start is None else start
+        self.phases = []
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    def report(self, title):
+        phases = " | ".join(f"{name} {seconds:.2f}s" for name, seconds in self.phases)
+        print(f"{title}: {phases} (total {self.last - self.start:.2f}s)")
+
+
+STARTUP = StartupTimer(_T0)
+STARTUP.mark("imports")
 
 # -----------------------------------------------------------------
 # 1. CONFIGURAÇÃO DA API GEMINI (COM AUTO-DETECÇÃO)
@@ -16,84 +46,196 @@ if "COLE_SUA_API_KEY" in API_KEY:
                          "API Key não encontrada. Edite o arquivo e cole sua chave.")
     exit()
 
-try:
-    genai.configure(api_key=API_KEY)
-    model = genai.GenerativeModel('models/gemini-2.0-flash')
+# O google.generativeai demora para importar: é carregado em segundo plano, depois que a janela abre
+gemini = None # GeminiClient (cota, repetições e orçamento de tokens)
+GEMINI_READY = threading.Event()
 
-except Exception as e:
-    messagebox.showerror("Erro de API", f"Erro ao configurar Gemini:\n{e}")
-    exit()
+def init_gemini():
+    global gemini
+    try:
+        import google.generativeai as genai
+        genai.configure(api_key=API_KEY)
+        gemini = GeminiClient(genai.GenerativeModel('models/gemini-2.0-flash'))
+    except Exception as e:
+        ui_call(messagebox.showerror, "Erro de API", f"Erro ao configurar Gemini:\n{e}")
+    finally:
+        GEMINI_READY.set()
 
 # -----------------------------------------------------------------
-# 2. CARREGAMENTO DOS DADOS (MODIFICADO PARA SER MAIS LEVE)
+# 2. CARREGAMENTO DOS DADOS E ÍNDICES DE CONTEXTO
 # -----------------------------------------------------------------
+# Ordem em que os conjuntos são carregados em segundo plano
+DATASETS = [(PLAYERS_FILE, "jogadores"), (STANDINGS_FILE, "classificação"), (GAMES_FILE, "calendário")]
+
 def load_all_data():
-    """Carrega apenas os arquivos da temporada atual (2025-26)"""
-    print("Carregando arquivos JSON (Apenas temporada atual)...")
-    all_data = {}
-
-    filenames = [
-        'nba_stats_2025_26_players_filtrado.json',
-        'nba_2026_schedule_completo.json',
-        'nba_espn_standings_all_seasons.json' #Caso haja problemas com token limit, remover este arquivo.
-    ]
-    
-    missing_files = []
-    for filename in filenames:
-        if not os.path.exists(filename):
-            print(f"AVISO: O arquivo {filename} não foi encontrado.")
-            missing_files.append(filename)
-            all_data[filename] = None
-        else:
+    """
+    Prepara os índices usados para escolher, a cada pergunta, só as linhas relevantes
+    (ver nba_context.py). Nenhum arquivo é lido aqui: cada conjunto (banco local ou JSON)
+    é carregado em segundo plano (warm_up) ou na primeira pergunta que precisar dele.
+    """
+    return ContextIndex(LazyData())
+
+def warm_up():
+    """Roda depois que a janela abre: carrega os dados e o Gemini, mostrando o progresso."""
+    timer = StartupTimer()
+    index = CONTEXT_INDEX
+    try:
+        for position, (filename, label) in enumerate(DATASETS):
+            ui_call(show_progress, position, f"Carregando dados ({position + 1}/{len(DATASETS)}: {label})...")
             try:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    all_data[filename] = json.load(f)
+                index.load(filename)
             except Exception as e:
+                # Um conjunto com problema não impede os outros nem o Gemini
                 print(f"Erro ao carregar {filename}: {e}")
+            timer.mark(label)
+        ui_call(show_progress, len(DATASETS), "Conectando ao Gemini...")
+        init_gemini()
+        timer.mark("Gemini")
+        ui_call(show_progress, None, "Pronto.")
+        timer.report("Em segundo plano")
 
-    if missing_files:
-        messagebox.showwarning("Arquivos Não Encontrados",
-                               f"Os seguintes arquivos não foram encontrados:\n\n"
-                               f"{', '.join(missing_files)}\n\n"
-                               "A IA responderá sem esses dados.")
-    
-    print("Dados da temporada atual carregados.")
-    return json.dumps(all_data, indent=2, ensure_ascii=False)
+        if index.data.missing:
+            ui_call(messagebox.showwarning, "Arquivos Não Encontrados",
+                    f"Os seguintes arquivos não foram encontrados:\n\n"
+                    f"{', '.join(index.data.missing)}\n\n"
+                    "A IA responderá sem esses dados.")
+    finally:
+        # Sem isso, as perguntas que vão ao Gemini esperariam para sempre
+        GEMINI_READY.set()
+
+CONTEXT_INDEX = load_all_data()
+LOCAL_ENGINE = LocalEngine(CONTEXT_INDEX)
+STARTUP.mark("índices (adiados)")
+
+# Respostas do Gemini já dadas (ver answer_cache.py); as de dados antigos são descartadas
+ANSWER_CACHE = AnswerCache()
+ANSWER_CACHE.prune(CONTEXT_INDEX.data_version)
+STARTUP.mark("cache de respostas")
 
-CONTEXT_DATA = load_all_data()
+def refresh_data_if_changed():
+    """Se o main.py gravou dados novos desde a carga, recarrega os índices (e invalida o cache)."""
+    global CONTEXT_INDEX, LOCAL_ENGINE
+    if data_signature() == CONTEXT_INDEX.data.signature:
+        return
+    print("Dados atualizados pelo main.py. Recarregando...")
+    CONTEXT_INDEX = load_all_data()
+    LOCAL_ENGINE = LocalEngine(CONTEXT_INDEX)
+    removed = ANSWER_CACHE.prune(CONTEXT_INDEX.data_version)
+    print(f"   -> {removed} respostas do cache descartadas.")
 
 # -----------------------------------------------------------------
 # 3. TTS (TEXT-TO-SPEECH)
 # -----------------------------------------------------------------
+# Fim de frase: pontuação seguida de espaço (não corta "34.9") ou quebra de linha
+SENTENCE_END = re.compile(r"[.!?…](?=\s)|\n")
 
-def speak_text(text_to_speak):
-    try:
-        engine = pyttsx3.init()
-        voices = engine.getProperty('voices')
-        for v in voices:
+class SentenceSplitter:
+    """Junta os trechos da resposta e devolve as frases completas, para o áudio começar antes do fim."""
+
+    def __init__(self):
+        self.buffer = ""
+
+    def feed(self, text):
+        self.buffer += text
+        sentences = []
+        match = SENTENCE_END.search(self.buffer)
+        while match:
+            sentence, self.buffer = self.buffer[:match.end()].strip(), self.buffer[match.end():]
+            if sentence:
+                sentences.append(sentence)
+            match = SENTENCE_END.search(self.buffer)
+        return sentences
+
+    def flush(self):
+        sentence, self.buffer = self.buffer.strip(), ""
+        return [sentence] if sentence else []
+
+class SpeechWorker:
+    """
+    Uma única thread de áudio para a sessão inteira: o pyttsx3 é iniciado uma vez, a voz em
+    português é escolhida uma vez, e as frases chegam por uma fila. Cada resposta recebe uma
+    "geração" (cancel()); frases de gerações antigas são descartadas e a fala em andamento é
+    interrompida na próxima palavra.
+    """
+
+    def __init__(self):
+        self.sentences = queue.Queue()
+        self.generation = 0
+        self.voice_id = None
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="tts", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Descarta o que ainda não foi falado e devolve a nova geração (para as próximas frases)."""
+        with self._lock:
+            self.generation += 1
+            try:
+                while True:
+                    self.sentences.get_nowait()
+            except queue.Empty:
+                pass
+            return self.generation
+
+    def say(self, sentence, generation):
+        if generation == self.generation:
+            self.sentences.put((generation, sentence))
+
+    def _select_voice(self, engine):
+        for v in engine.getProperty('voices'):
             if 'brazil' in v.name.lower() or 'portuguese' in v.name.lower():
-                engine.setProperty('voice', v.id)
-                break
-        engine.say(text_to_speak)
-        engine.runAndWait()
-    except Exception as e:
-        print(f"Erro no áudio: {e}")
+                return v.id
+        return None
+
+    def _stop_if_cancelled(self, engine, generation):
+        if generation != self.generation:
+            engine.stop()
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            import pyttsx3
+            engine = pyttsx3.init()
+            self.voice_id = self._select_voice(engine)
+            if self.voice_id:
+                engine.setProperty('voice', self.voice_id)
+        except Exception as e:
+            print(f"Erro no áudio: {e}")
+            return
+        print(f"Áudio pronto em {time.perf_counter() - start:.2f}s (voz: {self.voice_id or 'padrão'}).")
+
+        current = {"generation": 0}
+        engine.connect('started-word', lambda name, location, length: self._stop_if_cancelled(engine, current["generation"]))
+        while True:
+            generation, sentence = self.sentences.get()
+            if generation != self.generation:
+                continue
+            current["generation"] = generation
+            try:
+                engine.say(sentence.replace("*", ""))
+                engine.runAndWait()
+            except Exception as e:
+                print(f"Erro no áudio: {e}")
+
+SPEECH = SpeechWorker()
+STARTUP.mark("áudio (thread)")
 
 # -----------------------------------------------------------------
 # 4. CONSULTA À IA (PROMPT ATUALIZADO)
 # -----------------------------------------------------------------
-def get_gemini_response(question, context):
-    """Envia a pergunta e o contexto para a API Gemini."""
-    
-    prompt = f"""
+def build_prompt(question, context):
+    return f"""
     Você é um assistente especialista em estatísticas da NBA.
-    Sua única fonte de conhecimento são os dados JSON fornecidos abaixo.
+    Sua única fonte de conhecimento são os dados fornecidos abaixo: tabelas com uma linha
+    de cabeçalho e colunas separadas por "|", já filtradas para a pergunta. Os times aparecem
+    pela sigla (a legenda está em "Siglas") e as datas no formato AAAA-MM-DD; nas respostas,
+    use o nome completo dos times.
     Responda à pergunta do usuário baseando-se **exclusivamente** nesses dados.
     
     Se o usuário perguntar sobre alguma métrica não disponibilizada (ex: "quem ganhou a liga em 1950?"),
     responda: "Eu não tenho acesso à essas informações."
 
-    ### DADOS JSON ###
+    ### DADOS ###
     {context}
     ### FIM DADOS ###
 
@@ -101,61 +243,255 @@ def get_gemini_response(question, context):
 
     Resposta:
     """
-    
+
+def stream_gemini_response(question, context):
+    """Envia a pergunta e o contexto (RetrievedContext) para a API Gemini e devolve a resposta em trechos, à medida que é gerada."""
+    GEMINI_READY.wait()
+    if gemini is None:
+        raise RuntimeError("Gemini não configurado.")
+    # Corta o contexto, se preciso, para o prompt caber no orçamento de tokens
+    fitted = gemini.fit_context(context, lambda text: build_prompt(question, text))
+    if fitted is not context:
+        print(f"Contexto cortado para caber em {gemini.prompt_budget} tokens: {context.rows} -> {fitted.rows} linhas")
     try:
-        response = model.generate_content(prompt)
-        return response.text
+        # A cota e os erros 429/5xx (com novas tentativas) ficam por conta do GeminiClient
+        yield from gemini.stream(build_prompt(question, fitted.text))
     except Exception as e:
-        # Se o erro 429 ocorrer mesmo assim, ele será capturado aqui
         print(f"Erro na API Gemini: {e}")
-        return f"Erro na requisição: {e}"
+        raise
 
 # -----------------------------------------------------------------
 # 5. INTERFACE GRÁFICA
 # -----------------------------------------------------------------
-def process_request():
-    q = user_input.get()
-    if not q: return
-    
-    btn_submit.config(state=tk.DISABLED, text="Pesquisando...")
-    txt_output.delete("1.0", tk.END)
-    txt_output.insert(tk.END, "Consultando o Gemini...")
-    
+# Os widgets do Tk só podem ser mexidos pela thread principal: as threads de consulta
+# colocam as atualizações nesta fila, que a thread principal esvazia a cada UI_POLL_MS.
+UI_QUEUE = queue.Queue()
+UI_POLL_MS = 30
+
+def ui_call(func, *args, **kwargs):
+    UI_QUEUE.put((func, args, kwargs))
+
+def drain_ui_queue():
     try:
-        ans = get_gemini_response(q, CONTEXT_DATA)
-        
-        txt_output.delete("1.0", tk.END)
-        txt_output.insert(tk.END, ans)
-        
-        # Verifica se a caixa "Mudo" NÃO está marcada antes de falar
-        if not is_muted.get():
-            status_label.config(text="Falando a resposta...")
-            # Thread separada para o áudio não travar a tela
-            threading.Thread(target=speak_text, args=(ans,), daemon=True).start()
-        else:
-            status_label.config(text="Pronto (Mudo).")
-        
-    except Exception as e:
-        txt_output.insert(tk.END, f"\nErro: {e}")
-    finally:
-        # Só atualiza o status se não estiver falando
-        if is_muted.get():
-            status_label.config(text="Pronto (Mudo).")
+        while True:
+            func, args, kwargs = UI_QUEUE.get_nowait()
+            func(*args, **kwargs)
+    except queue.Empty:
+        pass
+    root.after(UI_POLL_MS, drain_ui_queue)
+
+LLM_CONCURRENCY = 2  # Chamadas simultâneas ao Gemini
+LLM_DEBOUNCE_S = 0.3 # Espera antes de chamar o Gemini: se outra pergunta chegar nesse meio tempo, esta é descartada
+
+class Request:
+    """Uma pergunta: id, opções, sinal de cancelamento e o que já foi respondido."""
+
+    def __init__(self, request_id, question, muted, generation):
+        self.id = request_id
+        self.question = question
+        self.muted = muted
+        self.generation = generation # Geração do SpeechWorker
+        self.cancelled = threading.Event()
+        self.done = False
+        self.answer = ""
+        self.source = ""
+        self.kind = "..."
+        self.start = time.perf_counter()
+        self.timings = {}
+        self.splitter = SentenceSplitter()
+
+class RequestPipeline:
+    """
+    Fila das perguntas. A parte rápida (dados novos, resposta local, cache) roda num executor
+    de uma thread; as chamadas ao Gemini vão para outro, limitado a LLM_CONCURRENCY.
+    Uma pergunta nova cancela a anterior: se ela ainda não chamou a API, não chama mais; se
+    está recebendo a resposta, o streaming é interrompido. As atualizações de tela de uma
+    pergunta cancelada são descartadas.
+    """
+
+    def __init__(self, concurrency=LLM_CONCURRENCY):
+        self.fast = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pergunta")
+        self.llm = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="gemini")
+        self.current = None
+        self.api_calls = 0
+        self.skipped_calls = 0
+        self._ids = itertools.count(1)
+
+    def submit(self, question, muted):
+        """Chamado pela thread principal. Retorna o Request (ou None para pergunta vazia)."""
+        question = question.strip()
+        if not question:
+            return None
+        current = self.current
+        if current is not None and not current.done and not current.cancelled.is_set() and current.question == question:
+            return current # Enter repetido com a mesma pergunta em andamento
+        self.cancel()
+        req = Request(next(self._ids), question, muted, SPEECH.cancel())
+        self.current = req
+        start_request(req)
+        self.fast.submit(self._answer, req)
+        return req
+
+    def cancel(self):
+        req = self.current
+        if req is not None and not req.done and not req.cancelled.is_set():
+            req.cancelled.set()
+            SPEECH.cancel()
+
+    def ui(self, req, func, *args, **kwargs):
+        """Atualização de tela de uma pergunta; ignorada se ela tiver sido cancelada."""
+        def apply():
+            if not req.cancelled.is_set():
+                func(*args, **kwargs)
+        ui_call(apply)
+
+    def _speak(self, req, sentence):
+        req.timings.setdefault("primeira frase no áudio", time.perf_counter() - req.start)
+        SPEECH.say(sentence, req.generation)
+
+    def _emit(self, req, text):
+        req.timings.setdefault("primeiro trecho", time.perf_counter() - req.start)
+        req.answer += text
+        self.ui(req, show_answer_chunk, req, text)
+        # Áudio: as frases completas vão para o SpeechWorker enquanto o resto da resposta ainda chega
+        if not req.muted:
+            for sentence in req.splitter.feed(text):
+                self._speak(req, sentence)
+
+    def _answer(self, req):
+        if req.cancelled.is_set():
+            return self._finish(req)
+        try:
+            refresh_data_if_changed()
+            # Perguntas diretas (estatística, campanha, placar...) são respondidas na hora, sem o Gemini
+            local = LOCAL_ENGINE.answer(req.question)
+            if local is not None:
+                self._emit(req, local.text)
+                req.kind = "local"
+                req.source = f"Resposta local ({local.template}, {local.elapsed * 1000:.1f} ms)"
+            else:
+                # Só as linhas relacionadas à pergunta (times, jogadores, datas...), não os JSON inteiros
+                context = CONTEXT_INDEX.select(req.question)
+                print(f"[#{req.id}] Entidades: {context.question.describe()} | {context.summary()}")
+                context_hash = hashlib.sha1(context.text.encode("utf-8")).hexdigest()
+                cached = ANSWER_CACHE.get(context.question, context_hash, CONTEXT_INDEX.data_version)
+                if cached is None:
+                    self.llm.submit(self._ask_gemini, req, context, context_hash, CONTEXT_INDEX.data_version)
+                    return
+                self._emit(req, cached.text)
+                req.kind = "cache"
+                req.source = f"Resposta do cache ({cached.kind}" + (f", {cached.score:.0%}" if cached.kind != "exata" else "") + ")"
+                req.source += f" | {ANSWER_CACHE.stats_text()}"
+        except Exception as e:
+            req.kind = "erro"
+            self.ui(req, show_answer_chunk, req, f"\nErro: {e}")
+        self._finish(req)
+
+    def _ask_gemini(self, req, context, context_hash, data_version):
+        # Com digitação rápida a pergunta pode ser substituída logo em seguida: espera um pouco antes de gastar a chamada
+        if req.cancelled.wait(LLM_DEBOUNCE_S):
+            self.skipped_calls += 1
+            return self._finish(req)
+        self.ui(req, status_label.config, text=f"Pergunta #{req.id}: consultando o Gemini...")
+        self.api_calls += 1
+        stream = stream_gemini_response(req.question, context)
+        try:
+            for chunk in stream:
+                if req.cancelled.is_set():
+                    break
+                self._emit(req, chunk)
+            else:
+                ANSWER_CACHE.put(context.question, context_hash, data_version, req.answer)
+            req.kind = "Gemini"
+            req.source = f"Resposta do Gemini ({context.summary()}) | {ANSWER_CACHE.stats_text()}"
+        except Exception as e:
+            req.kind = "erro"
+            self.ui(req, show_answer_chunk, req, f"\nErro: {e}")
+        finally:
+            stream.close()
+            self._finish(req)
+
+    def _finish(self, req):
+        if not req.muted and not req.cancelled.is_set():
+            for sentence in req.splitter.flush():
+                self._speak(req, sentence)
+        if req.cancelled.is_set():
+            req.kind = "cancelada"
+        req.timings["resposta completa"] = time.perf_counter() - req.start
+        req.done = True
+        print(f"[#{req.id}] {req.kind}: {req.source}")
+        print(f"[#{req.id}] Tempos: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in req.timings.items())
+              + f" | chamadas ao Gemini: {self.api_calls}, evitadas: {self.skipped_calls}")
+        ui_call(finish_request, req)
+
+PIPELINE = RequestPipeline()
+
+# Funções abaixo rodam só na thread principal (direto ou via ui_call)
+HISTORY = [] # Requests na ordem em que foram feitos
+displayed = None # Request mostrado na área de resposta
+
+def _history_label(req):
+    return f"#{req.id} [{req.kind}] {req.question}"
+
+def start_request(req):
+    global displayed
+    HISTORY.append(req)
+    history_list.insert(tk.END, _history_label(req))
+    history_list.selection_clear(0, tk.END)
+    history_list.selection_set(tk.END)
+    history_list.see(tk.END)
+    displayed = req
+    txt_output.delete("1.0", tk.END)
+    btn_cancel.config(state=tk.NORMAL)
+    status_label.config(text=f"Pergunta #{req.id}...")
+
+def show_answer_chunk(req, text):
+    if displayed is req:
+        txt_output.insert(tk.END, text)
+        txt_output.see(tk.END)
+
+def finish_request(req):
+    position = HISTORY.index(req)
+    history_list.delete(position)
+    history_list.insert(position, _history_label(req))
+    if displayed is req:
+        history_list.selection_set(position)
+    if PIPELINE.current is req:
+        btn_cancel.config(state=tk.DISABLED)
+        if req.kind == "cancelada":
+            status_label.config(text=f"Pergunta #{req.id} cancelada.")
         else:
-            # Se estiver falando, o status já foi atualizado para "Falando..."
-             status_label.config(text="Pronto.") 
-             
-        btn_submit.config(state=tk.NORMAL, text="Perguntar")
+            status = "Pronto (Mudo)." if req.muted else "Pronto."
+            status_label.config(text=f"{status} {req.source}".strip())
+
+def on_history_select(event):
+    global displayed
+    selection = history_list.curselection()
+    if not selection:
+        return
+    req = HISTORY[selection[0]]
+    displayed = req
+    txt_output.delete("1.0", tk.END)
+    txt_output.insert(tk.END, req.answer)
+    status_label.config(text=f"#{req.id} [{req.kind}] {req.source}".strip())
 
 def on_enter(event):
-    threading.Thread(target=process_request, daemon=True).start()
+    # Lê a pergunta e o "Mudo" aqui, na thread principal; uma pergunta nova cancela a anterior
+    PIPELINE.submit(user_input.get(), is_muted.get())
+
+def on_cancel():
+    PIPELINE.cancel()
+
+def on_mute_toggle():
+    if is_muted.get():
+        SPEECH.cancel()
 
 # -----------------------------------------------------------------
 # 6. CONFIGURAÇÃO DA INTERFACE GRÁFICA
 # -----------------------------------------------------------------
 root = tk.Tk()
 root.title("NBA Stats Assistant")
-root.geometry("700x500")
+root.geometry("900x500")
 
 is_muted = tk.BooleanVar(value=False) # Começa desmarcado (som ativo)
 
@@ -174,18 +510,48 @@ user_input.bind("<Return>", on_enter)
 btn_submit = tk.Button(input_frame, text="Perguntar", command=lambda: on_enter(None), bg="#006BB6", fg="white", width=12)
 btn_submit.pack(side=tk.LEFT, padx=(10, 5))
 
-chk_mute = tk.Checkbutton(input_frame, text="Mudo", variable=is_muted)
+btn_cancel = tk.Button(input_frame, text="Cancelar", command=on_cancel, state=tk.DISABLED, width=10)
+btn_cancel.pack(side=tk.LEFT, padx=5)
+
+chk_mute = tk.Checkbutton(input_frame, text="Mudo", variable=is_muted, command=on_mute_toggle)
 chk_mute.pack(side=tk.LEFT, padx=5)
 
 frame_bottom = tk.Frame(root, padx=10, pady=10)
 frame_bottom.pack(fill=tk.BOTH, expand=True)
 
+# Histórico das perguntas (clique para rever a resposta)
+history_frame = tk.Frame(frame_bottom)
+history_frame.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 10))
+tk.Label(history_frame, text="Histórico:").pack(anchor="w")
+history_list = tk.Listbox(history_frame, width=30, activestyle="none", exportselection=False)
+history_list.pack(fill=tk.BOTH, expand=True)
+history_list.bind("<<ListboxSelect>>", on_history_select)
+
 txt_output = scrolledtext.ScrolledText(frame_bottom, font=("Arial", 11), height=15)
-txt_output.pack(fill=tk.BOTH, expand=True)
+txt_output.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+# Barra de Status (com o progresso da carga dos dados)
+status_frame = tk.Frame(root, bd=1, relief=tk.SUNKEN)
+status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+status_label = tk.Label(status_frame, text="Abrindo...", anchor="w", padx=5)
+status_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+progress = ttk.Progressbar(status_frame, mode="determinate", maximum=len(DATASETS) + 1, length=120)
+progress.pack(side=tk.RIGHT, padx=5, pady=2)
+
+def show_progress(value, text):
+    """value=None esconde a barra (carga concluída)."""
+    if value is None:
+        progress.pack_forget()
+    else:
+        progress["value"] = value
+    status_label.config(text=text)
 
-# Barra de Status
-status_label = tk.Label(root, text="Pronto.", bd=1, relief=tk.SUNKEN, anchor="w", padx=5)
-status_label.pack(side=tk.BOTTOM, fill=tk.X)
+def on_window_ready():
+    STARTUP.mark("janela")
+    STARTUP.report("Inicialização até a janela")
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
 
 # Inicia
+root.after(UI_POLL_MS, drain_ui_queue)
+root.after_idle(on_window_ready)
 root.mainloop()
\ No newline at end of file
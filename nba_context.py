@@ -0,0 +1,671 @@
+"""
+Seleção de contexto para o assistente (nba_assistente.py).
+
+Em vez de mandar os três JSON inteiros (~780 KB) em toda pergunta, o assistente:
+1. reconhece na pergunta times, jogadores, datas, meses, temporadas, estatísticas
+   e o assunto (jogos / classificação);
+2. busca só as linhas correspondentes em índices montados uma vez na carga dos dados
+   (por time, por nome de jogador, por data, por mês e por temporada);
+3. envia essas linhas como tabelas compactas: cabeçalho + linhas separadas por '|', sem as
+   colunas vazias, com os times pela sigla (legenda no fim) e as datas no formato ISO.
+
+Para ver o que seria enviado ao Gemini, sem abrir a interface:
+    python nba_context.py "quantos pontos o Luka faz por jogo?"
+    python nba_context.py "placar de Rockets x Thunder em 21/10"
+
+Tokens de cada conjunto de dados em JSON (indent=2) e no formato compacto:
+    python nba_context.py --report
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from gemini_client import estimate_tokens
+from nba_store import CITY_ALIASES, DEFAULT_STORE_PATH, JSON_SOURCES, TEAMS, NbaStore, fold_name, game_date_iso, resolve_team
+
+PLAYERS_FILE, GAMES_FILE, STANDINGS_FILE = (filename for filename, _, _ in JSON_SOURCES)
+
+# Colunas enviadas por padrão (as estatísticas pedidas na pergunta são acrescentadas)
+PLAYER_FIELDS = ["Player", "Team", "Age", "GP", "Min", "PTS", "REB", "AST", "STL", "BLK", "TOV", "FG%", "3P%", "FT%", "+/-"]
+GAME_FIELDS = ["Date", "Start (ET)", "Visitor/Neutral", "Visitor PTS", "Home/Neutral", "Home PTS", "Overtime", "Arena"]
+STANDING_FIELDS = ["Season", "Conference", "Equipe", "V", "D", "% Vit.", "JA", "Casa", "VISITANTE", "CONF",
+                   "PTS", "PTS Contra", "DIF", "STRK", "U10"]
+# Colunas dos jogos enviadas só quando a pergunta fala delas (expressão na pergunta já sem acentos, coluna)
+OPTIONAL_GAME_FIELDS = [
+    (r"publico|attendance|torcedores|espectadores|attend", "Attend."),
+    (r"duracao|durou|duration|how long|log", "LOG"),
+    (r"notas?|observac\w*|notes?", "Notes"),
+]
+# Colunas com nome de time (enviadas pela sigla) e com data (enviadas em ISO)
+TEAM_FIELDS = {"Team", "Equipe", "Visitor/Neutral", "Home/Neutral"}
+DATE_FIELDS = {"Date"}
+
+# Limites de linhas por seção
+MAX_TEAM_PLAYERS = 15
+MAX_LEADERS = 10
+MAX_RECENT_GAMES = 10
+MAX_UPCOMING_GAMES = 5
+MAX_GAMES = 80
+
+# (expressão na pergunta já sem acentos, coluna). A ordem importa: "3 pontos" antes de "pontos".
+STAT_PATTERNS = [
+    (r"triplos?[- ]duplos?|triple[- ]doubles?", "TD3"),
+    (r"duplos?[- ]duplos?|double[- ]doubles?", "DD2"),
+    (r"(?:bolas? de |cestas? de )?(?:3|tres) pontos|three[- ]point\w*|threes|3pt|3pm", "3PM"),
+    (r"lances? livres?|free throws?", "FT%"),
+    (r"aproveitamento|field goal|fg%", "FG%"),
+    (r"pontos|points|pts|cestinhas?|scorers?|scoring|scores? (?:the )?most", "PTS"),
+    (r"assist\w*|ast", "AST"),
+    (r"rebotes?|rebounds?|reb", "REB"),
+    (r"roubos?|roubadas?|steals?|stl", "STL"),
+    (r"tocos?|bloqueios?|blocks?|blk", "BLK"),
+    (r"minutos|minutes", "Min"),
+    (r"erros|turnovers?|desperdicios?|tov", "TOV"),
+    (r"\+/-|plus[ /-]?minus|saldo", "+/-"),
+]
+# Compiladas uma vez; o grupo garante que as bordas valem para todas as alternativas ("ast" não casa em "east")
+STAT_REGEXES = [(re.compile(rf"(?<![\w+])(?:{pattern})(?!\w)"), stat) for pattern, stat in STAT_PATTERNS]
+# (pergunta, estatísticas esperadas), conferidas por `python nba_context.py --check`
+STAT_CHECKS = [
+    ("who leads the east?", []),
+    ("Celtics record last season", []),
+    ("Lakers last game", []),
+    ("quem tem mais assistências?", ["AST"]),
+    ("ast e reb do Jokic", ["AST", "REB"]),
+    ("3 pontos e pontos por jogo", ["3PM", "PTS"]),
+]
+# (pergunta, times esperados), também conferidas pelo --check
+TEAM_CHECKS = [
+    ("próximo jogo do Boston", ["BOS"]),
+    ("Denver x Detroit", ["DEN", "DET"]),
+    ("jogo do Los Angeles", []),
+]
+GAME_WORDS = re.compile(r"\b(?:jogos?|partidas?|games?|placar\w*|scores?|resultados?|results?|calendario|schedule|"
+                        r"venceu|ganhou|perdeu|beat|won|lost|contra|vs|versus|x|enfrenta\w*|plays?|played)\b")
+STANDING_WORDS = re.compile(r"\b(?:classifica\w*|standings?|tabela|lider\w*|leaders?|conferencias?|conferences?|"
+                            r"leste|oeste|east\w*|west\w*|campanha|recorde|record|vitorias|derrotas|wins|losses|"
+                            r"sequencia|streak|playoffs?|posi\w+)\b")
+PER_GAME_RE = re.compile(r"\b(?:por|a cada|each|per) (?:jogo|partida|game)\b") # "pontos por jogo" não é pergunta sobre jogos
+CONFERENCES = [(re.compile(r"\b(?:leste|east|eastern)\b"), "Eastern"), (re.compile(r"\b(?:oeste|west|western)\b"), "Western")]
+
+MONTHS = {
+    "January": ("janeiro", "january", "jan"), "February": ("fevereiro", "february", "feb", "fev"),
+    "March": ("marco", "march", "mar"), "April": ("abril", "april", "apr", "abr"), "May": ("maio", "may", "mai"),
+    "June": ("junho", "june", "jun"), "October": ("outubro", "october", "oct", "out"),
+    "November": ("novembro", "november", "nov"), "December": ("dezembro", "december", "dec", "dez"),
+}
+_MONTH_WORDS = {word: month for month, words in MONTHS.items() for word in words}
+_MONTH_NUMBERS = {month: datetime.datetime.strptime(month, "%B").month for month in MONTHS}
+# Nomes completos valem sozinhos; abreviações ("out", "mar") só ao lado de um dia ("21 out", "Oct 21")
+_MONTH_RE = "|".join(sorted(_MONTH_WORDS, key=len, reverse=True))
+DAY_MONTH_RE = re.compile(rf"\b(\d{{1,2}})(?: de)? ({_MONTH_RE})\b|\b({_MONTH_RE}) (\d{{1,2}})\b")
+MONTH_NAME_RE = re.compile(r"\b(" + "|".join(w for w in _MONTH_WORDS if len(w) > 3) + r")\b")
+ISO_DATE_RE = re.compile(r"\b(20\d{2})-(\d{1,2})-(\d{1,2})\b")
+BR_DATE_RE = re.compile(r"\b(\d{1,2})/(\d{1,2})(?:/(\d{2}|\d{4}))?\b")
+SEASON_RE = re.compile(r"(?<!\d)(20\d{2})[-/](?:20)?(\d{2})(?![\d/-])")
+RELATIVE_DAYS = {"hoje": 0, "today": 0, "ontem": -1, "yesterday": -1, "amanha": 1, "tomorrow": 1}
+LAST_SEASON_RE = re.compile(r"temporada passada|ano passado|last season|previous season")
+
+# Palavras comuns que não devem ser tomadas como nome de jogador
+STOPWORDS = {
+    "the", "and", "for", "who", "how", "many", "much", "what", "which", "does", "did", "has", "have", "with", "his",
+    "per", "game", "games", "team", "best", "most", "top", "last", "next", "season",
+    "quem", "qual", "quais", "quantos", "quantas", "quanto", "como", "time", "times", "jogo", "jogos", "por", "para",
+    "com", "mais", "menos", "melhor", "melhores", "media", "faz", "fez", "tem", "teve", "sao", "dos", "das", "uma",
+    "ele", "ela", "esta", "esse", "essa", "temporada", "ultimo", "ultimos", "proximo", "proximos", "maior",
+}
+# Um primeiro nome comum ("Jalen", "Josh") só conta junto com outra parte do nome
+MAX_NAME_POSTINGS = 6
+
+
+def _words(text):
+    return re.findall(r"[^\W_]+(?:'[^\W_]+)?", text)
+
+
+def _value(value):
+    """Valor de uma célula na tabela compacta ('' para nulo; 34.9, não 34.900000001)."""
+    if value is None or value == "" or (isinstance(value, float) and value != value):
+        return ""
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value).replace("|", "/")
+
+
+class Section:
+    """Uma tabela do contexto: título, colunas e linhas (dicts dos JSON)."""
+
+    def __init__(self, title, fields, rows, total=None):
+        self.title = title
+        self.fields = fields
+        self.rows = rows
+        self.total = len(rows) if total is None else total
+        self.teams = set() # Siglas usadas no texto (preenchido por render)
+
+    def _cell(self, field, value):
+        if field in TEAM_FIELDS:
+            team = resolve_team(value)
+            if team:
+                self.teams.add(team)
+                return team
+        elif field in DATE_FIELDS:
+            value = game_date_iso(value) or value
+        return _value(value)
+
+    def render(self):
+        title = self.title if self.total == len(self.rows) else f"{self.title} (primeiras {len(self.rows)} de {self.total})"
+        # Colunas vazias em todas as linhas (ex: "Overtime" num dia sem prorrogação) não são enviadas
+        fields = [field for field in self.fields if any(_value(row.get(field)) for row in self.rows)] or self.fields
+        lines = [f"### {title}", "|".join(fields)]
+        lines.extend("|".join(self._cell(field, row.get(field)) for field in fields) for row in self.rows)
+        return "\n".join(lines)
+
+
+class Question:
+    """Entidades reconhecidas numa pergunta."""
+
+    def __init__(self, text):
+        self.text = text
+        self.teams = []
+        self.players = []
+        self.dates = []
+        self.months = []
+        self.seasons = []
+        self.stats = []
+        self.fields = [] # Colunas opcionais pedidas (OPTIONAL_GAME_FIELDS)
+        self.conference = None
+        self.about_games = False
+        self.about_standings = False
+
+    def describe(self):
+        found = {
+            "times": self.teams, "jogadores": [p["Player"] for p in self.players], "datas": self.dates,
+            "meses": self.months, "temporadas": self.seasons, "estatísticas": self.stats,
+            "colunas": self.fields, "conferência": self.conference,
+        }
+        return ", ".join(f"{key}={value}" for key, value in found.items() if value) or "nenhuma entidade"
+
+
+class RetrievedContext:
+    """Resultado da seleção: as seções e o texto que vai no prompt."""
+
+    def __init__(self, question, sections, full_size=None):
+        self.question = question
+        self.sections = sections
+        self.text = "\n\n".join(section.render() for section in sections)
+        teams = sorted(set().union(*(section.teams for section in sections)))
+        if teams:
+            self.text += "\n\nSiglas: " + ", ".join(f"{team}={TEAMS[team]}" for team in teams)
+        self.full_size = full_size
+
+    @property
+    def rows(self):
+        return sum(len(section.rows) for section in self.sections)
+
+    def without_last_row(self):
+        """Cópia sem a última linha da maior tabela (para caber no orçamento de tokens do prompt)."""
+        largest = max(self.sections, key=lambda section: len(section.rows))
+        sections = [Section(s.title, s.fields, s.rows[:-1], s.total) if s is largest else s for s in self.sections]
+        return RetrievedContext(self.question, sections, self.full_size)
+
+    def summary(self):
+        size = len(self.text.encode("utf-8"))
+        text = f"contexto {size / 1024:.1f} KB, {self.rows} linhas"
+        if self.full_size:
+            text += f" (JSON completo: {self.full_size / 1024:.0f} KB, {self.full_size / max(size, 1):.0f}x maior)"
+        return text
+
+
+class ContextIndex:
+    """
+    Índices sobre os registros (por time, nome, data, mês e temporada). Cada conjunto de dados
+    (jogadores, calendário, classificação) só é carregado e indexado no primeiro acesso a um
+    dos seus atributos, ou ao chamar load(); `data` é um LazyData ou um dict nome do JSON -> registros.
+    """
+
+    # Atributos montados por cada conjunto (acessar qualquer um carrega o conjunto inteiro)
+    DATASETS = {
+        PLAYERS_FILE: ("players", "players_by_team", "players_by_word"),
+        GAMES_FILE: ("games", "game_dates", "games_by_team", "games_by_date", "games_by_month", "game_years"),
+        STANDINGS_FILE: ("standings", "standings_by_team", "standings_by_season", "seasons"),
+    }
+    _DATASET_OF = {attr: filename for filename, attrs in DATASETS.items() for attr in attrs}
+
+    def __init__(self, data):
+        self.data = data if isinstance(data, LazyData) else LazyData(data=data)
+        self.full_size = self.data.full_size
+        # Versão dos dados (muda quando o main.py grava dados novos)
+        self.data_version = self.data.version
+        self._lock = threading.RLock()
+        self._built = set()
+        self.timings = {}
+
+    def __getattr__(self, name):
+        # Só é chamado para atributos ainda não criados: carrega o conjunto que os monta
+        filename = ContextIndex._DATASET_OF.get(name)
+        if filename is None or filename in self.__dict__.get("_built", ()):
+            raise AttributeError(name)
+        self.load(filename)
+        return self.__dict__[name]
+
+    def loaded(self, filename):
+        return filename in self._built
+
+    def load(self, filename):
+        """Carrega e indexa um conjunto (uma vez só, mesmo com várias threads pedindo)."""
+        with self._lock:
+            if filename in self._built:
+                return
+            start = time.perf_counter()
+            rows = self.data.get(filename)
+            getattr(self, f"_index_{self.DATASETS[filename][0]}")(rows)
+            self._built.add(filename)
+            self.timings[filename] = time.perf_counter() - start
+
+    def _index_players(self, rows):
+        # 1. Jogadores: por time e por parte do nome (sem acento, minúsculo)
+        self.players = rows
+        self.players_by_team = {}
+        self.players_by_word = {}
+        for row in self.players:
+            self.players_by_team.setdefault(resolve_team(row.get("Team")), []).append(row)
+            for word in set(_words(fold_name(row.get("Player", "")))):
+                if len(word) >= 3:
+                    self.players_by_word.setdefault(word, []).append(row)
+
+    def _part_of_player_name(self, words, position):
+        """A palavra e uma vizinha são partes do nome de um mesmo jogador."""
+        neighbours = {words[i] for i in (position - 1, position + 1) if 0 <= i < len(words)}
+        return any(neighbours & set(_words(fold_name(row.get("Player", ""))))
+                   for row in self.players_by_word.get(words[position], []))
+
+    def _index_games(self, rows):
+        # 2. Jogos: por time (mandante e visitante), por data ISO e por mês
+        self.games = rows
+        self.game_dates = {}
+        self.games_by_team = {}
+        self.games_by_date = {}
+        self.games_by_month = {}
+        for row in self.games:
+            iso = game_date_iso(row.get("Date"))
+            self.game_dates[id(row)] = iso
+            self.games_by_date.setdefault(iso, []).append(row)
+            self.games_by_month.setdefault(row.get("Month"), []).append(row)
+            for side in ("Visitor/Neutral", "Home/Neutral"):
+                self.games_by_team.setdefault(resolve_team(row.get(side)), []).append(row)
+        self.game_years = sorted({iso[:4] for iso in self.games_by_date if iso})
+
+    def _index_standings(self, rows):
+        # 3. Classificação: por time e por temporada (temporadas da mais recente para a mais antiga)
+        self.standings = rows
+        self.standings_by_team = {}
+        self.standings_by_season = {}
+        for row in self.standings:
+            self.standings_by_team.setdefault(resolve_team(row.get("Equipe")), []).append(row)
+            self.standings_by_season.setdefault(row.get("Season"), []).append(row)
+        self.seasons = sorted((s for s in self.standings_by_season if s), reverse=True)
+
+    # -----------------------------------------------------------------
+    # Reconhecimento de entidades
+    # -----------------------------------------------------------------
+    def parse(self, text):
+        q = Question(text)
+        folded = fold_name(text)
+        original = _words(text)
+        words = [fold_name(w) for w in original]
+
+        # 1. Times: nome completo, cidade + apelido, apelido ou sigla (sigla só em maiúsculas: "POR" e não "por")
+        used = set()
+        for size in (3, 2, 1):
+            for start in range(len(words) - size + 1):
+                span = range(start, start + size)
+                if used.intersection(span):
+                    continue
+                abbr = resolve_team(" ".join(words[start:start + size]))
+                if abbr is None:
+                    continue
+                if size == 1 and words[start] == abbr.lower() and not original[start].isupper():
+                    continue
+                if size == 1 and words[start] in CITY_ALIASES and self._part_of_player_name(words, start):
+                    continue # "P.J. Washington" é jogador, não o Washington Wizards
+                used.update(span)
+                if abbr not in q.teams:
+                    q.teams.append(abbr)
+
+        # 2. Jogadores: partes do nome que aparecem na pergunta (as mais raras pesam mais)
+        scores = {}
+        for position, word in enumerate(words):
+            if position in used or len(word) < 3 or word in STOPWORDS:
+                continue
+            rows = self.players_by_word.get(word, [])
+            for row in rows:
+                count, weight = scores.get(id(row), (0, 0.0))
+                scores[id(row)] = (count + 1, weight + 1 / len(rows))
+        if scores:
+            best = max(count for count, _ in scores.values())
+            candidates = [row for row in self.players if id(row) in scores and scores[id(row)][0] == best]
+            if best > 1 or len(candidates) <= MAX_NAME_POSTINGS:
+                q.players = sorted(candidates, key=lambda row: -scores[id(row)][1])[:MAX_LEADERS]
+
+        # 3. Datas e meses
+        q.dates = self._parse_dates(folded)
+        for match in MONTH_NAME_RE.finditer(folded):
+            month = _MONTH_WORDS[match.group(1)]
+            if month not in q.months:
+                q.months.append(month)
+
+        # 4. Temporadas ("2024-25", "2024/2025", "temporada passada")
+        for match in SEASON_RE.finditer(text):
+            season = f"{match.group(1)}-{match.group(2)}"
+            if season not in q.seasons:
+                q.seasons.append(season)
+        if LAST_SEASON_RE.search(folded) and len(self.seasons) > 1 and self.seasons[1] not in q.seasons:
+            q.seasons.append(self.seasons[1])
+
+        # 5. Estatísticas e assunto
+        remaining = folded
+        for regex, stat in STAT_REGEXES:
+            if regex.search(remaining):
+                remaining = regex.sub(" ", remaining)
+                if stat not in q.stats:
+                    q.stats.append(stat)
+        for regex, conference in CONFERENCES:
+            if regex.search(folded):
+                q.conference = conference
+        for pattern, field in OPTIONAL_GAME_FIELDS:
+            if re.search(rf"\b(?:{pattern})\b", folded) and field not in q.fields:
+                q.fields.append(field)
+        q.about_games = bool(GAME_WORDS.search(PER_GAME_RE.sub(" ", remaining)) or q.dates or len(q.teams) > 1)
+        q.about_standings = bool(STANDING_WORDS.search(folded) or q.conference)
+        return q
+
+    def _parse_dates(self, folded):
+        found = []
+
+        def add(year, month, day):
+            try:
+                iso = datetime.date(int(year), int(month), int(day)).isoformat()
+            except ValueError:
+                return
+            if iso not in found:
+                found.append(iso)
+
+        def add_without_year(month, day):
+            # Sem ano: o ano (da temporada) em que essa data tem jogos; senão o primeiro ano da temporada
+            for year in self.game_years:
+                iso = f"{year}-{int(month):02d}-{int(day):02d}"
+                if iso in self.games_by_date:
+                    return add(year, month, day)
+            if self.game_years:
+                year = self.game_years[0] if int(month) >= 7 else self.game_years[-1]
+                add(year, month, day)
+
+        for match in ISO_DATE_RE.finditer(folded):
+            add(*match.groups())
+        for match in BR_DATE_RE.finditer(folded):
+            day, month, year = match.groups()
+            if year:
+                add(year if len(year) == 4 else f"20{year}", month, day)
+            else:
+                add_without_year(month, day)
+        for match in DAY_MONTH_RE.finditer(folded):
+            day = match.group(1) or match.group(4)
+            month = _MONTH_NUMBERS[_MONTH_WORDS[match.group(2) or match.group(3)]]
+            add_without_year(month, day)
+        for word, offset in RELATIVE_DAYS.items():
+            if re.search(rf"\b{word}\b", folded):
+                day = datetime.date.today() + datetime.timedelta(days=offset)
+                add(day.year, day.month, day.day)
+        return found
+
+    # -----------------------------------------------------------------
+    # Seleção das linhas
+    # -----------------------------------------------------------------
+    def select(self, text):
+        """Monta o contexto (só as linhas relevantes) para uma pergunta."""
+        q = self.parse(text)
+        sections = [s for s in (self._player_section(q), self._game_section(q), self._standing_section(q)) if s]
+        if not sections:
+            sections = self._overview(q)
+        return RetrievedContext(q, sections, self.full_size)
+
+    def _player_fields(self, q):
+        return PLAYER_FIELDS + [stat for stat in q.stats if stat not in PLAYER_FIELDS]
+
+    def leaders(self, rows, stat, limit):
+        return sorted((r for r in rows if isinstance(r.get(stat), (int, float))), key=lambda r: -r[stat])[:limit]
+
+    def _player_section(self, q):
+        fields = self._player_fields(q)
+        if q.players:
+            return Section("Jogadores citados (médias por jogo)", fields, q.players)
+        stat = q.stats[0] if q.stats else "PTS"
+        if q.teams and (q.stats or not (q.about_games or q.about_standings)):
+            rows = []
+            for team in q.teams:
+                rows.extend(self.leaders(self.players_by_team.get(team, []), stat, MAX_TEAM_PLAYERS))
+            return Section(f"Jogadores de {', '.join(q.teams)} (médias por jogo, ordenados por {stat})", fields, rows)
+        if q.stats:
+            rows = []
+            for stat in q.stats:
+                rows.extend(r for r in self.leaders(self.players, stat, MAX_LEADERS) if r not in rows)
+            return Section(f"Líderes da liga em {', '.join(q.stats)} (médias por jogo)", fields, rows)
+        return None
+
+    def played(self, row):
+        return row.get("Home PTS") not in (None, "")
+
+    def _game_section(self, q):
+        teams = set(q.teams)
+        fields = GAME_FIELDS + q.fields
+        if q.dates:
+            rows = [row for iso in q.dates for row in self.games_by_date.get(iso, [])]
+            if teams:
+                rows = [row for row in rows if self.teams_of(row) & teams] or rows
+            return Section(f"Jogos em {', '.join(q.dates)}", fields, rows)
+        if not (q.about_games or (q.teams and not (q.about_standings or q.stats)) or (q.months and not q.teams)):
+            return None
+
+        if teams:
+            rows = []
+            for team in q.teams:
+                rows.extend(row for row in self.games_by_team.get(team, []) if row not in rows)
+            if len(teams) > 1:
+                # Confronto direto; se não houver, os jogos de cada time
+                rows = [row for row in rows if teams <= self.teams_of(row)] or rows
+            title = f"Jogos de {' x '.join(q.teams)}"
+        elif q.months:
+            rows = [row for month in q.months for row in self.games_by_month.get(month, [])]
+            title = "Jogos"
+        else:
+            rows = self.games
+            title = "Jogos"
+        rows = sorted(rows, key=lambda row: self.game_dates.get(id(row)) or "")
+
+        if q.months:
+            rows = [row for row in rows if row.get("Month") in q.months]
+            return Section(f"{title} em {', '.join(q.months)}", fields, rows[:MAX_GAMES], total=len(rows))
+        if teams and len(teams) > 1 and all(teams <= self.teams_of(row) for row in rows):
+            return Section(title, fields, rows[:MAX_GAMES], total=len(rows))
+        # Sem mês nem data: os últimos resultados e os próximos jogos
+        played = [row for row in rows if self.played(row)]
+        upcoming = [row for row in rows if not self.played(row)]
+        recent = played[-MAX_RECENT_GAMES * max(1, len(teams)):]
+        following = upcoming[:MAX_UPCOMING_GAMES * max(1, len(teams))]
+        return Section(f"{title} (últimos resultados e próximos jogos)", fields, recent + following)
+
+    def teams_of(self, row):
+        return {resolve_team(row.get("Visitor/Neutral")), resolve_team(row.get("Home/Neutral"))}
+
+    def _standing_section(self, q):
+        if not (q.teams or q.about_standings):
+            return None
+        seasons = q.seasons or self.seasons[:1]
+        rows = [row for season in seasons for row in self.standings_by_season.get(season, [])]
+        if q.teams:
+            rows = [row for row in rows if resolve_team(row.get("Equipe")) in q.teams]
+        if q.conference:
+            rows = [row for row in rows if row.get("Conference") == q.conference]
+        rows = sorted(rows, key=lambda row: (row.get("Season") or "", row.get("Conference") or "", -(row.get("% Vit.") or 0)))
+        return Section(f"Classificação {', '.join(seasons)}", STANDING_FIELDS, rows) if rows else None
+
+    def _overview(self, q):
+        """Pergunta sem entidade reconhecida: um resumo pequeno em vez de tudo."""
+        season = self.seasons[:1]
+        standings = sorted(self.standings_by_season.get(season[0], []) if season else [],
+                           key=lambda row: (row.get("Conference") or "", -(row.get("% Vit.") or 0)))
+        played = [row for row in sorted(self.games, key=lambda r: self.game_dates.get(id(r)) or "") if self.played(row)]
+        last_day = self.game_dates.get(id(played[-1])) if played else None
+        sections = [
+            Section(f"Classificação {', '.join(season)}", STANDING_FIELDS, standings),
+            Section("Cestinhas da liga (médias por jogo)", PLAYER_FIELDS, self.leaders(self.players, "PTS", MAX_LEADERS)),
+            Section(f"Últimos resultados ({last_day})", GAME_FIELDS, self.games_by_date.get(last_day, [])),
+        ]
+        return [section for section in sections if section.rows]
+
+
+def data_signature(directory="."):
+    """
+    Tamanho e data de modificação do banco local e dos JSON. Barato (só stat); serve para
+    saber se o main.py gravou dados novos desde a última carga.
+    """
+    store_path = os.path.join(directory, DEFAULT_STORE_PATH)
+    paths = [store_path, store_path + "-wal"] + [os.path.join(directory, filename) for filename, _, _ in JSON_SOURCES]
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+def load_dataset(filename, directory="."):
+    """
+    Registros de um conjunto: do banco local (nba_store), se ele existir e tiver a tabela
+    preenchida, senão do JSON. Retorna (registros ou None, origem).
+    """
+    table = {name: table for name, table, _ in JSON_SOURCES}[filename]
+    store = NbaStore.open_existing(os.path.join(directory, DEFAULT_STORE_PATH))
+    if store is not None:
+        try:
+            rows = store.records(table)
+        finally:
+            store.close()
+        if rows:
+            return rows, store.path
+    path = os.path.join(directory, filename)
+    if not os.path.exists(path):
+        print(f"AVISO: O arquivo {filename} não foi encontrado.")
+        return None, None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f), path
+    except Exception as e:
+        print(f"Erro ao carregar {filename}: {e}")
+        return None, None
+
+
+class LazyData:
+    """
+    Os três conjuntos de dados, lidos só quando pedidos (get). A versão e o tamanho vêm de
+    data_signature (só stat), então criar um LazyData não lê nenhum arquivo.
+    Com `data` (dict nome do JSON -> registros), usa os registros já carregados.
+    """
+
+    def __init__(self, directory=".", data=None):
+        self.directory = directory
+        self.missing = []
+        self._data = dict(data) if data is not None else {}
+        self._lock = threading.Lock()
+        if data is not None:
+            dump = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+            self.signature = None
+            self.full_size = len(dump)
+            self.version = hashlib.sha1(dump).hexdigest()[:16]
+        else:
+            self.signature = data_signature(directory)
+            json_sizes = [size for path, size, _ in self.signature if path.endswith(".json") and size]
+            self.full_size = sum(json_sizes) or None
+            self.version = hashlib.sha1(repr(self.signature).encode("utf-8")).hexdigest()[:16]
+
+    def get(self, filename):
+        with self._lock:
+            if filename not in self._data:
+                rows, source = load_dataset(filename, self.directory)
+                if source is not None:
+                    print(f"   -> {filename}: {len(rows)} registros ({source}).")
+                else:
+                    self.missing.append(filename)
+                self._data[filename] = rows
+            return self._data[filename] or []
+
+
+def serialization_report(index):
+    """
+    Por conjunto de dados: tokens estimados do JSON (indent=2), do formato compacto com todas
+    as colunas e com as colunas padrão do contexto. Lista de (arquivo, linhas, json, compacto, padrão).
+    """
+    report = []
+    for filename, attr, fields in ((PLAYERS_FILE, "players", PLAYER_FIELDS), (GAMES_FILE, "games", GAME_FIELDS),
+                                   (STANDINGS_FILE, "standings", STANDING_FIELDS)):
+        rows = getattr(index, attr)
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        as_json = estimate_tokens(json.dumps(rows, indent=2, ensure_ascii=False))
+        compact = estimate_tokens(RetrievedContext(None, [Section(filename, columns, rows)]).text)
+        default = estimate_tokens(RetrievedContext(None, [Section(filename, fields, rows)]).text)
+        report.append((filename, len(rows), as_json, compact, default))
+    return report
+
+
+PARSER_CHECKS = [(question, "stats", expected) for question, expected in STAT_CHECKS] + \
+                [(question, "teams", expected) for question, expected in TEAM_CHECKS]
+
+
+def check_parser(index):
+    """Confere STAT_CHECKS e TEAM_CHECKS; retorna a lista de (pergunta, esperado, obtido) que falharam."""
+    failures = []
+    for question, attribute, expected in PARSER_CHECKS:
+        found = getattr(index.parse(question), attribute)
+        if found != expected:
+            failures.append((question, expected, found))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mostra o contexto que o assistente enviaria para uma pergunta.")
+    parser.add_argument("question", nargs="*")
+    parser.add_argument("--dir", default=".", help="Diretório com o banco/JSON (padrão: diretório atual).")
+    parser.add_argument("--report", action="store_true", help="Tokens de cada conjunto de dados: JSON x formato compacto.")
+    parser.add_argument("--check", action="store_true", help="Confere o reconhecimento das estatísticas e dos times (STAT_CHECKS, TEAM_CHECKS).")
+    args = parser.parse_args(argv)
+
+    index = ContextIndex(LazyData(args.dir))
+    if args.check:
+        failures = check_parser(index)
+        for question, expected, stats in failures:
+            print(f"FALHOU: {question!r}: esperado {expected}, obtido {stats}")
+        print(f"{len(PARSER_CHECKS) - len(failures)}/{len(PARSER_CHECKS)} perguntas OK")
+        raise SystemExit(1 if failures else 0)
+    if args.report:
+        print(f"{'Conjunto':45} {'linhas':>7} {'JSON':>9} {'compacto':>9} {'padrão':>9} {'economia':>9}")
+        for filename, rows, as_json, compact, default in serialization_report(index):
+            saved = 1 - default / as_json if as_json else 0.0
+            print(f"{filename:45} {rows:7d} {as_json:9d} {compact:9d} {default:9d} {saved:9.0%}")
+        print("(tokens estimados; 'compacto' = todas as colunas, 'padrão' = colunas enviadas por padrão)")
+        return
+    if not args.question:
+        parser.error("informe uma pergunta ou --report")
+    context = index.select(" ".join(args.question))
+    print(f"Entidades: {context.question.describe()}")
+    print(f"Tamanho: {context.summary()}\n")
+    print(context.text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Acesso direto ao endpoint JSON que alimenta a tabela de nba.com/stats/players/traditional.
+Evita abrir o navegador, selecionar 'All' na paginação e rodar read_html no HTML renderizado.
+
+Modo gravação/replay (para testes offline):
+    python main.py --record-api api_responses/   # salva as respostas reais
+    python main.py --replay-api api_responses/   # lê as respostas salvas, sem rede
+"""
+import contextlib
+import hashlib
+import json
+import os
+import re
+from urllib.parse import urlencode
+
+import pandas as pd
+
+STATS_ENDPOINT = "https://stats.nba.com/stats/leaguedashplayerstats"
+
+# O stats.nba.com recusa (ou deixa pendurada) a requisição sem estes cabeçalhos
+STATS_HEADERS = {
+    "Accept": "application/json, text/plain, */*",
+    "Origin": "https://www.nba.com",
+    "Referer": "https://www.nba.com/",
+    "x-nba-stats-origin": "stats",
+    "x-nba-stats-token": "true",
+}
+
+# Colunas do resultSet -> colunas da tabela do site (mesmas do nba_stats_2025_26_players_filtrado.json)
+SITE_COLUMNS = {
+    "PLAYER_NAME": "Player",
+    "TEAM_ABBREVIATION": "Team",
+    "AGE": "Age",
+    "GP": "GP",
+    "W": "W",
+    "L": "L",
+    "MIN": "Min",
+    "PTS": "PTS",
+    "FGM": "FGM",
+    "FGA": "FGA",
+    "FG_PCT": "FG%",
+    "FG3M": "3PM",
+    "FG3A": "3PA",
+    "FG3_PCT": "3P%",
+    "FTM": "FTM",
+    "FTA": "FTA",
+    "FT_PCT": "FT%",
+    "OREB": "OREB",
+    "DREB": "DREB",
+    "REB": "REB",
+    "AST": "AST",
+    "TOV": "TOV",
+    "STL": "STL",
+    "BLK": "BLK",
+    "PF": "PF",
+    "NBA_FANTASY_PTS": "FP",
+    "DD2": "DD2",
+    "TD3": "TD3",
+    "PLUS_MINUS": "+/-",
+}
+INT_COLUMNS = ["Age", "GP", "W", "L"]
+PCT_COLUMNS = ["FG%", "3P%", "FT%"]  # A API devolve fração (0.476); o site mostra 47.6
+# Incrementar ao mudar as regras do to_site_frame (ordenação, arredondamento, RANK)
+TRANSFORM_VERSION = 1
+# Versão do parse no cache HTTP: o DataFrame salvo de uma resposta 304 só vale para este mapeamento
+PARSE_VERSION = hashlib.sha1(json.dumps(
+    [TRANSFORM_VERSION, list(SITE_COLUMNS.items()), INT_COLUMNS, PCT_COLUMNS]).encode("utf-8")).hexdigest()[:12]
+
+
+def build_params(season, season_type):
+    """Mesmos parâmetros que o site envia para a visão 'Traditional' por jogo (Rank=Y traz as colunas *_RANK)."""
+    return {
+        "College": "", "Conference": "", "Country": "", "DateFrom": "", "DateTo": "",
+        "Division": "", "DraftPick": "", "DraftYear": "", "GameScope": "", "GameSegment": "",
+        "Height": "", "ISTRound": "", "LastNGames": "0", "LeagueID": "00", "Location": "",
+        "MeasureType": "Base", "Month": "0", "OpponentTeamID": "0", "Outcome": "",
+        "PORound": "0", "PaceAdjust": "N", "PerMode": "PerGame", "Period": "0",
+        "PlayerExperience": "", "PlayerPosition": "", "PlusMinus": "N", "Rank": "Y",
+        "Season": season, "SeasonSegment": "", "SeasonType": season_type,
+        "ShotClockRange": "", "StarterBench": "", "TeamID": "0", "VsConference": "",
+        "VsDivision": "", "Weight": "",
+    }
+
+
+def recording_path(directory, season, season_type):
+    slug = re.sub(r"[^0-9a-z]+", "_", f"{season}_{season_type}".lower()).strip("_")
+    return os.path.join(directory, f"leaguedashplayerstats_{slug}.json")
+
+
+def load_recording(replay_dir, season, season_type):
+    """Lê a resposta gravada em disco (modo replay)."""
+    path = recording_path(replay_dir, season, season_type)
+    print(f"[api] Replay da resposta gravada: {path}")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def fetch_response(http, season, season_type, record_dir=None, page=None):
+    """Chama o endpoint e retorna o HttpResponse (gravando o JSON em record_dir, se informado)."""
+    url = f"{STATS_ENDPOINT}?{urlencode(build_params(season, season_type))}"
+    resp = http.get(url, headers=STATS_HEADERS, page=page)
+
+    if record_dir:
+        os.makedirs(record_dir, exist_ok=True)
+        path = recording_path(record_dir, season, season_type)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(json.loads(resp.text), f, ensure_ascii=False)
+        print(f"[api] Resposta gravada em: {path}")
+    return resp
+
+
+def result_set_frame(payload, name="LeagueDashPlayerStats"):
+    """Converte um resultSet (headers + rowSet) em DataFrame, sem passar por HTML."""
+    result_sets = payload.get("resultSets") or payload.get("resultSet")
+    if isinstance(result_sets, dict):
+        result_sets = [result_sets]
+    for result_set in result_sets or []:
+        if result_set.get("name") == name:
+            return pd.DataFrame(result_set["rowSet"], columns=result_set["headers"])
+    raise KeyError(f"resultSet '{name}' não encontrado na resposta da API.")
+
+
+def to_site_frame(df_api):
+    """
+    Deixa o DataFrame da API com as mesmas colunas, ordem, arredondamento e tipos
+    da tabela do site (e do JSON exportado pelo scraper via Selenium).
+    """
+    # O site ordena por PTS (desc) e mostra a posição na coluna sem nome (RANK, empates dividem a posição)
+    df_api = df_api.sort_values("PTS", ascending=False, kind="stable").reset_index(drop=True)
+    df = df_api[list(SITE_COLUMNS)].rename(columns=SITE_COLUMNS)
+
+    for col in PCT_COLUMNS:
+        df[col] = df[col].astype(float) * 100
+    float_cols = [col for col in df.columns if col not in INT_COLUMNS + ["Player", "Team"]]
+    df[float_cols] = df[float_cols].astype(float).round(1)
+    df[INT_COLUMNS] = df[INT_COLUMNS].astype(float).round().astype("int64")
+    df["Player"] = df["Player"].astype(str)
+    df["Team"] = df["Team"].astype(str)
+
+    if "PTS_RANK" in df_api.columns and df_api["PTS_RANK"].notna().all():
+        rank = df_api["PTS_RANK"]  # Calculado pela API sobre os valores sem arredondamento
+    else:
+        rank = df["PTS"].rank(method="min", ascending=False).fillna(len(df))
+    df.insert(0, "RANK", rank.astype("int64"))
+    return df
+
+
+def fetch_player_stats(http, season="2025-26", season_type="Regular Season", replay_dir=None, record_dir=None, page=None):
+    """
+    Busca as estatísticas dos jogadores e retorna o DataFrame no formato do site.
+    Com replay_dir, lê a resposta gravada em disco em vez de acessar a rede.
+    """
+    def parse(payload):
+        with page.parsing() if page is not None else contextlib.nullcontext():
+            return to_site_frame(result_set_frame(payload))
+
+    if replay_dir:
+        return parse(load_recording(replay_dir, season, season_type))
+
+    resp = fetch_response(http, season, season_type, record_dir, page)
+    # Se a resposta não mudou desde o último parse, o DataFrame vem do cache
+    return http.parse_once(resp, lambda: parse(json.loads(resp.text)), version=PARSE_VERSION)
@@ -0,0 +1,477 @@
+"""
+Banco local (SQLite) com os dados coletados pelos scrapers, para consultas pontuais
+sem carregar os JSON inteiros.
+
+Tabelas (com índices por time, jogador, data e temporada):
+- players:   estatísticas por jogador (uma linha por temporada + jogador + time)
+- games:     calendário/resultados (chave: data + visitante + mandante)
+- standings: classificação por temporada e time
+
+Os times são guardados também pela sigla (LAL, BOS...), o que permite cruzar as três
+tabelas e buscar "Lakers", "LAL" ou "Los Angeles Lakers" pelo mesmo índice.
+
+Uso pela linha de comando:
+    python nba_store.py import                  # importa os JSON existentes
+    python nba_store.py games Lakers --month November
+    python nba_store.py player "Luka"
+    python nba_store.py standings --season 2024-25
+    python nba_store.py top PTS --limit 5
+    python nba_store.py games Lakers --month November --explain   # mostra o plano (uso dos índices)
+"""
+import argparse
+import datetime
+import json
+import math
+import os
+import sqlite3
+import threading
+import unicodedata
+
+import pandas as pd
+
+DEFAULT_STORE_PATH = "nba_stats.sqlite"
+
+TEAMS = {
+    "ATL": "Atlanta Hawks", "BOS": "Boston Celtics", "BKN": "Brooklyn Nets", "CHA": "Charlotte Hornets",
+    "CHI": "Chicago Bulls", "CLE": "Cleveland Cavaliers", "DAL": "Dallas Mavericks", "DEN": "Denver Nuggets",
+    "DET": "Detroit Pistons", "GSW": "Golden State Warriors", "HOU": "Houston Rockets", "IND": "Indiana Pacers",
+    "LAC": "Los Angeles Clippers", "LAL": "Los Angeles Lakers", "MEM": "Memphis Grizzlies", "MIA": "Miami Heat",
+    "MIL": "Milwaukee Bucks", "MIN": "Minnesota Timberwolves", "NOP": "New Orleans Pelicans", "NYK": "New York Knicks",
+    "OKC": "Oklahoma City Thunder", "ORL": "Orlando Magic", "PHI": "Philadelphia 76ers", "PHX": "Phoenix Suns",
+    "POR": "Portland Trail Blazers", "SAC": "Sacramento Kings", "SAS": "San Antonio Spurs", "TOR": "Toronto Raptors",
+    "UTA": "Utah Jazz", "WAS": "Washington Wizards",
+}
+# Grafias alternativas usadas pelas fontes (ex: ESPN escreve "LA Clippers")
+TEAM_ALIASES = {"LA Clippers": "LAC", "Trail Blazers": "POR", "Blazers": "POR", "Sixers": "PHI", "Cavs": "CLE", "Wolves": "MIN"}
+# Cidades que não identificam um único time ("New York" também é a cidade dos Nets)
+AMBIGUOUS_CITIES = {"New York"}
+
+
+def fold_name(text):
+    """Minúsculo e sem acentos (ex: 'Dončić' -> 'doncic'), para buscas por nome."""
+    text = unicodedata.normalize("NFKD", str(text))
+    return "".join(ch for ch in text if not unicodedata.combining(ch)).casefold().strip()
+
+
+def _build_city_aliases():
+    """Cidade sozinha -> sigla ("Boston" -> BOS), sem as cidades com mais de um time (ex: Los Angeles)."""
+    cities = {}
+    for abbr, name in TEAMS.items():
+        city = name.rsplit(" ", 2 if name.endswith("Trail Blazers") else 1)[0]
+        cities.setdefault(fold_name(city), []).append(abbr)
+    ambiguous = {fold_name(city) for city in AMBIGUOUS_CITIES}
+    return {city: abbrs[0] for city, abbrs in cities.items() if len(abbrs) == 1 and city not in ambiguous}
+
+
+CITY_ALIASES = _build_city_aliases()
+
+
+def _build_team_lookup():
+    lookup = {}
+    for abbr, name in TEAMS.items():
+        lookup[fold_name(abbr)] = abbr
+        lookup[fold_name(name)] = abbr
+        lookup[fold_name(name.split()[-1])] = abbr # Apelido: "Lakers", "Celtics"...
+    for alias, abbr in TEAM_ALIASES.items():
+        lookup[fold_name(alias)] = abbr
+    for city, abbr in CITY_ALIASES.items():
+        lookup.setdefault(city, abbr)
+    return lookup
+
+
+_TEAM_LOOKUP = _build_team_lookup()
+
+
+def resolve_team(text):
+    """Sigla do time a partir da sigla, do nome completo, do apelido ou da cidade. None se não reconhecer."""
+    if text is None:
+        return None
+    return _TEAM_LOOKUP.get(fold_name(text))
+
+
+def game_date_iso(label):
+    """'Tue, Oct 21, 2025' -> '2025-10-21' (ISO, ordenável e indexável)."""
+    try:
+        return datetime.datetime.strptime(label, "%a, %b %d, %Y").date().isoformat()
+    except (TypeError, ValueError):
+        return None
+
+
+# -----------------------------------------------------------------
+# Esquema: (coluna no JSON, coluna no banco, tipo SQL)
+# -----------------------------------------------------------------
+PLAYER_COLUMNS = [
+    ("Season", "season", "TEXT NOT NULL"), ("RANK", "rank", "INTEGER"), ("Player", "player", "TEXT NOT NULL"),
+    ("Team", "team", "TEXT NOT NULL"), ("Age", "age", "INTEGER"), ("GP", "gp", "INTEGER"), ("W", "w", "INTEGER"),
+    ("L", "l", "INTEGER"), ("Min", "min", "REAL"), ("PTS", "pts", "REAL"), ("FGM", "fgm", "REAL"),
+    ("FGA", "fga", "REAL"), ("FG%", "fg_pct", "REAL"), ("3PM", "fg3m", "REAL"), ("3PA", "fg3a", "REAL"),
+    ("3P%", "fg3_pct", "REAL"), ("FTM", "ftm", "REAL"), ("FTA", "fta", "REAL"), ("FT%", "ft_pct", "REAL"),
+    ("OREB", "oreb", "REAL"), ("DREB", "dreb", "REAL"), ("REB", "reb", "REAL"), ("AST", "ast", "REAL"),
+    ("TOV", "tov", "REAL"), ("STL", "stl", "REAL"), ("BLK", "blk", "REAL"), ("PF", "pf", "REAL"),
+    ("FP", "fp", "REAL"), ("DD2", "dd2", "REAL"), ("TD3", "td3", "REAL"), ("+/-", "plus_minus", "REAL"),
+]
+GAME_COLUMNS = [
+    ("Season", "season", "TEXT NOT NULL"), ("Date", "date_label", "TEXT NOT NULL"), ("Start (ET)", "start_et", "TEXT"),
+    ("Visitor/Neutral", "visitor", "TEXT NOT NULL"), ("Visitor PTS", "visitor_pts", "INTEGER"),
+    ("Home/Neutral", "home", "TEXT NOT NULL"), ("Home PTS", "home_pts", "INTEGER"), ("Overtime", "overtime", "TEXT"),
+    ("Attend.", "attendance", "INTEGER"), ("LOG", "log", "TEXT"), ("Arena", "arena", "TEXT"),
+    ("Notes", "notes", "TEXT"), ("Month", "month", "TEXT"),
+]
+STANDING_COLUMNS = [
+    ("Season", "season", "TEXT NOT NULL"), ("Conference", "conference", "TEXT"), ("Equipe", "team_name", "TEXT NOT NULL"),
+    ("V", "wins", "INTEGER"), ("D", "losses", "INTEGER"), ("% Vit.", "win_pct", "REAL"), ("JA", "games_behind", "TEXT"),
+    ("Casa", "home_record", "TEXT"), ("VISITANTE", "away_record", "TEXT"), ("DIV", "div_record", "TEXT"),
+    ("CONF", "conf_record", "TEXT"), ("PTS", "pts", "REAL"), ("PTS Contra", "opp_pts", "REAL"), ("DIF", "diff", "REAL"),
+    ("STRK", "streak", "TEXT"), ("U10", "last10", "TEXT"),
+]
+
+# Colunas derivadas (preenchidas na importação) e chave de cada tabela
+TABLES = {
+    "players": {
+        "columns": PLAYER_COLUMNS,
+        "derived": [("player_key", "TEXT NOT NULL")],
+        "key": ("season", "player", "team"),
+        "indexes": {"idx_players_team": ("team", "season"), "idx_players_key": ("player_key",), "idx_players_pts": ("season", "pts")},
+    },
+    "games": {
+        "columns": GAME_COLUMNS,
+        "derived": [("game_date", "TEXT"), ("visitor_team", "TEXT"), ("home_team", "TEXT")],
+        "key": ("date_label", "visitor", "home"),
+        "indexes": {"idx_games_home": ("home_team", "game_date"), "idx_games_visitor": ("visitor_team", "game_date"),
+                    "idx_games_date": ("game_date",), "idx_games_season_month": ("season", "month")},
+    },
+    "standings": {
+        "columns": STANDING_COLUMNS,
+        "derived": [("team", "TEXT")],
+        "key": ("season", "team_name"),
+        "indexes": {"idx_standings_team": ("team", "season"), "idx_standings_conf": ("season", "conference", "win_pct")},
+    },
+}
+
+
+def _derived_values(table, record):
+    if table == "players":
+        return [fold_name(record["player"])]
+    if table == "games":
+        return [game_date_iso(record["date_label"]), resolve_team(record["visitor"]), resolve_team(record["home"])]
+    return [resolve_team(record["team_name"])]
+
+
+def _clean(value):
+    """NaN/NA -> None e tipos numpy -> tipos Python (o sqlite3 só aceita os nativos)."""
+    if value is None or value is pd.NA:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if hasattr(value, "item"):
+        value = value.item()
+        if isinstance(value, float) and math.isnan(value):
+            return None
+    return value
+
+
+class NbaStore:
+    """Acesso ao banco. Cada thread usa sua própria conexão (modo WAL: leituras não bloqueiam a escrita)."""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._connections = {} # thread -> conexão, para o close() fechar as de todas as threads
+        self._connections_lock = threading.Lock()
+
+    @classmethod
+    def open_existing(cls, path=DEFAULT_STORE_PATH):
+        """Abre o banco só se ele já existir (o assistente cai para os JSON caso contrário)."""
+        return cls(path) if os.path.exists(path) else None
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        with self._connections_lock:
+            if conn is not None and self._connections.get(threading.current_thread()) is not conn:
+                conn = None # Fechada pelo close() de outra thread
+        if conn is None:
+            # check_same_thread=False só para o close() poder fechar a conexão a partir de outra thread;
+            # cada conexão continua sendo usada por uma única thread
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                # As conexões de threads que já terminaram (workers de execuções anteriores) são fechadas aqui
+                for thread in [t for t in self._connections if not t.is_alive()]:
+                    self._connections.pop(thread).close()
+                self._connections[threading.current_thread()] = conn
+        with self._init_lock:
+            if not self._initialized:
+                self._create_schema(conn)
+                self._initialized = True
+        return conn
+
+    @staticmethod
+    def _create_schema(conn):
+        for table, spec in TABLES.items():
+            columns = [f'"{sql}" {sql_type}' for _, sql, sql_type in spec["columns"]]
+            columns += [f'"{name}" {sql_type}' for name, sql_type in spec["derived"]]
+            conn.execute(f'CREATE TABLE IF NOT EXISTS {table} ({", ".join(columns)}, PRIMARY KEY ({", ".join(spec["key"])}))')
+            for index, index_columns in spec["indexes"].items():
+                conn.execute(f'CREATE INDEX IF NOT EXISTS {index} ON {table} ({", ".join(index_columns)})')
+        conn.commit()
+
+    def close(self):
+        """Fecha as conexões de todas as threads (não só a da thread atual)."""
+        with self._connections_lock:
+            connections, self._connections = list(self._connections.values()), {}
+        for conn in connections:
+            conn.close()
+        self._local.conn = None
+
+    # --- escrita ---
+    def rows_from_frame(self, table, df, season=None):
+        """Converte o DataFrame (colunas do JSON) nas tuplas da tabela, já com as colunas derivadas."""
+        spec = TABLES[table]
+        if season is not None and "Season" not in df.columns:
+            df = df.assign(Season=season)
+        json_columns = [json_name for json_name, _, _ in spec["columns"]]
+        missing = [col for col in json_columns if col not in df.columns]
+        if missing:
+            df = df.assign(**{col: None for col in missing})
+        rows = []
+        for values in df[json_columns].itertuples(index=False, name=None):
+            values = [_clean(v) for v in values]
+            record = {sql: value for (_, sql, _), value in zip(spec["columns"], values)}
+            rows.append(tuple(values) + tuple(_derived_values(table, record)))
+        return rows
+
+    def replace_seasons(self, table, rows):
+        """
+        Grava as linhas numa única transação: apaga as temporadas presentes em `rows`
+        (a coleta traz a temporada inteira) e insere/atualiza pela chave da tabela.
+        """
+        if not rows:
+            return 0
+        spec = TABLES[table]
+        names = [sql for _, sql, _ in spec["columns"]] + [name for name, _ in spec["derived"]]
+        season_index = names.index("season")
+        seasons = sorted({row[season_index] for row in rows})
+        updates = ", ".join(f'"{name}" = excluded."{name}"' for name in names if name not in spec["key"])
+        quoted = ", ".join(f'"{name}"' for name in names)
+        sql = (f'INSERT INTO {table} ({quoted}) VALUES ({", ".join("?" * len(names))}) '
+               f'ON CONFLICT ({", ".join(spec["key"])}) DO UPDATE SET {updates}')
+
+        conn = self._connect()
+        with conn:
+            conn.execute(f'DELETE FROM {table} WHERE season IN ({", ".join("?" * len(seasons))})', seasons)
+            conn.executemany(sql, rows)
+        return len(rows)
+
+    def import_frame(self, table, df, season=None):
+        return self.replace_seasons(table, self.rows_from_frame(table, df, season))
+
+    # --- leitura ---
+    def _select(self, table, where="", params=(), order="", limit=None):
+        spec = TABLES[table]
+        columns = ", ".join(f'"{sql}" AS "{json_name}"' for json_name, sql, _ in spec["columns"])
+        sql = f"SELECT {columns} FROM {table}"
+        if where:
+            sql += f" WHERE {where}"
+        if order:
+            sql += f" ORDER BY {order}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return sql, list(params)
+
+    def _fetch(self, sql, params):
+        return [dict(row) for row in self._connect().execute(sql, params)]
+
+    def explain(self, sql, params):
+        """Plano de execução do SQLite (para conferir se a consulta usa os índices)."""
+        return [row["detail"] for row in self._connect().execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+    def records(self, table):
+        """Todas as linhas da tabela, com os nomes de coluna do JSON."""
+        return self._fetch(*self._select(table, order="rowid"))
+
+    def team_games_query(self, team, month=None, season=None, date_from=None, date_to=None):
+        abbr = resolve_team(team)
+        if abbr is None:
+            raise ValueError(f"Time não reconhecido: {team!r}")
+        filters, params = [], []
+        for column, value, op in (("month", month, "="), ("season", season, "="), ("game_date", date_from, ">="), ("game_date", date_to, "<=")):
+            if value:
+                filters.append(f"{column} {op} ?")
+                params.append(value.capitalize() if column == "month" else value)
+        extra = "".join(f" AND {f}" for f in filters)
+        # Um SELECT por lado (mandante/visitante), cada um usando o próprio índice
+        home_sql, _ = self._select("games", where=f"home_team = ?{extra}")
+        away_sql, _ = self._select("games", where=f"visitor_team = ?{extra}")
+        return f"{home_sql} UNION ALL {away_sql}", [abbr, *params, abbr, *params]
+
+    def team_games(self, team, month=None, season=None, date_from=None, date_to=None):
+        """Jogos de um time (como mandante ou visitante), em ordem de data."""
+        rows = self._fetch(*self.team_games_query(team, month, season, date_from, date_to))
+        return sorted(rows, key=lambda r: game_date_iso(r["Date"]) or "")
+
+    def games_on(self, date):
+        """Jogos de uma data (ISO: 2025-11-05)."""
+        sql, params = self._select("games", where="game_date = ?", params=[date], order="start_et")
+        return self._fetch(sql, params)
+
+    def find_players(self, name, season=None, limit=10):
+        """Jogadores pelo nome (sem acento/maiúsculas): prefixo usa o índice; senão, busca por trecho."""
+        key = fold_name(name)
+        season_filter, season_params = (" AND season = ?", [season]) if season else ("", [])
+        sql, params = self._select("players", where=f"player_key >= ? AND player_key < ?{season_filter}",
+                                   params=[key, key + "￿", *season_params], order="pts DESC", limit=limit)
+        rows = self._fetch(sql, params)
+        if rows:
+            return rows
+        sql, params = self._select("players", where=f"player_key LIKE ?{season_filter}",
+                                   params=[f"%{key}%", *season_params], order="pts DESC", limit=limit)
+        return self._fetch(sql, params)
+
+    def team_players(self, team, season=None, limit=None):
+        abbr = resolve_team(team)
+        season_filter, season_params = (" AND season = ?", [season]) if season else ("", [])
+        sql, params = self._select("players", where=f"team = ?{season_filter}", params=[abbr, *season_params],
+                                   order="pts DESC", limit=limit)
+        return self._fetch(sql, params)
+
+    def top_players(self, stat="PTS", limit=10, season=None, team=None):
+        """Líderes de uma estatística (nome da coluna do JSON, ex: PTS, AST, 3P%)."""
+        columns = {json_name: sql for json_name, sql, _ in PLAYER_COLUMNS}
+        if stat not in columns:
+            raise ValueError(f"Estatística desconhecida: {stat!r}. Opções: {', '.join(columns)}")
+        filters, params = [], []
+        if season:
+            filters.append("season = ?")
+            params.append(season)
+        if team:
+            filters.append("team = ?")
+            params.append(resolve_team(team))
+        sql, params = self._select("players", where=" AND ".join(filters), params=params,
+                                   order=f'"{columns[stat]}" DESC', limit=limit)
+        return self._fetch(sql, params)
+
+    def standings(self, season=None, team=None, conference=None):
+        filters, params = [], []
+        if season:
+            filters.append("season = ?")
+            params.append(season)
+        if team:
+            filters.append("team = ?")
+            params.append(resolve_team(team))
+        if conference:
+            filters.append("conference = ?")
+            params.append(conference.capitalize())
+        sql, params = self._select("standings", where=" AND ".join(filters), params=params,
+                                   order="season DESC, conference, win_pct DESC")
+        return self._fetch(sql, params)
+
+    def seasons(self, table="standings"):
+        return [row[0] for row in self._connect().execute(f"SELECT DISTINCT season FROM {table} ORDER BY season DESC")]
+
+
+class StoreWriter:
+    """
+    Destino da camada de saída (ver writers.py): acumula as linhas já convertidas (tuplas) e
+    grava tudo numa transação curta em close(), para os três scrapers paralelos não
+    disputarem o lock de escrita do SQLite durante a coleta.
+    """
+
+    def __init__(self, store, table, season=None):
+        self.store = store
+        self.table = table
+        self.season = season
+        self.path = f"{store.path} ({table})"
+        self._rows = []
+        self.rows = 0
+
+    def write(self, df):
+        if df.empty:
+            return
+        self._rows.extend(self.store.rows_from_frame(self.table, df, self.season))
+        self.rows += len(df)
+
+    def close(self):
+        if self._rows:
+            self.store.replace_seasons(self.table, self._rows)
+        self._rows = []
+
+    def abort(self):
+        self._rows = []
+
+
+# Arquivos JSON exportados pelos scrapers -> tabela (e temporada, quando o JSON não tem a coluna Season)
+JSON_SOURCES = [
+    ("nba_stats_2025_26_players_filtrado.json", "players", "2025-26"),
+    ("nba_2026_schedule_completo.json", "games", "2025-26"),
+    ("nba_espn_standings_all_seasons.json", "standings", None),
+]
+
+
+def import_json_files(store, directory="."):
+    """Importa os JSON já exportados (útil na primeira vez ou sem rodar os scrapers)."""
+    for filename, table, season in JSON_SOURCES:
+        path = os.path.join(directory, filename)
+        if not os.path.exists(path):
+            print(f"   -> {filename} não encontrado. Pulando.")
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            df = pd.DataFrame(json.load(f))
+        count = store.import_frame(table, df, season)
+        print(f"   -> {count} linhas de {filename} importadas em '{table}'.")
+
+
+def _print_rows(rows):
+    if not rows:
+        print("Nenhum resultado.")
+        return
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banco local com os dados da NBA.")
+    parser.add_argument("--db", default=DEFAULT_STORE_PATH, help=f"Arquivo do banco (padrão: {DEFAULT_STORE_PATH}).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="Importa os JSON exportados pelos scrapers.")
+    imp.add_argument("--dir", default=".")
+    games = sub.add_parser("games", help="Jogos de um time.")
+    games.add_argument("team")
+    games.add_argument("--month")
+    games.add_argument("--explain", action="store_true", help="Mostra o plano de execução em vez dos resultados.")
+    player = sub.add_parser("player", help="Busca jogadores pelo nome.")
+    player.add_argument("name")
+    top = sub.add_parser("top", help="Líderes de uma estatística.")
+    top.add_argument("stat")
+    top.add_argument("--team")
+    top.add_argument("--limit", type=int, default=10)
+    standings = sub.add_parser("standings", help="Classificação.")
+    standings.add_argument("--season")
+    standings.add_argument("--team")
+    standings.add_argument("--conference")
+    args = parser.parse_args(argv)
+
+    store = NbaStore(args.db)
+    try:
+        if args.command == "import":
+            import_json_files(store, args.dir)
+        elif args.command == "games":
+            if args.explain:
+                for line in store.explain(*store.team_games_query(args.team, month=args.month)):
+                    print(line)
+            else:
+                _print_rows(store.team_games(args.team, month=args.month))
+        elif args.command == "player":
+            _print_rows(store.find_players(args.name))
+        elif args.command == "top":
+            _print_rows(store.top_players(args.stat, limit=args.limit, team=args.team))
+        elif args.command == "standings":
+            _print_rows(store.standings(args.season, args.team, args.conference))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
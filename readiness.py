@@ -0,0 +1,198 @@
+"""
+Camada de prontidão: substitui os time.sleep fixos por esperas baseadas em condições reais
+da página (linhas da tabela estáveis, elemento substituído...).
+Cada condição tem seu próprio timeout e o tempo gasto esperando é registrado por página
+no relatório de latência, junto com o tempo de parse.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from instrumentation import METRICS, source_of_page
+
+POLL_INTERVAL = 0.1
+
+
+class Condition:
+    """Condição de prontidão com nome e timeout próprios."""
+
+    def __init__(self, name, predicate, timeout):
+        self.name = name
+        self.predicate = predicate
+        self.timeout = timeout
+
+    def __repr__(self):
+        return f"Condition({self.name!r}, timeout={self.timeout}s)"
+
+
+def present(selector, timeout=15):
+    """Elemento presente no DOM."""
+    return Condition(f"presente: {selector}", EC.presence_of_element_located((By.CSS_SELECTOR, selector)), timeout)
+
+
+def all_present(selector, timeout=15):
+    """Todos os elementos do seletor presentes (retorna a lista)."""
+    return Condition(f"presentes: {selector}", EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector)), timeout)
+
+
+def clickable(element_id, timeout=10):
+    """Elemento (por ID) visível e clicável."""
+    return Condition(f"clicável: #{element_id}", EC.element_to_be_clickable((By.ID, element_id)), timeout)
+
+
+def gone(element_id, timeout=5):
+    """Elemento (por ID) removido ou invisível, ex: banner de cookies após o clique."""
+    return Condition(f"oculto: #{element_id}", EC.invisibility_of_element_located((By.ID, element_id)), timeout)
+
+
+def element_replaced(old_element, selector, timeout=15):
+    """
+    O elemento antigo foi descartado (navegação/re-render) e um novo já está no DOM.
+    Se não havia elemento antigo, equivale a present(selector).
+    """
+    def predicate(driver):
+        if old_element is not None:
+            try:
+                old_element.tag_name  # Acessar qualquer atributo dispara StaleElementReference
+                return False
+            except StaleElementReferenceException:
+                pass
+        elements = driver.find_elements(By.CSS_SELECTOR, selector)
+        return elements[0] if elements else False
+
+    return Condition(f"substituído: {selector}", predicate, timeout)
+
+
+def rows_stable(row_selector, quiet=0.75, min_rows=1, different_from=None, unchanged_after=3.0, timeout=20):
+    """
+    A contagem de linhas parou de mudar por `quiet` segundos.
+    `different_from` exige que a contagem tenha mudado em relação a um valor inicial
+    (ex: 50 linhas antes de selecionar 'All' na paginação). Se ela continuar igual por
+    `unchanged_after` segundos (a tabela já mostrava todas as linhas), a espera também termina.
+    """
+    state = {"count": None, "since": None}
+
+    def predicate(driver):
+        count = len(driver.find_elements(By.CSS_SELECTOR, row_selector))
+        now = time.monotonic()
+        if count != state["count"]:
+            state["count"], state["since"] = count, now
+            return False
+        if count < min_rows:
+            return False
+        if different_from is not None and count == different_from:
+            return count if now - state["since"] >= unchanged_after else False
+        return count if now - state["since"] >= quiet else False
+
+    return Condition(f"linhas estáveis: {row_selector}", predicate, timeout)
+
+
+def wait_for(driver, condition, page=None):
+    """
+    Espera a condição ser satisfeita e retorna o valor do predicado.
+    Lança TimeoutException (como o WebDriverWait) se o timeout da condição estourar.
+    """
+    start = time.perf_counter()
+    error = None
+    try:
+        return WebDriverWait(driver, condition.timeout, poll_frequency=POLL_INTERVAL).until(
+            condition.predicate, message=f"Timeout ({condition.timeout}s) esperando {condition.name}"
+        )
+    except TimeoutException:
+        error = "timeout"
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        METRICS.record("wait", seconds, detail=condition.name, error=error)
+        if page is not None:
+            page.add_wait(condition.name, seconds)
+
+
+def try_wait_for(driver, condition, page=None):
+    """Como wait_for, mas retorna None em caso de timeout (para esperas opcionais)."""
+    try:
+        return wait_for(driver, condition, page)
+    except TimeoutException:
+        return None
+
+
+# -----------------------------------------------------------------
+# Relatório de latência (espera x parse por página)
+# -----------------------------------------------------------------
+class PageTiming:
+    def __init__(self, name):
+        self.name = name
+        self.waits = []
+        self.parse = 0.0
+        self.started = time.perf_counter()
+        self.total = None
+
+    def add_wait(self, condition_name, seconds):
+        self.waits.append((condition_name, seconds))
+
+    @property
+    def wait(self):
+        return sum(seconds for _, seconds in self.waits)
+
+    @contextmanager
+    def parsing(self):
+        with METRICS.span("parse"):
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.parse += time.perf_counter() - start
+
+
+class LatencyReport:
+    """Acumula os tempos por página (thread-safe, já que as páginas rodam em paralelo)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pages = []
+
+    @contextmanager
+    def page(self, name):
+        timing = PageTiming(name)
+        try:
+            with METRICS.context(source=source_of_page(name), page=name):
+                yield timing
+        finally:
+            timing.total = time.perf_counter() - timing.started
+            with self._lock:
+                self.pages.append(timing)
+
+    def take(self, source):
+        """Retira as páginas da fonte e devolve um LatencyReport só com elas (uma execução do daemon.py)."""
+        report = LatencyReport()
+        with self._lock:
+            report.pages = [p for p in self.pages if source_of_page(p.name) == source]
+            self.pages = [p for p in self.pages if source_of_page(p.name) != source]
+        return report
+
+    def print_summary(self):
+        with self._lock:
+            pages = list(self.pages)
+        if not pages:
+            return
+
+        print("\n" + "=" * 50)
+        print("RELATÓRIO DE LATÊNCIA POR PÁGINA")
+        print(f"{'Página':<32} {'Espera':>8} {'Parse':>8} {'Outros':>8} {'Total':>8}")
+        for p in pages:
+            other = max(p.total - p.wait - p.parse, 0.0)
+            print(f"{p.name[:32]:<32} {p.wait:>7.2f}s {p.parse:>7.2f}s {other:>7.2f}s {p.total:>7.2f}s")
+            slowest = sorted(p.waits, key=lambda w: w[1], reverse=True)[:2]
+            for condition_name, seconds in slowest:
+                print(f"    espera mais longa: {condition_name} ({seconds:.2f}s)")
+        total_wait = sum(p.wait for p in pages)
+        total_parse = sum(p.parse for p in pages)
+        print(f"{'TOTAL':<32} {total_wait:>7.2f}s {total_parse:>7.2f}s")
+
+
+REPORT = LatencyReport()
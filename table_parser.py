@@ -0,0 +1,320 @@
+"""
+Extrator de tabelas HTML em streaming, no lugar de pd.read_html + correções.
+
+Percorre os <tr>/<td> com lxml.etree.iterparse (ou direto na árvore, quando a tabela já é
+um elemento lxml), usando um esquema de colunas declarado por fonte:
+- renomeia as colunas (ex: coluna sem nome -> RANK, PTS/PTS -> Visitor PTS/Home PTS);
+- descarta colunas indesejadas (ex: '... RANK' da NBA.com, 'Box Score' do Basketball-Reference);
+- converte os tipos durante a passada (int, float, texto sem separador de milhar);
+- pula as linhas de cabeçalho repetidas no meio da tabela (ex: 'Date' a cada 20 jogos).
+
+Comparação com pd.read_html (tempo e pico de memória):
+    python table_parser.py bench
+    python table_parser.py bench --html players=tabela_jogadores.html --repeat 20
+"""
+import argparse
+import hashlib
+import io
+import re
+import time
+import tracemalloc
+
+import lxml.etree
+import pandas as pd
+
+PARSER_VERSION = 1 # Incrementar ao mudar a leitura das linhas (invalida os parses salvos no cache HTTP)
+
+_NUMBER_CLEANUP = str.maketrans("", "", ",+%")
+
+
+def _normalize(text):
+    return " ".join(text.split())
+
+
+def _key(label):
+    return _normalize(label).casefold()
+
+
+# --- conversores (recebem o texto da célula, já sem espaços extras; "" vira None) ---
+def text(value):
+    return value
+
+
+def text_number(value):
+    """Texto, mas sem o separador de milhar (ex: '18,203' -> '18203'), como fazia o read_html."""
+    return value.replace(",", "") if re.fullmatch(r"[\d,]+", value) else value
+
+
+def integer(value):
+    try:
+        return int(value.translate(_NUMBER_CLEANUP))
+    except ValueError:
+        return None
+
+
+def decimal(value):
+    try:
+        return float(value.translate(_NUMBER_CLEANUP))
+    except ValueError:
+        return None
+
+
+class Column:
+    """Coluna do esquema: texto do cabeçalho na página -> nome no DataFrame (keep=False descarta)."""
+
+    def __init__(self, header, name=None, convert=text, keep=True):
+        self.header = header
+        self.name = header if name is None else name
+        self.convert = convert
+        self.keep = keep
+
+    def __repr__(self):
+        return f"Column({self.header!r} -> {self.name if self.keep else '(descartada)'!r})"
+
+
+class TableSchema:
+    """
+    Esquema de uma tabela. As colunas são casadas com o cabeçalho na ordem em que aparecem
+    (cabeçalhos repetidos, como os dois 'PTS', consomem as colunas do esquema em sequência).
+    Cabeçalhos fora do esquema são mantidos como `extra`, exceto os que casam com `drop`.
+    """
+
+    def __init__(self, name, columns, drop=None, extra=text):
+        self.name = name
+        self.columns = columns
+        self.drop = re.compile(drop) if drop else None
+        self.extra = extra
+
+    def resolve(self, labels):
+        """Lista (índice da célula, Column) para as colunas mantidas, a partir dos rótulos do cabeçalho."""
+        pending = list(self.columns)
+        resolved = []
+        for index, label in enumerate(labels):
+            column = next((c for c in pending if _key(c.header) == _key(label)), None)
+            if column is not None:
+                pending.remove(column)
+            elif self.drop and self.drop.search(label):
+                continue
+            else:
+                column = Column(label, label, self.extra)
+            if column.keep:
+                resolved.append((index, column))
+        return resolved
+
+    def fingerprint(self):
+        """Identificador do esquema + versão do parser, usado como versão do parse no cache HTTP."""
+        parts = [str(PARSER_VERSION), self.name, self.drop.pattern if self.drop else "", self.extra.__name__]
+        parts += [f"{c.header}|{c.name}|{c.convert.__name__}|{c.keep}" for c in self.columns]
+        return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()[:12]
+
+    def dtypes(self):
+        """Colunas mantidas -> tipo ('int', 'float' ou 'str'), no formato usado pelo FrameCollector."""
+        kinds = {integer: "int", decimal: "float"}
+        return {column.name: kinds.get(column.convert, "str") for column in self.columns if column.keep}
+
+
+# -----------------------------------------------------------------
+# Esquemas por fonte
+# -----------------------------------------------------------------
+_PLAYER_STATS_FLOATS = ["Min", "PTS", "FGM", "FGA", "FG%", "3PM", "3PA", "3P%", "FTM", "FTA", "FT%",
+                        "OREB", "DREB", "REB", "AST", "TOV", "STL", "BLK", "PF", "FP", "DD2", "TD3", "+/-"]
+
+# Tabela de nba.com/stats/players/traditional (mesmas colunas do nba_stats_2025_26_players_filtrado.json)
+PLAYER_STATS_SCHEMA = TableSchema(
+    "nba_stats",
+    [Column("", "RANK", integer), Column("Player"), Column("Team"),
+     Column("Age", convert=integer), Column("GP", convert=integer),
+     Column("W", convert=integer), Column("L", convert=integer)]
+    + [Column(name, convert=decimal) for name in _PLAYER_STATS_FLOATS],
+    drop=r"\sRANK$", # Colunas ocultas de ranking por estatística (ex: 'GP RANK')
+    extra=decimal,
+)
+
+# Tabela #schedule do Basketball-Reference (tudo como texto, como no nba_2026_schedule_completo.json)
+SCHEDULE_SCHEMA = TableSchema(
+    "schedule",
+    [Column("Date"), Column("Start (ET)"), Column("Visitor/Neutral"),
+     Column("PTS", "Visitor PTS", text_number), Column("Home/Neutral"), Column("PTS", "Home PTS", text_number),
+     Column("", keep=False), # Link 'Box Score'
+     Column("", "Overtime"),
+     Column("Attend.", convert=text_number), Column("LOG"), Column("Arena"), Column("Notes")],
+)
+
+# Tabela rolável (dados) da classificação da ESPN; os nomes dos times vêm da tabela fixa da esquerda
+ESPN_STANDINGS_SCHEMA = TableSchema(
+    "espn",
+    [Column("V", convert=integer), Column("D", convert=integer), Column("% Vit.", convert=decimal),
+     Column("JA"), Column("Casa"), Column("Visitante", "VISITANTE"), Column("DIV"), Column("CONF"),
+     Column("PTS", convert=decimal), Column("PTS Contra", convert=decimal), Column("DIF", convert=decimal),
+     Column("STRK"), Column("U10")],
+)
+
+
+# -----------------------------------------------------------------
+# Leitura das linhas
+# -----------------------------------------------------------------
+def _cells(tr):
+    """Células da linha, repetindo as que têm colspan (como o read_html). O texto é lido só quando usado."""
+    cells = []
+    for cell in tr:
+        if cell.tag != "td" and cell.tag != "th":
+            continue
+        span = cell.get("colspan")
+        if span is None:
+            cells.append(cell)
+            continue
+        try:
+            span = int(span)
+        except ValueError:
+            span = 1
+        cells.extend([cell] * max(span, 1))
+    return cells
+
+
+def _cell_text(cell):
+    value = cell.text if len(cell) == 0 else "".join(cell.itertext())
+    return " ".join(value.split()) if value else ""
+
+
+def _iter_rows_from_html(html):
+    """(está no thead?, células) para cada <tr>, liberando a memória de cada linha já consumida."""
+    data = html.encode("utf-8") if isinstance(html, str) else html
+    in_thead = False
+    for event, elem in lxml.etree.iterparse(io.BytesIO(data), events=("start", "end"), tag=("thead", "tr"), html=True):
+        if elem.tag == "thead":
+            in_thead = event == "start"
+            continue
+        if event == "end":
+            yield in_thead, _cells(elem)
+            # Libera a linha e as anteriores: a árvore não cresce com o tamanho da tabela
+            elem.clear()
+            parent = elem.getparent()
+            while parent is not None and elem.getprevious() is not None:
+                del parent[0]
+
+
+def _iter_rows_from_element(table):
+    for tr in table.iter("tr"):
+        yield tr.getparent().tag == "thead", _cells(tr)
+
+
+def parse_table(table, schema):
+    """
+    Converte uma tabela (HTML como texto/bytes ou elemento lxml) em DataFrame seguindo o esquema.
+    O cabeçalho é a última linha do <thead> (ou a primeira linha, se não houver thead).
+    """
+    rows = _iter_rows_from_element(table) if isinstance(table, lxml.etree._Element) else _iter_rows_from_html(table)
+
+    thead_rows = []
+    columns = None
+    values = None
+    for in_thead, cells in rows:
+        if in_thead:
+            thead_rows.append([_cell_text(cell) for cell in cells])
+            continue
+        if columns is None:
+            header = thead_rows[-1] if thead_rows else [_cell_text(cell) for cell in cells]
+            columns = schema.resolve(header)
+            values = {column.name: [] for _, column in columns}
+            first_label = _key(header[0]) if header else ""
+            if not thead_rows:
+                continue
+
+        if not cells:
+            continue
+        # Linha de cabeçalho repetida no meio da tabela
+        if first_label and _key(_cell_text(cells[0])) == first_label:
+            continue
+        row = [(column, _cell_text(cells[index]) if index < len(cells) else "") for index, column in columns]
+        if not any(value for _, value in row):
+            continue
+        for column, value in row:
+            values[column.name].append(column.convert(value) if value else None)
+
+    if columns is None:
+        if not thead_rows:
+            return pd.DataFrame()
+        columns = schema.resolve(thead_rows[-1])
+        values = {column.name: [] for _, column in columns}
+    return pd.DataFrame(values)
+
+
+# -----------------------------------------------------------------
+# Benchmark contra pd.read_html
+# -----------------------------------------------------------------
+def _synthetic_table(header, rows, repeat_header_every=None):
+    parts = ["<table><thead><tr>", "".join(f"<th>{h}</th>" for h in header), "</tr></thead><tbody>"]
+    for i, row in enumerate(rows):
+        if repeat_header_every and i and i % repeat_header_every == 0:
+            parts.append('<tr class="thead">' + "".join(f"<th>{h}</th>" for h in header) + "</tr>")
+        parts.append("<tr>" + "".join(f"<td>{'' if v is None else v}</td>" for v in row) + "</tr>")
+    parts.append("</tbody></table>")
+    return "".join(parts)
+
+
+def synthetic_fixtures(players=500, games=1200, seasons=10):
+    """Tabelas no formato das páginas reais, do tamanho das coletas completas."""
+    stats = _PLAYER_STATS_FLOATS
+    player_header = ["", "Player", "Team", "Age", "GP", "W", "L"] + stats + [f"{s} RANK" for s in stats]
+    player_rows = [[i + 1, f"Player {i}", "LAL", 25, 10, 6, 4] + [f"{(i * 7 + j) % 400 / 10:.1f}" for j in range(len(stats))]
+                   + [i + 1] * len(stats) for i in range(players)]
+
+    schedule_header = ["Date", "Start (ET)", "Visitor/Neutral", "PTS", "Home/Neutral", "PTS", "", "", "Attend.", "LOG", "Arena", "Notes"]
+    schedule_rows = [["Tue, Oct 21, 2025", "7:30p", "Houston Rockets", 100 + i % 30, "Oklahoma City Thunder", 110 + i % 25,
+                      "Box Score", "OT" if i % 17 == 0 else None, f"{18000 + i:,}", "2:30", "Paycom Center", None]
+                     for i in range(games)]
+
+    espn_header = ["V", "D", "% VIT.", "JA", "CASA", "VISITANTE", "DIV", "CONF", "PTS", "PTS CONTRA", "DIF", "STRK", "U10"]
+    espn_rows = [[i % 60, 82 - i % 60, f".{i % 1000:03d}", "-", "30-11", "20-21", "10-6", "30-22",
+                  "115.2", "112.1", "+3.1", "V3", "7-3"] for i in range(15)]
+    return {
+        "players": (_synthetic_table(player_header, player_rows), PLAYER_STATS_SCHEMA),
+        "schedule": (_synthetic_table(schedule_header, schedule_rows, repeat_header_every=20), SCHEDULE_SCHEMA),
+        # Uma tabela de conferência por temporada e conferência
+        "espn": ([_synthetic_table(espn_header, espn_rows) for _ in range(seasons * 2)], ESPN_STANDINGS_SCHEMA),
+    }
+
+
+def _measure(func, repeat):
+    tracemalloc.start()
+    func() # aquecimento (e medição de memória)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat, peak
+
+
+def benchmark(fixtures, repeat=10):
+    print(f"{'Tabela':<10} {'read_html':>12} {'streaming':>12} {'ganho':>7} {'pico read_html':>15} {'pico streaming':>15}")
+    for name, (html_list, schema) in fixtures.items():
+        html_list = html_list if isinstance(html_list, list) else [html_list]
+        t_old, m_old = _measure(lambda: [pd.read_html(io.StringIO(h))[0] for h in html_list], repeat)
+        t_new, m_new = _measure(lambda: [parse_table(h, schema) for h in html_list], repeat)
+        print(f"{name:<10} {t_old * 1000:>10.1f}ms {t_new * 1000:>10.1f}ms {t_old / t_new:>6.1f}x "
+              f"{m_old / 1024 ** 2:>13.1f}MB {m_new / 1024 ** 2:>13.1f}MB")
+
+
+def main(argv=None):
+    schemas = {"players": PLAYER_STATS_SCHEMA, "schedule": SCHEDULE_SCHEMA, "espn": ESPN_STANDINGS_SCHEMA}
+    parser = argparse.ArgumentParser(description="Extrator de tabelas em streaming.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bench = sub.add_parser("bench", help="Compara parse_table com pd.read_html.")
+    bench.add_argument("--html", action="append", default=[], metavar="FONTE=ARQUIVO",
+                       help=f"Usa o outerHTML salvo de uma tabela ({', '.join(schemas)}) no lugar da tabela sintética.")
+    bench.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    fixtures = synthetic_fixtures()
+    for item in args.html:
+        source, _, path = item.partition("=")
+        if source not in schemas or not path:
+            parser.error(f"--html inválido: {item!r} (use FONTE=ARQUIVO, FONTE em {', '.join(schemas)})")
+        with open(path, "r", encoding="utf-8") as f:
+            fixtures[source] = (f.read(), schemas[source])
+    benchmark(fixtures, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Backend HTTP contra o servidor local de fixtures (fetchers.serve_fixtures) com HTML salvo em tests/fixtures."""
+import os
+import threading
+
+import pytest
+
+import main as pipeline
+from fetchers import HttpFetcher, serve_fixtures
+from readiness import PageTiming
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+@pytest.fixture(scope="module")
+def http():
+    server = serve_fixtures(FIXTURES, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    fetcher = HttpFetcher(max_workers=2, fixture_server=f"http://127.0.0.1:{server.server_port}")
+    yield fetcher
+    fetcher.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_schedule_month_page(http):
+    urls = pipeline._http_discover_schedule_urls(http, pipeline.SCHEDULE_URL_TEMPLATE.format(month="october"))
+    assert [pipeline.get_month_from_url(url) for url in urls] == ["october", "november"]
+
+    df = pipeline._parse_schedule_month_page(http.get(urls[0]), "October", PageTiming("teste"))
+    assert list(df.columns) == list(pipeline.SCHEDULE_COLUMNS)
+    assert len(df) == 2 # A linha de cabeçalho repetida (tr.thead) é descartada
+    first = df.iloc[0]
+    assert first["Visitor/Neutral"] == "Houston Rockets"
+    assert first["Home/Neutral"] == "Oklahoma City Thunder"
+    assert (first["Visitor PTS"], first["Home PTS"]) == ("124", "125") # Texto, como no JSON exportado
+    assert first["Overtime"] == "2OT"
+    assert first["Month"] == "October"
+
+
+def test_espn_standings_page(http):
+    seasons = pipeline._http_discover_espn_seasons(http)
+    # A página inicial (temporada atual) + as URLs do dropdown
+    assert seasons[0] == (pipeline.ESPN_START_URL, "2025-26")
+    assert {label for _, label in seasons} == {"2025-26", "2024-25"}
+
+    url, label = seasons[0]
+    df = pipeline._clean_season_frame(pipeline._parse_espn_season_page(http.get(url), label, PageTiming("teste")))
+    assert set(pipeline.ESPN_COLUMNS) <= set(df.columns)
+    assert list(df["Equipe"]) == ["Detroit Pistons", "New York Knicks", "Oklahoma City Thunder"]
+    assert list(df["Conference"]) == ["Eastern", "Eastern", "Western"]
+    assert list(df["V"]) == [9, 7, 12]
+    assert (df["Season"] == "2025-26").all()
@@ -0,0 +1,36 @@
+import datetime
+
+import pandas as pd
+
+import incremental
+
+
+def _games(months):
+    return pd.DataFrame({
+        "Month": months,
+        "Visitor PTS": [100] * len(months),
+        "Home PTS": [101] * len(months),
+    })
+
+
+def test_missing_past_month_is_refreshed():
+    # Novembro falhou numa coleta anterior: precisa ser baixado de novo
+    to_refresh, kept = incremental.schedule_months_to_refresh(
+        _games(["October", "December"]), today=datetime.date(2026, 1, 15))
+    assert to_refresh == ["november", "january"]
+    assert kept == ["october", "december"]
+
+
+def test_future_months_are_skipped():
+    to_refresh, kept = incremental.schedule_months_to_refresh(
+        _games(["October"]), today=datetime.date(2025, 10, 20))
+    assert to_refresh == ["october"]
+    assert kept == []
+
+
+def test_past_month_without_scores_is_refreshed():
+    df = _games(["October", "November"])
+    df.loc[1, "Home PTS"] = None
+    to_refresh, kept = incremental.schedule_months_to_refresh(df, today=datetime.date(2025, 12, 5))
+    assert to_refresh == ["november", "december"]
+    assert kept == ["october"]
@@ -0,0 +1,57 @@
+"""Replay de uma resposta gravada da API de stats (tests/fixtures/api)."""
+import json
+import os
+
+import nba_stats_api
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPLAY_DIR = os.path.join(TESTS_DIR, "fixtures", "api")
+# JSON exportado pelo scraper (formato de referência da tabela do site)
+EXPORTED_JSON = os.path.join(os.path.dirname(TESTS_DIR), "nba_stats_2025_26_players_filtrado.json")
+
+
+def _exported_record():
+    with open(EXPORTED_JSON, encoding="utf-8") as f:
+        return json.load(f)[0]
+
+
+def test_replay_matches_exported_json_shape():
+    df = nba_stats_api.fetch_player_stats(None, replay_dir=REPLAY_DIR)
+    expected = _exported_record()
+    records = json.loads(df.to_json(orient="records", force_ascii=False))
+
+    assert len(records) == 3
+    assert list(records[0]) == list(expected) # Mesmas colunas, na mesma ordem
+    for column, value in expected.items():
+        assert type(records[0][column]) is type(value), column
+    assert [r["RANK"] for r in records] == sorted(r["RANK"] for r in records)
+    assert all(0 <= r["FG%"] <= 100 for r in records) # Percentuais como no site (47.6, não 0.476)
+
+
+class _FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeHttp:
+    """Responde com a gravação e registra a versão passada ao parse_once."""
+
+    def __init__(self, text):
+        self.text = text
+        self.versions = []
+
+    def get(self, url, headers=None, page=None):
+        return _FakeResponse(self.text)
+
+    def parse_once(self, response, parse, version=None):
+        self.versions.append(version)
+        return parse()
+
+
+def test_parse_cache_is_versioned():
+    path = nba_stats_api.recording_path(REPLAY_DIR, "2025-26", "Regular Season")
+    with open(path, encoding="utf-8") as f:
+        http = _FakeHttp(f.read())
+    df = nba_stats_api.fetch_player_stats(http)
+    assert len(df) == 3
+    assert http.versions == [nba_stats_api.PARSE_VERSION]
@@ -0,0 +1,52 @@
+import sqlite3
+import threading
+
+import pytest
+
+from nba_store import NbaStore
+
+
+def _query(store):
+    return store._connect().execute("SELECT COUNT(*) FROM players").fetchone()[0]
+
+
+def test_close_closes_connections_of_all_threads(tmp_path):
+    store = NbaStore(str(tmp_path / "teste.sqlite"))
+    connections = []
+
+    def worker():
+        _query(store)
+        connections.append(store._local.conn)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert _query(store) == 0
+    connections.append(store._local.conn)
+
+    store.close()
+    for conn in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    # A thread atual reabre uma conexão nova depois do close()
+    assert _query(store) == 0
+    store.close()
+
+
+def test_connections_of_finished_threads_are_closed(tmp_path):
+    store = NbaStore(str(tmp_path / "teste.sqlite"))
+    connections = []
+
+    def worker():
+        _query(store)
+        connections.append(store._local.conn)
+
+    for _ in range(3):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+    _query(store)
+    assert len(store._connections) == 1 # Só a da thread atual continua aberta
+    with pytest.raises(sqlite3.ProgrammingError):
+        connections[0].execute("SELECT 1")
+    store.close()
@@ -0,0 +1,35 @@
+import time
+
+import readiness
+
+
+class _Rows:
+    """Driver falso: a contagem de linhas segue a sequência informada (repete a última)."""
+
+    def __init__(self, *counts):
+        self.counts = list(counts)
+
+    def find_elements(self, by, selector):
+        count = self.counts.pop(0) if len(self.counts) > 1 else self.counts[0]
+        return [None] * count
+
+
+def _wait(condition, driver, limit=2.0):
+    deadline = time.monotonic() + limit
+    while time.monotonic() < deadline:
+        result = condition.predicate(driver)
+        if result:
+            return result
+        time.sleep(0.01)
+    return None
+
+
+def test_rows_stable_after_count_changes():
+    condition = readiness.rows_stable("tr", quiet=0.05, different_from=50)
+    assert _wait(condition, _Rows(50, 50, 120)) == 120
+
+
+def test_rows_stable_when_count_never_changes():
+    # A tabela já mostrava todas as linhas: termina depois de unchanged_after, sem esperar o timeout
+    condition = readiness.rows_stable("tr", quiet=0.05, different_from=50, unchanged_after=0.2)
+    assert _wait(condition, _Rows(50)) == 50
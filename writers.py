@@ -0,0 +1,230 @@
+"""
+Camada de saída dos scrapers: o JSON de sempre e, opcionalmente, arquivos colunares.
+
+- JsonRecordsSink: mesmo formato de df.to_json(orient='records', indent=4, force_ascii=False).
+- ColumnarWriter: Parquet ou Arrow IPC (pyarrow, dependência opcional), com tipos de verdade
+  (placar/aproveitamento numéricos, datas como date, nomes de times como categoria) e, se
+  pedido, particionado por uma coluna (calendário por mês, classificação por temporada).
+- MultiWriter: grava o mesmo lote em vários destinos.
+
+Todos os destinos gravam num temporário e só substituem o arquivo final em close();
+abort() descarta o que foi gravado e mantém a saída anterior.
+
+Leitura só das colunas/partições necessárias:
+    pd.read_parquet("nba_2026_schedule_completo.parquet", columns=["Date", "Home PTS"],
+                    filters=[("Month", "=", "November")])
+    pyarrow.dataset.dataset("nba_2026_schedule_completo.arrow", format="ipc", partitioning="hive")
+"""
+import os
+import shutil
+
+import pandas as pd
+
+from instrumentation import METRICS
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as pa_dataset
+    import pyarrow.parquet as pq
+except ImportError: # pip install "tegd-nba-scrapping[columnar]" (ou pip install pyarrow)
+    pa = None
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+
+
+def columnar_available():
+    return pa is not None
+
+
+def columnar_path(json_path, fmt):
+    """nba_2026_schedule_completo.json -> nba_2026_schedule_completo.parquet (arquivo ou diretório particionado)."""
+    return f"{os.path.splitext(json_path)[0]}.{_EXTENSIONS[fmt]}"
+
+
+def _remove(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+class JsonRecordsSink:
+    """
+    Grava lotes no mesmo formato de df.to_json(orient='records', indent=4, force_ascii=False).
+    Escreve num arquivo temporário e só substitui o destino em close() (um erro no meio
+    da coleta não deixa o JSON anterior pela metade).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._tmp_path = path + ".tmp"
+        self._file = None
+        self.rows = 0
+
+    def write(self, df):
+        if df.empty:
+            return
+        if self._file is None:
+            self._file = open(self._tmp_path, "w", encoding="utf-8")
+            self._file.write("[\n")
+        else:
+            self._file.write(",\n")
+        # Remove os colchetes externos ("[\n" ... "\n]") para emendar os lotes
+        self._file.write(df.to_json(orient="records", indent=4, force_ascii=False)[2:-2])
+        self.rows += len(df)
+
+    def close(self):
+        """Finaliza o arquivo. Sem nenhuma linha gravada, o destino não é alterado."""
+        if self._file is None:
+            return
+        self._file.write("\n]")
+        self._file.close()
+        self._file = None
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            os.remove(self._tmp_path)
+
+
+class ColumnarWriter:
+    """
+    Grava os lotes em Parquet ou Arrow IPC. `types` é um dict coluna -> tipo
+    ('int', 'float', 'str', 'date' ou 'category'); colunas fora dele ficam como texto.
+    Com `partition_by`, cada lote vira arquivos em <path>/<coluna>=<valor>/ (partições hive).
+    """
+
+    _ARROW_TYPES = {
+        "int": lambda: pa.int64(),
+        "float": lambda: pa.float64(),
+        "str": lambda: pa.string(),
+        "date": lambda: pa.date32(),
+        "category": lambda: pa.dictionary(pa.int32(), pa.string()),
+    }
+
+    def __init__(self, path, fmt="parquet", types=None, partition_by=None, date_format=None):
+        if pa is None:
+            raise RuntimeError("Saída colunar requer o pyarrow: pip install pyarrow")
+        if fmt not in COLUMNAR_FORMATS:
+            raise ValueError(f"Formato colunar desconhecido: {fmt!r} (opções: {', '.join(COLUMNAR_FORMATS)})")
+        self.path = path
+        self.fmt = fmt
+        self.types = dict(types or {})
+        self.partition_by = partition_by
+        self.date_format = date_format
+        self._tmp_path = path + ".tmp"
+        self._schema = None
+        self._writer = None
+        self._sink = None
+        self._batches = 0
+        self.rows = 0
+
+    def _arrow_schema(self, columns):
+        return pa.schema([(col, self._ARROW_TYPES[self.types.get(col, "str")]()) for col in columns])
+
+    def _prepare(self, df):
+        """Converte as colunas para os tipos declarados antes de passar para o Arrow."""
+        df = df.copy()
+        for col in df.columns:
+            kind = self.types.get(col, "str")
+            if kind in ("int", "float"):
+                values = pd.to_numeric(df[col], errors="coerce")
+                df[col] = values.astype("Int64") if kind == "int" else values.astype("float64")
+            elif kind == "date":
+                df[col] = pd.to_datetime(df[col], format=self.date_format, errors="coerce").dt.date
+            else:
+                df[col] = df[col].astype(object).where(df[col].notna(), None).map(lambda v: v if v is None else str(v))
+        return df
+
+    def write(self, df):
+        if df.empty:
+            return
+        if self._schema is None:
+            self._schema = self._arrow_schema(df.columns)
+            _remove(self._tmp_path)
+        table = pa.Table.from_pandas(self._prepare(df), schema=self._schema, preserve_index=False)
+
+        if self.partition_by:
+            pa_dataset.write_dataset(
+                table, self._tmp_path, format="ipc" if self.fmt == "arrow" else "parquet",
+                partitioning=[self.partition_by], partitioning_flavor="hive",
+                basename_template=f"part-{self._batches}-{{i}}.{_EXTENSIONS[self.fmt]}",
+                existing_data_behavior="overwrite_or_ignore",
+            )
+        else:
+            if self._writer is None:
+                if self.fmt == "parquet":
+                    self._writer = pq.ParquetWriter(self._tmp_path, self._schema)
+                else:
+                    self._sink = pa.OSFile(self._tmp_path, "wb")
+                    self._writer = pa.ipc.new_file(self._sink, self._schema)
+            self._writer.write_table(table)
+        self._batches += 1
+        self.rows += len(df)
+
+    def _close_writer(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    def close(self):
+        """Substitui a saída anterior pela nova. Sem nenhuma linha gravada, nada muda."""
+        self._close_writer()
+        if self._schema is None:
+            return
+        _remove(self.path)
+        os.replace(self._tmp_path, self.path)
+        self._schema = None
+
+    def abort(self):
+        self._close_writer()
+        _remove(self._tmp_path)
+        self._schema = None
+
+
+class MultiWriter:
+    """Envia cada lote para todos os destinos (ex: JSON + Parquet)."""
+
+    def __init__(self, writers):
+        self.writers = list(writers)
+
+    def write(self, df):
+        with METRICS.span("serialize", detail="write") as span:
+            span.rows = len(df)
+            for writer in self.writers:
+                writer.write(df)
+
+    def close(self):
+        with METRICS.span("serialize", detail="close") as span:
+            for writer in self.writers:
+                writer.close()
+            span.bytes = sum(os.path.getsize(path) for path in self.paths if os.path.isfile(path))
+
+    def abort(self):
+        for writer in self.writers:
+            writer.abort()
+
+    @property
+    def paths(self):
+        return [writer.path for writer in self.writers]
+
+
+def write_frame(df, writer):
+    """Grava um DataFrame completo de uma vez (caminho sem streaming)."""
+    try:
+        writer.write(df)
+    except Exception:
+        writer.abort()
+        raise
+    writer.close()
+
+
+def write_json_records(df, path):
+    """Exporta o DataFrame inteiro no formato dos JSON do projeto."""
+    write_frame(df, JsonRecordsSink(path))